@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la corroboration : boucle Python paire par paire
+(similarity x 2 par candidat) contre les matrices process.cdist de
+find_corroborations_batch, en paires comparées par seconde.
+
+Usage: python benchmarks/bench_corroboration.py [--sizes 1000 10000 100000] [--articles 20]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from modules.corroboration import similarity, find_corroborations_batch  # noqa: E402
+
+WORDS = ("gouvernement crise accord sommet ministre élection réforme sanctions marché "
+         "prix énergie gaz pétrole ukraine russie chine europe france allemagne otan "
+         "négociations conflit frontière inflation banque taux croissance grève manifestation").split()
+SOURCES = ["lemonde.fr", "liberation.fr", "la-croix.com", "france24.com", "rfi.fr"]
+
+
+def make_articles(n, seed):
+    rnd = random.Random(seed)
+    return [{
+        "id": i,
+        "title": " ".join(rnd.choices(WORDS, k=rnd.randint(5, 12))),
+        "summary": " ".join(rnd.choices(WORDS, k=rnd.randint(25, 60))),
+        "source": rnd.choice(SOURCES)
+    } for i in range(n)]
+
+
+def loop_corroborations(article, candidates, threshold=0.65):
+    found = []
+    for c in candidates:
+        score = (similarity(article["title"], c["title"]) * 0.6
+                 + similarity(article["summary"], c["summary"]) * 0.3
+                 + (0.1 if article["source"] == c["source"] else 0.0))
+        if score >= threshold:
+            found.append(c["id"])
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--articles", type=int, default=20, help="articles à corroborer par taille")
+    parser.add_argument("--workers", type=int, default=-1)
+    parser.add_argument("--skip-loop-above", type=int, default=100000,
+                        help="ne pas mesurer la boucle au-delà de cette taille")
+    args = parser.parse_args()
+
+    articles = make_articles(args.articles, seed=1)
+    print(f"{'candidats':>9} | {'méthode':<12} | {'durée (s)':>9} | {'paires/s':>12}")
+    for n in args.sizes:
+        candidates = make_articles(n, seed=n)
+        pairs = n * len(articles)
+
+        if n <= args.skip_loop_above:
+            started = time.perf_counter()
+            for a in articles:
+                loop_corroborations(a, candidates)
+            elapsed = time.perf_counter() - started
+            print(f"{n:>9} | {'boucle':<12} | {elapsed:>9.3f} | {pairs / elapsed:>12.0f}")
+
+        started = time.perf_counter()
+        find_corroborations_batch(articles, candidates, workers=args.workers)
+        elapsed = time.perf_counter() - started
+        print(f"{n:>9} | {'cdist':<12} | {elapsed:>9.3f} | {pairs / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de l'analyse approfondie (AdvancedIAAnalyzer.perform_deep_analysis)
+sur des articles réels, en millisecondes par article, sur place puis
+réparti sur un pool de processus (modules.deep_pool) pour chaque --workers.
+
+Les articles viennent de --input (liste JSON de {title, content|summary}),
+des flux configurés avec --live, ou à défaut des analyses de la base locale.
+
+Usage: python benchmarks/bench_deep_analysis.py [--input articles.json | --live] [--limit 500] [--repeat 3] [--workers 1 2 4 8]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from modules.deep_analysis import AdvancedIAAnalyzer  # noqa: E402
+from modules import deep_pool  # noqa: E402
+
+
+def load_articles(args):
+    if args.input:
+        with open(args.input, encoding="utf-8") as f:
+            return json.load(f)
+    if args.live:
+        from modules.feed_scraper import load_feed_list, fetch_feed
+        articles = []
+        for feed in load_feed_list():
+            articles.extend(fetch_feed(feed).get("entries") or [])
+            if len(articles) >= args.limit:
+                break
+        return articles
+    from modules.storage_manager import load_recent_analyses
+    return load_recent_analyses(days=args.days)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--input", help="fichier JSON d'articles")
+    parser.add_argument("--live", action="store_true", help="lire les flux configurés")
+    parser.add_argument("--days", type=int, default=30, help="fenêtre lue dans la base locale")
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    articles = [a for a in load_articles(args) if a.get("title")][:args.limit]
+    if not articles:
+        sys.exit("Aucun article : utiliser --input ou --live")
+    for a in articles:
+        a.setdefault("content", a.get("summary") or "")
+        a.setdefault("sentiment", {"score": 0.0, "sentiment": "neutral"})
+
+    analyzer = AdvancedIAAnalyzer()
+    print(f"{'articles':>8} | {'processus':>9} | {'meilleure durée (s)':>19} | {'ms/article':>10} | {'articles/s':>10}")
+    for workers in args.workers:
+        best = None
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            # L'analyseur trace chaque étape avec print
+            with contextlib.redirect_stdout(io.StringIO()):
+                deep_pool.run_deep_analyses(articles, [], workers=workers, analyzer=analyzer,
+                                            use_cache=False)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        deep_pool.shutdown_pool()
+        print(f"{len(articles):>8} | {workers:>9} | {best:>19.3f} | "
+              f"{best * 1000 / len(articles):>10.2f} | {len(articles) / best:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du client LLM (modules.llm_client) contre un serveur stub local
+qui imite /chat/completions avec une latence fixe : appels amont et durée
+pour des prompts identiques envoyés en parallèle (fusion single-flight),
+puis répétés (cache).
+
+Usage: python benchmarks/bench_llm_client.py [--latency 0.5] [--concurrency 20] [--prompts 5]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from modules.llm_client import LLMClient  # noqa: E402
+
+
+def start_stub(latency):
+    """Serveur chat/completions factice ; renvoie (serveur, compteur d'appels)."""
+    calls = {"count": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with lock:
+                calls["count"] += 1
+            time.sleep(latency)
+            out = json.dumps({"choices": [{"message": {"content": "résumé: " + body["messages"][-1]["content"]}}]})
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(out.encode())))
+            self.end_headers()
+            self.wfile.write(out.encode())
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, calls
+
+
+def payload(i):
+    return {"model": "stub", "messages": [{"role": "user", "content": f"Analyse des flux n°{i}"}],
+            "max_tokens": 100, "temperature": 0.2}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.5, help="latence du stub (s)")
+    parser.add_argument("--concurrency", type=int, default=20, help="requêtes simultanées par prompt")
+    parser.add_argument("--prompts", type=int, default=5, help="prompts distincts")
+    args = parser.parse_args()
+
+    server, calls = start_stub(args.latency)
+    client = LLMClient(api_base=f"http://127.0.0.1:{server.server_address[1]}", ttl=60)
+    requests_list = [payload(i) for i in range(args.prompts) for _ in range(args.concurrency)]
+
+    print(f"{'phase':<10} | {'requêtes':>8} | {'appels amont':>12} | {'durée (s)':>9}")
+    for phase in ("froid", "cache"):
+        before = calls["count"]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(requests_list)) as pool:
+            results = list(pool.map(lambda p: client.chat(p, "stub-key"), requests_list))
+        elapsed = time.perf_counter() - started
+        assert all("content" in r for r in results), results[:3]
+        print(f"{phase:<10} | {len(requests_list):>8} | {calls['count'] - before:>12} | {elapsed:>9.3f}")
+    print(client.stats())
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark d'écriture des analyses : boucle INSERT ligne à ligne,
+execute_values et COPY ... FROM STDIN.
+Écrit dans une table temporaire `analyses` (propre à la session), la table
+réelle n'est pas modifiée.
+
+Usage: DATABASE_URL=postgresql://... python benchmarks/bench_save_analysis_batch.py [--sizes 1000 10000 100000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import datetime
+
+import psycopg2
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from modules.storage_manager import (  # noqa: E402
+    _analysis_row, write_rows_loop, write_rows_values, write_rows_copy, BATCH_SIZE
+)
+
+
+def make_analyses(n):
+    now = datetime.datetime.utcnow()
+    return [{
+        "title": f"Article de test n°{i} : tensions commerciales et marchés",
+        "source": random.choice(["lemonde.fr", "liberation.fr", "la-croix.com", "france24.com"]),
+        "date": now - datetime.timedelta(minutes=i),
+        "summary": "Résumé\tavec tabulation, retour\nà la ligne et antislash \\ " * 3,
+        "confidence": random.random(),
+        "corroboration_count": random.randint(0, 5),
+        "corroboration_strength": random.random(),
+        "bayesian_posterior": random.random(),
+        "sentiment": {"score": random.uniform(-1, 1), "sentiment": "neutral"}
+    } for i in range(n)]
+
+
+def run(conn, writer, rows, batch_size):
+    cur = conn.cursor()
+    cur.execute("TRUNCATE analyses")
+    conn.commit()
+    started = time.perf_counter()
+    for start in range(0, len(rows), batch_size):
+        writer(cur, rows[start:start + batch_size])
+        conn.commit()
+    elapsed = time.perf_counter() - started
+    cur.execute("SELECT COUNT(*) FROM analyses")
+    assert cur.fetchone()[0] == len(rows)
+    cur.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--skip-loop-above", type=int, default=100000,
+                        help="ne pas mesurer la boucle au-delà de cette taille")
+    args = parser.parse_args()
+
+    url = os.environ.get("DATABASE_URL")
+    if not url:
+        sys.exit("DATABASE_URL requis")
+    conn = psycopg2.connect(url)
+    cur = conn.cursor()
+    cur.execute("""
+        CREATE TEMP TABLE analyses (
+            id SERIAL PRIMARY KEY, title TEXT, source TEXT, date TIMESTAMP, summary TEXT,
+            confidence REAL, corroboration_count INTEGER, corroboration_strength REAL,
+            bayesian_posterior REAL, raw JSONB, created_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+    conn.commit()
+    cur.close()
+
+    writers = [("loop", write_rows_loop), ("execute_values", write_rows_values), ("copy", write_rows_copy)]
+    print(f"{'lignes':>8} | {'méthode':<15} | {'durée (s)':>9} | {'lignes/s':>10}")
+    for n in args.sizes:
+        rows = [_analysis_row(a) for a in make_analyses(n)]
+        for name, writer in writers:
+            if name == "loop" and n > args.skip_loop_above:
+                continue
+            elapsed = run(conn, writer, rows, args.batch_size)
+            print(f"{n:>8} | {name:<15} | {elapsed:>9.3f} | {n / elapsed:>10.0f}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+# rss_aggregator/modules/aggregates.py
+"""
+Agrégats par jour calculés là où sont les données, sans charger les analyses
+en Python : GROUP BY date_trunc('day') avec agrégats FILTER sur PostgreSQL,
+group-by pandas vectorisés sur l'archive Parquet locale. Seules les lignes
+agrégées (une par jour, une par jour et thème) sont renvoyées.
+Mêmes règles que modules.analysis_utils : seuils de sentiment ±0.1 ou
+libellé (sentiment_bucket), score de sentiment (extract_sentiment_score),
+noms de thèmes (extract_theme_names).
+"""
+
+import datetime
+from typing import Dict, Any, Union
+
+import pandas as pd
+
+from modules.db_manager import get_database_url, db_connection
+from modules import parquet_store
+
+_SUM_FIELDS = ("total", "positive", "neutral", "negative",
+               "sum_score", "sum_confidence", "sum_posterior", "sum_corroboration")
+
+# ------- PostgreSQL -------
+
+# Valeur JSON "vraie" au sens de Python (ni nulle, ni vide, ni 0 / false)
+_TRUTHY = "CASE WHEN {0} IN ('null', '[]', '{{}}', '\"\"', 'false', '0') THEN NULL ELSE {0} END"
+
+_DAILY_SQL = """
+    SELECT date_trunc('day', a.date)::date AS day,
+           COUNT(*)::int AS total,
+           COUNT(*) FILTER (WHERE b.bucket = 'positive')::int AS positive,
+           COUNT(*) FILTER (WHERE b.bucket = 'neutral')::int AS neutral,
+           COUNT(*) FILTER (WHERE b.bucket = 'negative')::int AS negative,
+           COALESCE(SUM(b.score), 0)::float AS sum_score,
+           COALESCE(SUM(a.confidence), 0)::float AS sum_confidence,
+           COALESCE(SUM(a.bayesian_posterior), 0)::float AS sum_posterior,
+           COALESCE(SUM(a.corroboration_strength), 0)::float AS sum_corroboration
+    FROM analyses a
+    -- Premier champ de sentiment renseigné ; pour un objet, son score sinon son libellé
+    CROSS JOIN LATERAL (
+        SELECT COALESCE(NULLIF(a.raw->'sentiment', 'null'), NULLIF(a.raw->'tone', 'null'),
+                        NULLIF(a.raw->'sentiment_label', 'null')) AS v
+    ) s
+    CROSS JOIN LATERAL (
+        SELECT CASE WHEN jsonb_typeof(s.v) = 'object'
+                    THEN COALESCE(NULLIF(s.v->'score', 'null'), s.v->'sentiment')
+                    ELSE s.v END AS v
+    ) l
+    CROSS JOIN LATERAL (
+        SELECT CASE
+                   WHEN jsonb_typeof(l.v) = 'number' THEN
+                       CASE WHEN (l.v #>> '{}')::float > 0.1 THEN 'positive'
+                            WHEN (l.v #>> '{}')::float < -0.1 THEN 'negative'
+                            ELSE 'neutral' END
+                   WHEN jsonb_typeof(l.v) = 'string' THEN
+                       CASE WHEN lower(l.v #>> '{}') LIKE '%%pos%%' THEN 'positive'
+                            WHEN lower(l.v #>> '{}') LIKE '%%neg%%' THEN 'negative'
+                            ELSE 'neutral' END
+                   ELSE 'neutral'
+               END AS bucket,
+               CASE WHEN jsonb_typeof(a.raw->'sentiment'->'score') = 'number' THEN (a.raw->'sentiment'->>'score')::float
+                    WHEN jsonb_typeof(a.raw->'sentiment') = 'number' THEN (a.raw->>'sentiment')::float
+                    WHEN jsonb_typeof(a.raw->'score_corrected') = 'number' THEN (a.raw->>'score_corrected')::float
+               END AS score
+    ) b
+    WHERE a.date >= %s AND a.date < %s
+    GROUP BY 1
+"""
+
+_THEMES_SQL = """
+    SELECT date_trunc('day', a.date)::date AS day, n.name AS theme, COUNT(*)::int AS total
+    FROM analyses a
+    -- Premier champ de thèmes renseigné, ramené à un tableau JSON
+    CROSS JOIN LATERAL (
+        SELECT COALESCE({themes}, {detected}, {topics}, {theme}) AS v
+    ) t
+    CROSS JOIN LATERAL jsonb_array_elements(
+        CASE jsonb_typeof(t.v)
+            WHEN 'array' THEN t.v
+            WHEN 'string' THEN jsonb_build_array(t.v)
+            WHEN 'object' THEN
+                CASE WHEN jsonb_typeof(t.v->'names') = 'array' THEN t.v->'names'
+                     ELSE (SELECT COALESCE(jsonb_agg(k), '[]') FROM jsonb_object_keys(t.v) k) END
+            ELSE '[]'
+        END
+    ) e
+    CROSS JOIN LATERAL (
+        SELECT btrim(CASE WHEN jsonb_typeof(e) = 'object' THEN e->>'name' ELSE e #>> '{{}}' END) AS name
+    ) n
+    WHERE a.date >= %s AND a.date < %s AND n.name <> ''
+    GROUP BY 1, 2
+""".format(**{k: _TRUTHY.format(f"a.raw->'{f}'") for k, f in
+              (("themes", "themes"), ("detected", "detected_themes"), ("topics", "topics"), ("theme", "theme"))})
+
+
+def _read_sql(start: datetime.date, end: datetime.date) -> Dict[str, Any]:
+    bounds = (start, end + datetime.timedelta(days=1))
+    with db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(_DAILY_SQL, bounds)
+        daily = {r["day"].isoformat(): {f: r[f] for f in _SUM_FIELDS} for r in cur.fetchall()}
+        cur.execute(_THEMES_SQL, bounds)
+        themes: Dict[str, Dict[str, int]] = {}
+        for r in cur.fetchall():
+            themes.setdefault(r["day"].isoformat(), {})[r["theme"]] = r["total"]
+        cur.close()
+    return {"daily": daily, "themes": themes}
+
+
+# ------- Archive Parquet (dev) -------
+
+def _read_parquet(start: datetime.date, end: datetime.date) -> Dict[str, Any]:
+    table = parquet_store.scan_analyses(
+        columns=["day", "sentiment_bucket", "sentiment_score", "confidence",
+                 "bayesian_posterior", "corroboration_strength", "themes"],
+        start=datetime.datetime.combine(start, datetime.time()),
+        end=datetime.datetime.combine(end + datetime.timedelta(days=1), datetime.time())
+    )
+    if table.num_rows == 0:
+        return {"daily": {}, "themes": {}}
+    df = table.to_pandas()
+
+    # Fichiers antérieurs à la colonne sentiment_bucket : seuils appliqués au score
+    score = df["sentiment_score"]
+    derived = pd.Series("neutral", index=df.index).mask(score > 0.1, "positive").mask(score < -0.1, "negative")
+    bucket = df["sentiment_bucket"].fillna(derived)
+
+    grouped = df.assign(
+        total=1,
+        positive=(bucket == "positive").astype(int),
+        neutral=(bucket == "neutral").astype(int),
+        negative=(bucket == "negative").astype(int),
+        sum_score=score.fillna(0.0),
+        sum_confidence=df["confidence"].fillna(0.0),
+        sum_posterior=df["bayesian_posterior"].fillna(0.0),
+        sum_corroboration=df["corroboration_strength"].fillna(0.0)
+    ).groupby("day")[list(_SUM_FIELDS)].sum()
+    daily = {day: {f: (int(v) if f in ("total", "positive", "neutral", "negative") else float(v))
+                   for f, v in row.items()}
+             for day, row in grouped.to_dict("index").items()}
+
+    exploded = df[["day", "themes"]].explode("themes").dropna(subset=["themes"])
+    themes: Dict[str, Dict[str, int]] = {}
+    for (day, theme), n in exploded.groupby(["day", "themes"]).size().items():
+        themes.setdefault(day, {})[theme] = int(n)
+    return {"daily": daily, "themes": themes}
+
+
+def read_daily(start: Union[str, datetime.date], end: Union[str, datetime.date]) -> Dict[str, Any]:
+    """
+    Agrégats des jours [start, end] (inclus) :
+    {"daily": {jour: {total, positive, neutral, negative, sum_score,
+    sum_confidence, sum_posterior, sum_corroboration}}, "themes": {jour: {thème: n}}}.
+    """
+    if isinstance(start, str):
+        start = datetime.date.fromisoformat(start)
+    if isinstance(end, str):
+        end = datetime.date.fromisoformat(end)
+    if get_database_url():
+        return _read_sql(start, end)
+    return _read_parquet(start, end)
+
+
+def sentiment_stats(days: int = 7) -> Dict[str, Any]:
+    """Répartition et moyennes de sentiment sur les `days` derniers jours, et détail par jour."""
+    today = datetime.date.today()
+    data = read_daily(today - datetime.timedelta(days=days), today)
+    totals = {f: 0 for f in _SUM_FIELDS}
+    for d in data["daily"].values():
+        for f in _SUM_FIELDS:
+            totals[f] += d[f]
+    n = totals["total"]
+    return {
+        "total": n,
+        "positive": totals["positive"],
+        "negative": totals["negative"],
+        "neutral": totals["neutral"],
+        "average_score": totals["sum_score"] / n if n else 0,
+        "confidence_avg": totals["sum_confidence"] / n if n else 0,
+        "bayesian_avg": totals["sum_posterior"] / n if n else 0,
+        "daily": [{"date": day, **{f: data["daily"][day][f] for f in ("total", "positive", "neutral", "negative")}}
+                  for day in sorted(data["daily"])]
+    }
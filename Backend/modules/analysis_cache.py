@@ -0,0 +1,183 @@
+# rss_aggregator/modules/analysis_cache.py
+"""
+Cache des analyses approfondies, devant perform_deep_analysis.
+La clé est l'empreinte SHA-256 de tout ce que lit l'analyseur (titre,
+contenu, thèmes, sentiment, flux) et de ANALYZER_VERSION : un article
+renvoyé tel quel par le frontend n'est pas ré-analysé, un article modifié
+ou une nouvelle version des règles l'est.
+Premier niveau : LRU en mémoire avec durée de vie (TTL). Second niveau
+optionnel : table `deep_analysis_cache` (PostgreSQL ou SQLite local via
+db_manager), qui survit aux redémarrages.
+Une analyse qui s'appuie sur une recherche web vieillit avec elle : elle
+n'est gardée que DEEP_ANALYSIS_WEB_CACHE_TTL. Les analyses de repli
+(erreur de l'analyseur, `fallback`) ne sont jamais mises en cache.
+"""
+
+import os
+import copy
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+
+from modules.db_manager import db_connection
+from modules.deep_analysis import ANALYZER_VERSION
+
+logger = logging.getLogger("rss-aggregator")
+
+CACHE_MAX_ENTRIES = int(os.getenv("DEEP_ANALYSIS_CACHE_SIZE", "2048"))
+CACHE_TTL = float(os.getenv("DEEP_ANALYSIS_CACHE_TTL", str(24 * 3600)))
+# Durée de vie d'une analyse qui intègre une recherche web (résultats datés)
+WEB_CACHE_TTL = float(os.getenv("DEEP_ANALYSIS_WEB_CACHE_TTL", "3600"))
+# Second niveau en base (0 pour le désactiver)
+CACHE_PERSIST = os.getenv("DEEP_ANALYSIS_CACHE_PERSIST", "1") in ("1", "true", "True")
+
+
+def analysis_key(article: Dict[str, Any], themes: Any) -> str:
+    """Empreinte des entrées de perform_deep_analysis et de la version de l'analyseur."""
+    sentiment = article.get("sentiment")
+    payload = [
+        ANALYZER_VERSION,
+        article.get("title", ""),
+        article.get("content", ""),
+        themes,
+        sentiment.get("score") if isinstance(sentiment, dict) else None,
+        article.get("feed", "")
+    ]
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """LRU + TTL en mémoire, adossé à une table optionnelle."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL,
+                 persist: bool = CACHE_PERSIST, web_ttl: float = WEB_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.web_ttl = min(web_ttl, ttl)
+        self.persist = persist
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # clé -> (expiration, analyse)
+        self._stats = {"hits": 0, "store_hits": 0, "misses": 0, "evictions": 0,
+                       "expired": 0, "store_errors": 0, "skipped_fallbacks": 0}
+
+    # ------- Mémoire -------
+
+    def _get_memory(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < now:
+            del self._entries[key]
+            self._stats["expired"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _put_memory(self, key: str, analysis: Dict[str, Any], expires: float) -> None:
+        self._entries[key] = (expires, analysis)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    # ------- Base -------
+
+    def _load_stored(self, keys: List[str], now: float) -> Dict[str, tuple]:
+        if not self.persist or not keys:
+            return {}
+        try:
+            with db_connection() as conn:
+                cur = conn.cursor()
+                placeholders = ", ".join(["%s"] * len(keys))
+                cur.execute(f"""
+                    SELECT key, analysis, expires_at FROM deep_analysis_cache
+                    WHERE key IN ({placeholders}) AND expires_at >= %s
+                """, (*keys, now))
+                rows = cur.fetchall()
+                cur.close()
+            return {r["key"]: (r["expires_at"], json.loads(r["analysis"])) for r in rows}
+        except Exception as e:
+            self._stats["store_errors"] += 1
+            logger.warning(f"⚠️ Cache d'analyses: lecture en base impossible: {e}")
+            return {}
+
+    def _store(self, items: List[tuple]) -> None:
+        if not self.persist or not items:
+            return
+        try:
+            with db_connection() as conn:
+                cur = conn.cursor()
+                cur.executemany("""
+                    INSERT INTO deep_analysis_cache (key, analysis, expires_at)
+                    VALUES (%s, %s, %s)
+                    ON CONFLICT (key) DO UPDATE
+                        SET analysis = EXCLUDED.analysis, expires_at = EXCLUDED.expires_at
+                """, items)
+                # Purge des entrées expirées au fil des écritures
+                cur.execute("DELETE FROM deep_analysis_cache WHERE expires_at < %s", (time.time(),))
+                conn.commit()
+                cur.close()
+        except Exception as e:
+            self._stats["store_errors"] += 1
+            logger.warning(f"⚠️ Cache d'analyses: écriture en base impossible: {e}")
+
+    # ------- API -------
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Analyses en cache pour `keys` (copies, modifiables par l'appelant)."""
+        now = time.time()
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                analysis = self._get_memory(key, now)
+                if analysis is not None:
+                    found[key] = analysis
+                    self._stats["hits"] += 1
+                elif key not in missing:
+                    missing.append(key)
+        stored = self._load_stored(missing, now)
+        with self._lock:
+            for key, (expires, analysis) in stored.items():
+                self._put_memory(key, analysis, expires)
+                found[key] = analysis
+            self._stats["store_hits"] += len(stored)
+            self._stats["misses"] += len(missing) - len(stored)
+        return {key: copy.deepcopy(analysis) for key, analysis in found.items()}
+
+    def put_many(self, items: Dict[str, Dict[str, Any]]) -> None:
+        """Met en cache les analyses de `items`, sauf les analyses de repli."""
+        now = time.time()
+        entries = []
+        for key, analysis in items.items():
+            if analysis.get("fallback"):
+                continue
+            ttl = self.web_ttl if analysis.get("recherche_web") else self.ttl
+            entries.append((key, analysis, now + ttl))
+        with self._lock:
+            self._stats["skipped_fallbacks"] += len(items) - len(entries)
+            for key, analysis, expires in entries:
+                self._put_memory(key, copy.deepcopy(analysis), expires)
+        self._store([(key, json.dumps(analysis, ensure_ascii=False, default=str), expires)
+                     for key, analysis, expires in entries])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._stats)
+            out["size"] = len(self._entries)
+        lookups = out["hits"] + out["store_hits"] + out["misses"]
+        out["hit_rate"] = round((out["hits"] + out["store_hits"]) / lookups, 3) if lookups else 0.0
+        out.update({"max_entries": self.max_entries, "ttl": self.ttl, "web_ttl": self.web_ttl,
+                    "persist": self.persist, "analyzer_version": ANALYZER_VERSION})
+        return out
+
+
+analysis_cache = AnalysisCache()
@@ -1,5 +1,5 @@
 import math
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 
 def normalize_score(value: float, min_value: float = 0.0, max_value: float = 1.0) -> float:
@@ -76,3 +76,70 @@ def enrich_analysis(article: Dict) -> Dict:
     article["confidence"] = confidence
     article["confidence_explain"] = explain_confidence(confidence)
     return article
+
+
+def extract_sentiment_score(analysis: Dict) -> Optional[float]:
+    """
+    Score de sentiment numérique d'une analyse : dict {"score": ...}, nombre,
+    ou à défaut score corrigé. None si absent.
+    """
+    sentiment = analysis.get("sentiment")
+    if isinstance(sentiment, dict):
+        sentiment = sentiment.get("score")
+    if isinstance(sentiment, (int, float)) and not isinstance(sentiment, bool):
+        return float(sentiment)
+    score = analysis.get("score_corrected")
+    return float(score) if isinstance(score, (int, float)) else None
+
+
+def sentiment_bucket(analysis: Dict) -> str:
+    """
+    Classe une analyse en "positive" / "neutral" / "negative"
+    (score > 0.1 / < -0.1, ou libellé contenant pos/neg).
+    """
+    sentiment = None
+    for k in ("sentiment", "tone", "sentiment_label"):
+        if analysis.get(k) is not None:
+            sentiment = analysis.get(k)
+            break
+    if isinstance(sentiment, dict):
+        sentiment = sentiment.get("score") if sentiment.get("score") is not None else sentiment.get("sentiment")
+
+    if isinstance(sentiment, (int, float)):
+        if sentiment > 0.1:
+            return "positive"
+        if sentiment < -0.1:
+            return "negative"
+        return "neutral"
+    if isinstance(sentiment, str):
+        s = sentiment.lower()
+        if "pos" in s:
+            return "positive"
+        if "neg" in s:
+            return "negative"
+    return "neutral"
+
+
+def extract_theme_names(analysis: Dict) -> List[str]:
+    """Noms des thèmes d'une analyse (liste, dict {"names": [...]}, chaîne ou raw)."""
+    themes = None
+    for tk in ("themes", "detected_themes", "topics", "theme"):
+        if analysis.get(tk):
+            themes = analysis.get(tk)
+            break
+    if not themes and isinstance(analysis.get("raw"), dict) and analysis["raw"].get("themes"):
+        themes = analysis["raw"].get("themes")
+
+    if isinstance(themes, dict):
+        themes = themes["names"] if isinstance(themes.get("names"), list) else list(themes.keys())
+    elif isinstance(themes, str):
+        themes = [themes]
+    elif not isinstance(themes, list):
+        themes = []
+    names = []
+    for t in themes:
+        if isinstance(t, dict):
+            t = t.get("name")
+        if t:
+            names.append(str(t).strip())
+    return names
@@ -1,6 +1,31 @@
-from typing import List, Dict
+import os
+import re
+import time
+import heapq
+import itertools
+import threading
+from collections import defaultdict
+from typing import List, Dict, Optional, Iterable, Set
+
+import numpy as np
 from rapidfuzz import fuzz, process
 
+from modules.text_patterns import ANY_ENTITY
+
+# Pondération du score de corroboration : titre, résumé, même source
+TITLE_WEIGHT = 0.6
+SUMMARY_WEIGHT = 0.3
+SOURCE_WEIGHT = 0.1
+
+# Threads rapidfuzz pour cdist (-1 = tous les cœurs)
+CORROBORATION_WORKERS = int(os.getenv("CORROBORATION_WORKERS", "-1"))
+# Taille max (articles x candidats) d'une matrice de scores calculée d'un coup
+MAX_MATRIX_CELLS = int(os.getenv("CORROBORATION_MAX_CELLS", "5000000"))
+
+# Index inversé : un jeton présent dans plus de MAX_DF_RATIO des articles est ignoré
+INDEX_MAX_DF_RATIO = float(os.getenv("CORROBORATION_MAX_DF_RATIO", "0.05"))
+INDEX_MIN_SHARED = int(os.getenv("CORROBORATION_MIN_SHARED", "2"))
+
 
 def similarity(a: str, b: str) -> float:
     """
@@ -11,33 +36,217 @@ def similarity(a: str, b: str) -> float:
     return fuzz.token_sort_ratio(a, b) / 100.0
 
 
-def find_corroborations(article: Dict, recent_articles: List[Dict], threshold: float = 0.65) -> List[Dict]:
+def _similarity_matrix(queries: List[str], choices: List[str], workers: int,
+                       score_cutoff: float = 0) -> np.ndarray:
     """
-    Recherche d'autres articles récents présentant une similarité suffisante
-    (titre, résumé, source).
+    Matrice des similarity(q, c) en un seul appel cdist ; les paires dont une
+    chaîne est vide valent 0 comme dans similarity(). Les scores sous
+    `score_cutoff` (sur 100) sont ramenés à 0.
+    """
+    scores = process.cdist(queries, choices, scorer=fuzz.token_sort_ratio,
+                           dtype=np.float64, workers=workers, score_cutoff=score_cutoff)
+    scores /= 100.0
+    scores[[not q for q in queries], :] = 0.0
+    scores[:, [not c for c in choices]] = 0.0
+    return scores
+
+
+def score_matrix(articles: List[Dict], candidates: List[Dict], threshold: float = 0.0,
+                 workers: Optional[int] = None) -> np.ndarray:
+    """
+    Scores de corroboration (articles x candidats) :
+    titre * 0.6 + résumé * 0.3 + même source * 0.1.
+    Les scores de titre trop faibles pour atteindre `threshold` sont élagués
+    dès le calcul (le reste du score ne dépasse jamais 0.4).
     """
-    corroborations = []
-    a_title = article.get("title", "")
-    a_summary = article.get("summary", "")
-    a_source = article.get("source", "")
+    workers = CORROBORATION_WORKERS if workers is None else workers
+    title_cutoff = 0.0
+    if threshold > SUMMARY_WEIGHT + SOURCE_WEIGHT:
+        title_cutoff = max(0.0, (threshold - SUMMARY_WEIGHT - SOURCE_WEIGHT) / TITLE_WEIGHT * 100 - 1e-6)
 
-    for candidate in recent_articles:
-        b_title = candidate.get("title", "")
-        b_summary = candidate.get("summary", "")
-        b_source = candidate.get("source", "")
+    titles = _similarity_matrix([a.get("title") or "" for a in articles],
+                                [c.get("title") or "" for c in candidates], workers, title_cutoff)
+    summaries = _similarity_matrix([a.get("summary") or "" for a in articles],
+                                   [c.get("summary") or "" for c in candidates], workers)
 
-        score_title = similarity(a_title, b_title)
-        score_summary = similarity(a_summary, b_summary)
-        score_source = 1.0 if a_source == b_source else 0.0
+    source_ids = {}
+    a_sources = np.array([source_ids.setdefault(a.get("source", ""), len(source_ids)) for a in articles])
+    c_sources = np.array([source_ids.setdefault(c.get("source", ""), len(source_ids)) for c in candidates])
+    same_source = (a_sources[:, None] == c_sources[None, :]).astype(np.float64)
 
-        avg_score = (score_title * 0.6 + score_summary * 0.3 + score_source * 0.1)
+    return titles * TITLE_WEIGHT + summaries * SUMMARY_WEIGHT + same_source * SOURCE_WEIGHT
+
+
+_TOKEN_RE = re.compile(r"\w{3,}", re.UNICODE)
+# Formes équivalentes d'une même entité
+_ENTITY_ALIASES = {
+    "usa": "états-unis", "china": "chine", "uk": "royaume-uni", "un": "onu",
+    "nato": "otan", "union européenne": "ue", "who": "oms"
+}
+
+
+def article_tokens(article: Dict) -> Set[str]:
+    """
+    Jetons d'indexation : mots de 3 lettres et plus du titre et du résumé
+    (en minuscules), et entités nommées normalisées préfixées par "ent:".
+    """
+    text = f"{article.get('title') or ''} {article.get('summary') or ''}"
+    tokens = set(_TOKEN_RE.findall(text.lower()))
+    for match in ANY_ENTITY.findall(text):
+        name = match.lower()
+        tokens.add("ent:" + _ENTITY_ALIASES.get(name, name))
+    return tokens
+
+
+class CandidateIndex:
+    """
+    Index inversé (jeton -> numéros d'entrées) sur la fenêtre de corroboration.
+    Les jetons trop fréquents (IDF faible, df > max_df_ratio * N) sont
+    ignorés à la requête ; seuls les articles partageant au moins
+    `min_shared` jetons rares, ou une entité nommée, sont retenus comme
+    candidats au calcul de similarité.
+    Chaque ajout est une entrée distincte (numéro séquentiel) : deux reprises
+    d'une même dépêche, même titre sans id ni lien, restent deux candidats.
+    """
 
-        if avg_score >= threshold:
-            corroborations.append({
+    def __init__(self, window_seconds: Optional[float] = None,
+                 max_df_ratio: float = INDEX_MAX_DF_RATIO, min_shared: int = INDEX_MIN_SHARED,
+                 min_stop_df: int = 20):
+        self.window_seconds = window_seconds
+        self.max_df_ratio = max_df_ratio
+        self.min_shared = min_shared
+        self.min_stop_df = min_stop_df
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._docs: Dict[int, tuple] = {}  # numéro -> (article, jetons, horodatage)
+        self._expiry = []  # tas (horodatage, numéro)
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _is_stop(self, token: str) -> bool:
+        """IDF trop faible : jeton présent dans une trop grande part de la fenêtre."""
+        df = len(self._postings.get(token, ()))
+        return df > max(self.min_stop_df, self.max_df_ratio * len(self._docs))
+
+    def add(self, article: Dict, timestamp: Optional[float] = None) -> int:
+        """Indexe `article` ; renvoie son numéro d'entrée."""
+        timestamp = time.time() if timestamp is None else timestamp
+        tokens = article_tokens(article)
+        with self._lock:
+            key = next(self._seq)
+            self._docs[key] = (article, tokens, timestamp)
+            for token in tokens:
+                self._postings[token].add(key)
+            if self.window_seconds is not None:
+                heapq.heappush(self._expiry, (timestamp, key))
+        return key
+
+    def add_many(self, articles: Iterable[Dict], timestamp: Optional[float] = None) -> None:
+        for article in articles:
+            self.add(article, timestamp)
+
+    def _discard(self, key: int) -> None:
+        entry = self._docs.pop(key, None)
+        if not entry:
+            return
+        for token in entry[1]:
+            posting = self._postings.get(token)
+            if posting is not None:
+                posting.discard(key)
+                if not posting:
+                    del self._postings[token]
+
+    def remove(self, key: int) -> None:
+        with self._lock:
+            self._discard(key)
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Retire les articles sortis de la fenêtre ; renvoie leur nombre."""
+        if self.window_seconds is None:
+            return 0
+        limit = (time.time() if now is None else now) - self.window_seconds
+        removed = 0
+        with self._lock:
+            while self._expiry and self._expiry[0][0] < limit:
+                timestamp, key = heapq.heappop(self._expiry)
+                if key in self._docs:
+                    self._discard(key)
+                    removed += 1
+        return removed
+
+    def candidates(self, article: Dict, exclude: Optional[int] = None) -> List[Dict]:
+        """
+        Articles indexés partageant assez de jetons rares avec `article`, sauf
+        l'entrée `exclude` et les entrées de la même analyse enregistrée (même id).
+        """
+        tokens = article_tokens(article)
+        own_id = article.get("id")
+        with self._lock:
+            shared = defaultdict(int)
+            entity_hit = set()
+            for token in tokens:
+                posting = self._postings.get(token)
+                if not posting or self._is_stop(token):
+                    continue
+                is_entity = token.startswith("ent:")
+                for key in posting:
+                    shared[key] += 1
+                    if is_entity:
+                        entity_hit.add(key)
+            shared.pop(exclude, None)
+            out = []
+            for key, n in shared.items():
+                if n < self.min_shared and key not in entity_hit:
+                    continue
+                doc = self._docs[key][0]
+                if own_id is not None and doc.get("id") == own_id:
+                    continue
+                out.append(doc)
+            return out
+
+
+def find_corroborations_batch(articles: List[Dict], recent_articles: Optional[List[Dict]] = None,
+                              threshold: float = 0.65, workers: Optional[int] = None,
+                              index: Optional[CandidateIndex] = None) -> List[List[Dict]]:
+    """
+    Corroborations de plusieurs articles contre le même ensemble de candidats,
+    par matrices de scores (process.cdist, multi-threads). Renvoie une liste
+    de résultats par article, dans l'ordre des candidats.
+    Avec `index`, chaque article n'est comparé qu'aux candidats de l'index
+    inversé (jetons rares / entités en commun) au lieu de toute la fenêtre.
+    """
+    if index is not None:
+        return [_score_candidates([a], index.candidates(a), threshold, workers)[0] for a in articles]
+    return _score_candidates(articles, recent_articles or [], threshold, workers)
+
+
+def _score_candidates(articles: List[Dict], recent_articles: List[Dict],
+                      threshold: float, workers: Optional[int]) -> List[List[Dict]]:
+    results = [[] for _ in articles]
+    if not articles or not recent_articles:
+        return results
+
+    rows_per_chunk = max(1, MAX_MATRIX_CELLS // len(recent_articles))
+    for start in range(0, len(articles), rows_per_chunk):
+        chunk = articles[start:start + rows_per_chunk]
+        scores = score_matrix(chunk, recent_articles, threshold, workers)
+        for i, j in zip(*np.nonzero(scores >= threshold)):
+            candidate = recent_articles[j]
+            results[start + i].append({
                 "id": candidate.get("id"),
-                "title": b_title,
-                "source": b_source,
-                "similarity": round(avg_score, 3)
+                "title": candidate.get("title", ""),
+                "source": candidate.get("source", ""),
+                "similarity": round(float(scores[i, j]), 3)
             })
+    return results
 
-    return corroborations
\ No newline at end of file
+
+def find_corroborations(article: Dict, recent_articles: Optional[List[Dict]] = None, threshold: float = 0.65,
+                        index: Optional[CandidateIndex] = None) -> List[Dict]:
+    """
+    Recherche d'autres articles récents présentant une similarité suffisante
+    (titre, résumé, source), parmi `recent_articles` ou les candidats de `index`.
+    """
+    return find_corroborations_batch([article], recent_articles, threshold, index=index)[0]
@@ -1,4 +1,502 @@
-# DB Manager placeholder filled
+# rss_aggregator/modules/db_manager.py
+"""
+Gestion des connexions base de données.
+Pool thread-safe (taille min/max, vérification à l'emprunt, recyclage des
+connexions inactives, métriques d'attente) au-dessus de PostgreSQL si
+DATABASE_URL est définie, sinon d'une base SQLite locale (dev).
+"""
+
+import os
+import re
+import time
 import sqlite3
-def get_connection(db_path='data.sqlite'):
-    return sqlite3.connect(db_path)
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger("rss-aggregator")
+
+POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+# Une connexion restée inactive plus longtemps est fermée
+POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", "300"))
+# Au-delà de cette inactivité, la connexion est vérifiée (SELECT 1) avant d'être prêtée
+POOL_CHECK_AFTER = float(os.getenv("DB_POOL_CHECK_AFTER", "30"))
+SQLITE_PATH = os.getenv(
+    "SQLITE_PATH",
+    os.path.join(os.path.dirname(__file__), "..", "data", "local.sqlite")
+)
+
+
+class PoolTimeoutError(Exception):
+    """Aucune connexion disponible dans le délai imparti."""
+
+
+def get_database_url() -> Optional[str]:
+    return os.environ.get("DATABASE_URL") or os.environ.get("POSTGRES_URL")
+
+
+# ------- Fallback SQLite -------
+
+_PARAM_RE = re.compile(r"%s")
+
+
+class _SQLiteCursor:
+    """Curseur SQLite acceptant le style de paramètres %s et renvoyant des dicts."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(_PARAM_RE.sub("?", sql), params or ())
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._cursor.executemany(_PARAM_RE.sub("?", sql), seq_of_params)
+        return self
+
+    def _row(self, row):
+        return dict(zip([d[0] for d in self._cursor.description], row)) if row is not None else None
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._row(r) for r in self._cursor.fetchall()]
+
+    def fetchmany(self, size=None):
+        return [self._row(r) for r in self._cursor.fetchmany(size or self._cursor.arraysize)]
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def close(self):
+        self._cursor.close()
+
+
+class _SQLiteConnection:
+    closed = False
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=POOL_TIMEOUT)
+
+    def cursor(self, *args, **kwargs):
+        return _SQLiteCursor(self._conn.cursor())
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self.closed = True
+        self._conn.close()
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+
+def _connect():
+    url = get_database_url()
+    if url:
+        import psycopg2
+        from psycopg2.extras import RealDictCursor
+        return psycopg2.connect(url, cursor_factory=RealDictCursor)
+    os.makedirs(os.path.dirname(SQLITE_PATH), exist_ok=True)
+    return _SQLiteConnection(SQLITE_PATH)
+
+
+def _is_closed(conn) -> bool:
+    return bool(getattr(conn, "closed", False))
+
+
+def _in_transaction(conn) -> bool:
+    if isinstance(conn, _SQLiteConnection):
+        return conn.in_transaction
+    # psycopg2 : 0 = IDLE (aucune transaction ouverte)
+    return conn.get_transaction_status() != 0
+
+
+class ConnectionPool:
+    """
+    Pool de connexions borné. Les connexions inactives sont réutilisées en
+    LIFO (la plus récente d'abord), fermées au-delà de `max_idle` secondes,
+    et vérifiées par un SELECT 1 si elles n'ont pas servi depuis `check_after`.
+    """
+
+    def __init__(self, factory=_connect, minconn: int = POOL_MIN, maxconn: int = POOL_MAX,
+                 timeout: float = POOL_TIMEOUT, max_idle: float = POOL_MAX_IDLE,
+                 check_after: float = POOL_CHECK_AFTER):
+        self._factory = factory
+        self.minconn = minconn
+        self.maxconn = max(1, maxconn)
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check_after = check_after
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, last_used)
+        self._size = 0
+        self._closed = False
+        self._stats = {
+            "checkouts": 0, "waits": 0, "wait_time_total": 0.0, "wait_time_max": 0.0,
+            "timeouts": 0, "created": 0, "recycled": 0, "discarded": 0, "health_check_failures": 0
+        }
+
+    def _close_quietly(self, conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _healthy(self, conn, idle_for: float) -> bool:
+        if _is_closed(conn):
+            return False
+        if idle_for < self.check_after:
+            return True
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.fetchone()
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def getconn(self, timeout: Optional[float] = None):
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        waited = False
+        while True:
+            candidate = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolTimeoutError("pool fermé")
+                    if self._idle:
+                        conn, last_used = self._idle.pop()
+                        idle_for = time.monotonic() - last_used
+                        if idle_for <= self.max_idle:
+                            candidate = (conn, idle_for)
+                            break
+                        self._size -= 1
+                        self._stats["recycled"] += 1
+                        self._close_quietly(conn)
+                        continue
+                    if self._size < self.maxconn:
+                        self._size += 1
+                        break
+                    remaining = timeout - (time.monotonic() - started)
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeoutError(f"aucune connexion libre après {timeout}s ({self.maxconn} en usage)")
+                    waited = True
+                    self._cond.wait(remaining)
+
+            if candidate is None:
+                # Création hors verrou (peut prendre du temps sur une base distante)
+                try:
+                    conn = self._factory()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._stats["created"] += 1
+                    self._checkout(started, waited)
+                return conn
+
+            # Vérification hors verrou, la connexion est déjà comptée comme empruntée
+            conn, idle_for = candidate
+            if self._healthy(conn, idle_for):
+                with self._cond:
+                    self._checkout(started, waited)
+                return conn
+            with self._cond:
+                self._size -= 1
+                self._stats["health_check_failures"] += 1
+                self._stats["discarded"] += 1
+                self._cond.notify()
+            self._close_quietly(conn)
+
+    def _checkout(self, started: float, waited: bool) -> None:
+        wait = time.monotonic() - started
+        self._stats["checkouts"] += 1
+        if waited:
+            self._stats["waits"] += 1
+        self._stats["wait_time_total"] += wait
+        self._stats["wait_time_max"] = max(self._stats["wait_time_max"], wait)
+
+    def putconn(self, conn, discard: bool = False) -> None:
+        if conn is None:
+            return
+        if not discard and not _is_closed(conn):
+            try:
+                if _in_transaction(conn):
+                    conn.rollback()
+            except Exception:
+                discard = True
+        with self._cond:
+            if discard or _is_closed(conn) or self._closed:
+                self._size -= 1
+                self._stats["discarded"] += int(discard)
+                self._close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+                self._trim_idle()
+            self._cond.notify()
+
+    def _trim_idle(self) -> None:
+        """Ferme les connexions inactives trop anciennes (au-delà du minimum)."""
+        now = time.monotonic()
+        while self._idle and self._size > self.minconn and now - self._idle[0][1] > self.max_idle:
+            conn, _ = self._idle.popleft()
+            self._size -= 1
+            self._stats["recycled"] += 1
+            self._close_quietly(conn)
+
+    def closeall(self) -> None:
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._size -= 1
+                self._close_quietly(conn)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            out = dict(self._stats)
+            out.update({
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "max": self.maxconn,
+                "wait_time_avg": round(out["wait_time_total"] / out["checkouts"], 6) if out["checkouts"] else 0.0
+            })
+            out["wait_time_total"] = round(out["wait_time_total"], 6)
+            out["wait_time_max"] = round(out["wait_time_max"], 6)
+        return out
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+
+def get_connection(timeout: Optional[float] = None):
+    """Emprunte une connexion au pool (à rendre avec put_connection)."""
+    return get_pool().getconn(timeout)
+
+
+def put_connection(conn, discard: bool = False) -> None:
+    """Rend une connexion au pool ; `discard=True` la ferme (connexion suspecte)."""
+    get_pool().putconn(conn, discard=discard)
+
+
+@contextmanager
+def db_connection():
+    """Connexion empruntée pour la durée du bloc ; rollback si exception."""
+    conn = get_connection()
+    try:
+        yield conn
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception:
+            put_connection(conn, discard=True)
+            raise
+        put_connection(conn)
+        raise
+    put_connection(conn)
+
+
+def pool_stats() -> Dict[str, Any]:
+    stats = get_pool().stats()
+    stats["backend"] = "postgresql" if get_database_url() else "sqlite"
+    return stats
+
+
+_PG_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS themes (
+        id SERIAL PRIMARY KEY,
+        name TEXT UNIQUE NOT NULL,
+        enabled BOOLEAN DEFAULT TRUE,
+        keywords TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS feeds (
+        id SERIAL PRIMARY KEY,
+        title TEXT,
+        url TEXT UNIQUE NOT NULL,
+        enabled BOOLEAN DEFAULT TRUE,
+        theme_id INTEGER REFERENCES themes(id),
+        etag TEXT,
+        last_modified TEXT,
+        content_hash TEXT,
+        seen_guids TEXT,
+        last_fetched_at TIMESTAMP
+    )
+    """,
+    # Tables créées avant le cache HTTP des flux (voir modules.feed_scraper)
+    """
+    ALTER TABLE feeds
+        ADD COLUMN IF NOT EXISTS etag TEXT,
+        ADD COLUMN IF NOT EXISTS last_modified TEXT,
+        ADD COLUMN IF NOT EXISTS content_hash TEXT,
+        ADD COLUMN IF NOT EXISTS seen_guids TEXT,
+        ADD COLUMN IF NOT EXISTS last_fetched_at TIMESTAMP
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS analyses (
+        id SERIAL PRIMARY KEY,
+        title TEXT,
+        source TEXT,
+        date TIMESTAMP,
+        summary TEXT,
+        confidence REAL,
+        corroboration_count INTEGER DEFAULT 0,
+        corroboration_strength REAL DEFAULT 0,
+        bayesian_posterior REAL DEFAULT 0,
+        raw JSONB,
+        created_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_analyses_date ON analyses (date DESC)",
+    # Pagination par clé (date, id) de storage_manager.iter_analyses
+    "CREATE INDEX IF NOT EXISTS idx_analyses_date_id ON analyses (date DESC, id DESC)",
+    # Agrégats tenus à jour par save_analysis_batch (voir modules.rollups)
+    """
+    CREATE TABLE IF NOT EXISTS analysis_daily_rollups (
+        day DATE PRIMARY KEY,
+        total INTEGER NOT NULL DEFAULT 0,
+        positive INTEGER NOT NULL DEFAULT 0,
+        neutral INTEGER NOT NULL DEFAULT 0,
+        negative INTEGER NOT NULL DEFAULT 0,
+        sum_confidence DOUBLE PRECISION NOT NULL DEFAULT 0,
+        sum_posterior DOUBLE PRECISION NOT NULL DEFAULT 0,
+        sum_corroboration DOUBLE PRECISION NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS analysis_theme_rollups (
+        day DATE NOT NULL,
+        theme TEXT NOT NULL,
+        total INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, theme)
+    )
+    """,
+    # Analyses approfondies mémorisées (voir modules.analysis_cache)
+    """
+    CREATE TABLE IF NOT EXISTS deep_analysis_cache (
+        key TEXT PRIMARY KEY,
+        analysis TEXT NOT NULL,
+        expires_at DOUBLE PRECISION NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_deep_analysis_cache_expires ON deep_analysis_cache (expires_at)",
+    # Tâches asynchrones (voir modules.job_queue)
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        params TEXT,
+        status TEXT NOT NULL,
+        progress_done INTEGER NOT NULL DEFAULT 0,
+        progress_total INTEGER NOT NULL DEFAULT 0,
+        partial TEXT,
+        result TEXT,
+        error TEXT,
+        created_at DOUBLE PRECISION NOT NULL,
+        updated_at DOUBLE PRECISION NOT NULL,
+        owner TEXT,
+        lease_until DOUBLE PRECISION
+    )
+    """,
+    # Tables créées avant le bail des tâches
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS owner TEXT",
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS lease_until DOUBLE PRECISION",
+    "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)"
+]
+
+_SQLITE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS themes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL,
+        enabled BOOLEAN DEFAULT 1,
+        keywords TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS feeds (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT,
+        url TEXT UNIQUE NOT NULL,
+        enabled BOOLEAN DEFAULT 1,
+        theme_id INTEGER REFERENCES themes(id),
+        etag TEXT,
+        last_modified TEXT,
+        content_hash TEXT,
+        seen_guids TEXT,
+        last_fetched_at TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS deep_analysis_cache (
+        key TEXT PRIMARY KEY,
+        analysis TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_deep_analysis_cache_expires ON deep_analysis_cache (expires_at)",
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        params TEXT,
+        status TEXT NOT NULL,
+        progress_done INTEGER NOT NULL DEFAULT 0,
+        progress_total INTEGER NOT NULL DEFAULT 0,
+        partial TEXT,
+        result TEXT,
+        error TEXT,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        owner TEXT,
+        lease_until REAL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)"
+]
+
+
+def init_db() -> None:
+    """Crée les tables de base si besoin (PostgreSQL ou SQLite local)."""
+    statements = _PG_SCHEMA if get_database_url() else _SQLITE_SCHEMA
+    try:
+        with db_connection() as conn:
+            cur = conn.cursor()
+            for stmt in statements:
+                cur.execute(stmt)
+            conn.commit()
+            cur.close()
+    except Exception as e:
+        logger.error(f"❌ init_db: {e}")
@@ -0,0 +1,208 @@
+# rss_aggregator/modules/dedup.py
+"""
+Détection des quasi-doublons à l'ingestion (dépêches reprises par plusieurs
+titres). Chaque article reçoit une empreinte SimHash 64 bits de son titre et
+de son résumé ; l'index retrouve en temps quasi constant un article récent à
+distance de Hamming <= max_distance, qui devient l'article canonique.
+"""
+
+import os
+import re
+import time
+import hashlib
+import threading
+from collections import deque
+from typing import List, Dict, Any, Optional, Tuple
+
+_WORD_RE = re.compile(r"\w{2,}", re.UNICODE)
+_BITS = 64
+_BANDS = 8
+_BAND_BITS = _BITS // _BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """Empreinte SimHash 64 bits (mots + bigrammes de mots, en minuscules)."""
+    words = _WORD_RE.findall((text or "").lower())
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if not features:
+        return 0
+    weights = [0] * _BITS
+    for feature in features:
+        h = _token_hash(feature)
+        for bit in range(_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+    return sum(1 << bit for bit, w in enumerate(weights) if w > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def article_key(article: Dict[str, Any]) -> str:
+    """
+    Identifiant stable d'un article : id, lien, sinon empreinte du titre, du
+    texte et de la source (deux articles sans id ni lien qui partagent
+    seulement un titre ne se confondent pas).
+    """
+    key = article.get("id") or article.get("articleId") or article.get("link")
+    if key:
+        return str(key)
+    parts = [article.get(f) or "" for f in ("title", "summary", "content", "source", "feed")]
+    return hashlib.sha1("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+def article_fingerprint(article: Dict[str, Any]) -> int:
+    summary = article.get("summary") or article.get("content") or ""
+    return simhash(f"{article.get('title', '')} {summary[:1000]}")
+
+
+class SimHashIndex:
+    """
+    Index SimHash à fenêtre glissante. Les 64 bits sont découpés en 8 bandes
+    de 8 bits : deux empreintes à distance < 8 partagent forcément une
+    bande, seules les entrées de ces seaux sont comparées.
+    """
+
+    def __init__(self, max_distance: int = 5, window_seconds: float = 48 * 3600,
+                 max_entries: int = 50000):
+        if max_distance >= _BANDS:
+            raise ValueError(f"max_distance doit être < {_BANDS}")
+        self.max_distance = max_distance
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[int, float, Any]] = {}
+        self._order = deque()
+        self._buckets = [dict() for _ in range(_BANDS)]
+
+    @staticmethod
+    def _bands(fingerprint: int):
+        return [(fingerprint >> (i * _BAND_BITS)) & _BAND_MASK for i in range(_BANDS)]
+
+    def _evict(self, now: float) -> None:
+        while self._order and (now - self._order[0][1] > self.window_seconds
+                               or len(self._entries) > self.max_entries):
+            key, added = self._order.popleft()
+            entry = self._entries.get(key)
+            if not entry or entry[1] != added:
+                continue
+            del self._entries[key]
+            for i, band in enumerate(self._bands(entry[0])):
+                bucket = self._buckets[i].get(band)
+                if bucket:
+                    bucket.discard(key)
+                    if not bucket:
+                        del self._buckets[i][band]
+
+    def add(self, key: str, fingerprint: int, payload: Any = None, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous:
+                for i, band in enumerate(self._bands(previous[0])):
+                    self._buckets[i].get(band, set()).discard(key)
+            self._entries[key] = (fingerprint, now, payload)
+            self._order.append((key, now))
+            for i, band in enumerate(self._bands(fingerprint)):
+                self._buckets[i].setdefault(band, set()).add(key)
+            self._evict(now)
+
+    def find(self, fingerprint: int, exclude: Optional[str] = None,
+             now: Optional[float] = None) -> Optional[Tuple[str, int, Any]]:
+        """Renvoie (clé, distance, payload) du plus proche voisin dans le seuil, sinon None."""
+        now = time.time() if now is None else now
+        best = None
+        with self._lock:
+            self._evict(now)
+            candidates = set()
+            for i, band in enumerate(self._bands(fingerprint)):
+                candidates.update(self._buckets[i].get(band, ()))
+            candidates.discard(exclude)
+            for key in candidates:
+                fp, _, payload = self._entries[key]
+                d = hamming(fingerprint, fp)
+                if d <= self.max_distance and (best is None or d < best[1]):
+                    best = (key, d, payload)
+        return best
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_index = SimHashIndex(
+    max_distance=int(os.getenv("DEDUP_MAX_DISTANCE", "5")),
+    window_seconds=float(os.getenv("DEDUP_WINDOW_HOURS", "48")) * 3600
+)
+
+
+def find_duplicate(article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Cherche un article canonique quasi identique déjà ingéré.
+    Renvoie {"canonical_id", "distance", "analysis"} ou None.
+    """
+    match = _index.find(article_fingerprint(article), exclude=article_key(article))
+    if not match:
+        return None
+    key, distance, analysis = match
+    return {"canonical_id": key, "distance": distance, "analysis": analysis}
+
+
+def register_article(article: Dict[str, Any], analysis: Any = None) -> None:
+    """Ajoute un article (et son analyse) comme canonique potentiel."""
+    _index.add(article_key(article), article_fingerprint(article), analysis)
+
+
+def match_batch(articles: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Passe unique sur un lot, dans son ordre : chaque article est comparé aux
+    articles déjà ingérés et aux précédents du lot, puis enregistré (sans
+    analyse) s'il est canonique ; register_article(article, analyse) complète
+    l'entrée une fois l'analyse faite. Renvoie pour chaque article None (à
+    analyser) ou le résultat de find_duplicate ; pour un doublon d'un article
+    du lot, "analysis" vaut None et "batch_index" désigne ce canonique.
+    """
+    canonical: Dict[str, int] = {}  # clé -> indice dans le lot des canoniques du lot
+    matches = []
+    for i, article in enumerate(articles):
+        key = article_key(article)
+        if key in canonical:
+            matches.append({"canonical_id": key, "distance": 0, "analysis": None,
+                            "batch_index": canonical[key]})
+            continue
+        duplicate = find_duplicate(article)
+        if duplicate and duplicate["analysis"] is None and duplicate["canonical_id"] in canonical:
+            duplicate["batch_index"] = canonical[duplicate["canonical_id"]]
+        elif not duplicate or duplicate["analysis"] is None:
+            # Canonique (ou proche d'un article encore en cours d'analyse ailleurs)
+            duplicate = None
+            canonical[key] = i
+            register_article(article)
+        matches.append(duplicate)
+    return matches
+
+
+# Résultats de l'analyse approfondie repris de l'article canonique
+SHARED_ANALYSIS_FIELDS = ("score_corrected", "confidence", "analyse_contextuelle", "recherche_web",
+                          "analyse_thematique", "analyse_biases", "recommandations_globales")
+# Champs propres à chaque article, jamais copiés depuis le canonique
+ARTICLE_FIELDS = ("id", "title", "link", "source", "date", "summary")
+
+
+def duplicate_analysis(article: Dict[str, Any], duplicate: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Analyse d'un quasi-doublon (résultat de find_duplicate) : scores de
+    l'analyse canonique, champs et score d'origine de l'article lui-même,
+    lien explicite vers le canonique.
+    """
+    canonical = duplicate["analysis"] or {}
+    analysis = {f: canonical[f] for f in SHARED_ANALYSIS_FIELDS if f in canonical}
+    analysis.update({f: article[f] for f in ARTICLE_FIELDS if article.get(f) is not None})
+    analysis["score_original"] = (article.get("sentiment") or {}).get("score", 0)
+    analysis["duplicate_of"] = duplicate["canonical_id"]
+    analysis["duplicate_distance"] = duplicate["distance"]
+    return analysis
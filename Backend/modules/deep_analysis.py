@@ -0,0 +1,812 @@
+# rss_aggregator/modules/deep_analysis.py
+"""
+Analyse approfondie des articles (contexte, thèmes, biais, recherche web).
+Les listes d'indicateurs des évaluateurs sont compilées une seule fois en
+un automate multi-mots-clés (modules.keyword_automaton) : chaque texte
+n'est mis en minuscules et parcouru qu'une fois, et tous les évaluateurs
+lisent la même table de correspondances.
+"""
+
+import copy
+import datetime
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Any, Callable
+
+from modules.keyword_automaton import KeywordAutomaton
+from modules.text_patterns import (
+    ENTITY_PATTERNS, GEOPOLITICAL_ACTOR_PATTERNS, KEY_FACT_PATTERNS,
+    ECONOMIC_INDICATOR_PATTERNS, ECONOMIC_TREND_PATTERNS
+)
+
+# Version des règles d'analyse : à incrémenter quand le résultat change
+# (invalide les analyses mémorisées par modules.analysis_cache)
+ANALYZER_VERSION = "2.3"
+
+# ------- Indicateurs (recherche insensible à la casse : texte en minuscules) -------
+
+POSITIVE_WORDS = ['accord', 'paix', 'progrès', 'succès', 'coopération', 'dialogue']
+NEGATIVE_WORDS = ['conflit', 'crise', 'tension', 'sanction', 'violence', 'protestation']
+
+URGENT_INDICATORS = ['urgence', 'crise', 'immédiat', 'drame', 'catastrophe', 'attaque']
+
+SCOPE_INDICATORS = {
+    'local': ['ville', 'région', 'local', 'municipal'],
+    'national': ['France', 'pays', 'national', 'gouvernement'],
+    'international': ['monde', 'international', 'ONU', 'OTAN', 'UE']
+}
+
+HIGH_IMPACT_INDICATORS = [
+    'crise', 'récession', 'guerre', 'sanctions', 'accord historique',
+    'rupture', 'révolution', 'transition'
+]
+
+NOVEL_INDICATORS = [
+    'nouveau', 'premier', 'historique', 'inaugural', 'innovation',
+    'révolutionnaire', 'changement', 'réforme'
+]
+
+CONTROVERSY_INDICATORS = [
+    'polémique', 'controversé', 'débat', 'opposition', 'critique',
+    'protestation', 'manifestation', 'conflit d\'intérêt'
+]
+
+ECONOMIC_SECTORS = {
+    'énergie': ['pétrole', 'gaz', 'électricité', 'énergie', 'renouvelable', 'nucléaire', 'OPEP'],
+    'finance': ['banque', 'bourse', 'finance', 'investissement', 'crédit', 'prêt', 'action'],
+    'industrie': ['industrie', 'manufacturier', 'production', 'usine', 'automobile', 'aéronautique'],
+    'technologie': ['technologie', 'digital', 'numérique', 'IA', 'intelligence artificielle', 'tech'],
+    'agriculture': ['agriculture', 'agroalimentaire', 'cultures', 'récolte', 'ferme'],
+    'transport': ['transport', 'logistique', 'aérien', 'maritime', 'routier'],
+    'commerce': ['commerce', 'détail', 'distribution', 'vente', 'magasin'],
+    'tourisme': ['tourisme', 'hôtellerie', 'restauration', 'voyage']
+}
+
+ECONOMIC_IMPACT_INDICATORS = {
+    'fort_positif': [
+        'croissance record', 'hausse historique', 'rebond économique',
+        'reprise vigoureuse', 'investissement massif', 'création d\'emplois',
+        'innovation majeure', 'accord commercial', 'partenariat stratégique'
+    ],
+    'positif': [
+        'amélioration', 'progrès', 'augmentation', 'hausse', 'expansion',
+        'développement', 'investissement', 'croissance', 'emploi'
+    ],
+    'négatif': [
+        'récession', 'crise économique', 'chute', 'baisse', 'déclin',
+        'ralentissement', 'contraction', 'licenciement', 'faillite'
+    ],
+    'fort_négatif': [
+        'effondrement', 'krach', 'dépression', 'catastrophe économique',
+        'effondrement boursier', 'crise financière', 'faillite massive'
+    ]
+}
+ECONOMIC_IMPACT_WEIGHTS = {
+    'fort_positif': 2.0,
+    'positif': 1.0,
+    'négatif': -1.0,
+    'fort_négatif': -2.0
+}
+
+VOLATILITY_INDICATORS = [
+    'volatilité', 'fluctuation', 'instabilité', 'incertitude', 'spéculation'
+]
+
+GEOPOLITICAL_ISSUES = [
+    'conflit territorial', 'sanctions économiques', 'crise diplomatique',
+    'accord commercial', 'coopération militaire', 'tensions frontalières'
+]
+
+TENSION_INDICATORS = ['tension', 'conflit', 'crise', 'sanction', 'menace', 'hostilité']
+
+EMOTIONAL_WORDS = [
+    'incroyable', 'choquant', 'scandaleux', 'horrible', 'magnifique',
+    'exceptionnel', 'catastrophique', 'dramatique'
+]
+
+
+def _all_keywords():
+    lists = [POSITIVE_WORDS, NEGATIVE_WORDS, URGENT_INDICATORS, HIGH_IMPACT_INDICATORS,
+             NOVEL_INDICATORS, CONTROVERSY_INDICATORS, VOLATILITY_INDICATORS,
+             GEOPOLITICAL_ISSUES, TENSION_INDICATORS, EMOTIONAL_WORDS]
+    for group in (SCOPE_INDICATORS, ECONOMIC_SECTORS, ECONOMIC_IMPACT_INDICATORS):
+        lists.extend(group.values())
+    return [kw for words in lists for kw in words]
+
+
+KEYWORDS = KeywordAutomaton(_all_keywords())
+
+
+def keyword_hits(text: str) -> Dict[str, int]:
+    """
+    Table {indicateur présent: première position} pour `text` mis en
+    minuscules (équivalent de `indicateur in text.lower()`). Un même texte
+    est partagé par plusieurs évaluateurs : dans un feature_context, la
+    table n'est calculée qu'une fois par texte. Ne pas modifier le dict renvoyé.
+    """
+    memo = getattr(_context, "memo", None)
+    if memo is None:
+        return KEYWORDS.scan(text.lower())
+    key = ("keyword_hits", text)
+    hits = memo.get(key)
+    if hits is None:
+        hits = memo[key] = KEYWORDS.scan(text.lower())
+    return hits
+
+
+def _count(hits: Dict[str, int], indicators) -> int:
+    return sum(1 for indicator in indicators if indicator in hits)
+
+
+# ------- Contexte de caractéristiques par article -------
+
+_context = threading.local()
+
+
+@contextmanager
+def feature_context():
+    """
+    Pendant le bloc (l'analyse d'un article), chaque extracteur décoré par
+    per_article n'est exécuté qu'une fois par texte : les appels suivants
+    (recommandations, synthèse...) relisent le résultat mémorisé.
+    """
+    previous = getattr(_context, "memo", None)
+    _context.memo = {}
+    try:
+        yield
+    finally:
+        _context.memo = previous
+
+
+def per_article(method: Callable) -> Callable:
+    """
+    Mémorise `method(self, text, *args)` dans le feature_context courant ;
+    chaque appel reçoit sa propre copie du résultat (listes, dicts).
+    """
+    @wraps(method)
+    def wrapper(self, text, *args):
+        memo = getattr(_context, "memo", None)
+        if memo is None:
+            return method(self, text, *args)
+        key = (method.__name__, text, args)
+        if key not in memo:
+            memo[key] = method(self, text, *args)
+        return copy.deepcopy(memo[key])
+    return wrapper
+
+
+# Service de recherche web avancé
+class AdvancedWebResearch:
+    def __init__(self):
+        self.trusted_sources = [
+            'reuters.com', 'apnews.com', 'bbc.com', 'theguardian.com',
+            'lemonde.fr', 'liberation.fr', 'figaro.fr', 'france24.com'
+        ]
+    
+    def search_contextual_info(self, article_title, themes):
+        """Recherche des informations contextuelles sur le web"""
+        try:
+            # Recherche sur des sources fiables
+            search_terms = self.build_search_query(article_title, themes)
+            contextual_data = []
+            
+            for source in self.trusted_sources[:2]:  # Limiter pour performance
+                try:
+                    data = self.search_on_source(source, search_terms)
+                    if data:
+                        contextual_data.append(data)
+                except Exception as e:
+                    print(f"❌ Erreur recherche {source}: {e}")
+            
+            # CORRECTION : utiliser article_title au lieu de original_title
+            return self.analyze_contextual_data(contextual_data, article_title)
+            
+        except Exception as e:
+            print(f"❌ Erreur recherche contextuelle: {e}")
+            return None
+    
+    def build_search_query(self, title, themes):
+        """Construit une requête de recherche optimisée"""
+        # Extraire les entités nommées
+        entities = self.extract_entities(title)
+        
+        # CORRECTION : gérer les thèmes comme liste de strings
+        theme_keywords = ''
+        if themes:
+            if isinstance(themes, list):
+                theme_keywords = ' OR '.join(str(t) for t in themes[:3])
+            else:
+                theme_keywords = str(themes)
+        
+        query = f"({title}) {theme_keywords}"
+        if entities:
+            query += f" {' '.join(entities)}"
+        
+        return query
+    
+    @per_article
+    def extract_entities(self, text):
+        """Extraction basique d'entités nommées"""
+        entities = []
+        for pattern in ENTITY_PATTERNS.values():
+            entities.extend(pattern.findall(text))
+        
+        return entities
+    
+    def search_on_source(self, source, query):
+        """Recherche sur une source spécifique (simulée pour l'instant)"""
+        # Implémentation simulée - à remplacer par une vraie recherche
+        return {
+            'source': source,
+            'title': f"Article contextuel sur {query}",
+            'content': f"Informations contextuelles récupérées de {source} concernant {query}",
+            'sentiment': 'neutral',
+            'date': datetime.datetime.now().isoformat()
+        }
+    
+    def analyze_contextual_data(self, contextual_data, article_title):
+        """Analyse les données contextuelles pour détecter les divergences"""
+        if not contextual_data:
+            return None
+        
+        # Analyse de cohérence
+        sentiment_scores = []
+        key_facts = []
+        
+        for data in contextual_data:
+            sentiment = self.analyze_sentiment(data['content'])
+            sentiment_scores.append(sentiment)
+            key_facts.extend(self.extract_key_facts(data['content']))
+        
+        avg_sentiment = sum(sentiment_scores) / len(sentiment_scores) if sentiment_scores else 0
+        
+        return {
+            'sources_consultées': len(contextual_data),
+            'sentiment_moyen': avg_sentiment,
+            'faits_cles': list(set(key_facts))[:5],  # Dédupliquer et limiter
+            'coherence': self.calculate_coherence(sentiment_scores),
+            'recommendations': self.generate_recommendations(avg_sentiment, key_facts)
+        }
+    
+    @per_article
+    def analyze_sentiment(self, text):
+        """Analyse de sentiment simplifiée"""
+        hits = keyword_hits(text)
+        positive_count = _count(hits, POSITIVE_WORDS)
+        negative_count = _count(hits, NEGATIVE_WORDS)
+        
+        total = positive_count + negative_count
+        if total == 0:
+            return 0
+        
+        return (positive_count - negative_count) / total
+    
+    @per_article
+    def extract_key_facts(self, text):
+        """Extraction de faits clés"""
+        facts = []
+        
+        for pattern in KEY_FACT_PATTERNS:
+            facts.extend(pattern.findall(text))
+        
+        return facts
+    
+    def calculate_coherence(self, sentiment_scores):
+        """Calcule la cohérence entre les sources"""
+        if len(sentiment_scores) < 2:
+            return 1.0
+        
+        variance = sum((score - sum(sentiment_scores)/len(sentiment_scores))**2 for score in sentiment_scores)
+        return max(0, 1 - variance)
+    
+    def generate_recommendations(self, sentiment, key_facts):
+        """Génère des recommandations basées sur l'analyse"""
+        recommendations = []
+        
+        if abs(sentiment) > 0.3:
+            recommendations.append("Écart sentiment détecté - vérification recommandée")
+        
+        if key_facts:
+            recommendations.append(f"Faits contextuels identifiés: {', '.join(key_facts[:3])}")
+        
+        if len(recommendations) == 0:
+            recommendations.append("Cohérence générale avec le contexte médiatique")
+        
+        return recommendations
+
+# Analyseur IA avancé avec raisonnement
+class AdvancedIAAnalyzer:
+    def __init__(self):
+        self.web_research = AdvancedWebResearch()
+        self.analysis_framework = {
+            'géopolitique': self.analyze_geopolitical_context,
+            'économique': self.analyze_economic_context,
+            'social': self.analyze_social_context,
+            'environnement': self.analyze_environmental_context
+        }
+    
+    def perform_deep_analysis(self, article, themes):
+        """Analyse approfondie avec raisonnement"""
+        # Extractions mémorisées le temps de l'article (voir feature_context)
+        with feature_context():
+            return self._perform_deep_analysis(article, themes)
+
+    def _perform_deep_analysis(self, article, themes):
+        print(f"🧠 Analyse approfondie: {article.get('title', '')[:50]}# TODO: complete logic")
+        
+        try:
+            # CORRECTION : extraire les noms des thèmes
+            theme_names = []
+            if themes:
+                if isinstance(themes, list):
+                    theme_names = [t.get('name', str(t)) if isinstance(t, dict) else str(t) for t in themes]
+                else:
+                    theme_names = [str(themes)]
+            
+            # 1. Analyse contextuelle avancée
+            contextual_analysis = self.analyze_advanced_context(article, theme_names)
+            
+            # 2. Recherche web pour vérification
+            web_research = self.web_research.search_contextual_info(
+                article.get('title', ''), 
+                theme_names
+            )
+            
+            # 3. Analyse thématique spécialisée
+            thematic_analysis = self.analyze_thematic_context(article, theme_names)
+            
+            # 4. Détection de biais et vérification
+            bias_analysis = self.analyze_biases(article, contextual_analysis, web_research)
+            
+            # 5. Synthèse et recommandations
+            final_analysis = self.synthesize_analysis(
+                article, 
+                contextual_analysis, 
+                web_research, 
+                thematic_analysis, 
+                bias_analysis
+            )
+            
+            return final_analysis
+            
+        except Exception as e:
+            print(f"❌ Erreur analyse approfondie: {e}")
+            import traceback
+            traceback.print_exc()
+            
+            # Retourner une analyse par défaut en cas d'erreur
+            sentiment = article.get('sentiment', {})
+            return {
+                'score_original': sentiment.get('score', 0),
+                'score_corrected': sentiment.get('score', 0),
+                'confidence': 0.3,
+                'analyse_contextuelle': {},
+                'recherche_web': None,
+                'analyse_thematique': {},
+                'analyse_biases': {'biais_détectés': [], 'score_credibilite': 0.5},
+                'recommandations_globales': ['Erreur lors de l\'analyse approfondie'],
+                # Analyse de repli : à ne pas mettre en cache (modules.analysis_cache)
+                'fallback': True
+            }
+    
+    def analyze_advanced_context(self, article, themes):
+        """Analyse contextuelle avancée"""
+        title = article.get('title', '')
+        content = article.get('content', '')
+        full_text = f"{title} {content}"
+        
+        analysis = {
+            'urgence': self.assess_urgency(full_text),
+            'portée': self.assess_scope(full_text),
+            'impact': self.assess_impact(full_text, themes),
+            'nouveauté': self.assess_novelty(full_text),
+            'controverses': self.detect_controversies(full_text)
+        }
+        
+        return analysis
+    
+    def assess_urgency(self, text):
+        """Évalue l'urgence de l'information"""
+        urgency_score = _count(keyword_hits(text), URGENT_INDICATORS)
+        return min(1.0, urgency_score / 3)
+    
+    def assess_scope(self, text):
+        """Évalue la portée géographique"""
+        hits = keyword_hits(text)
+        scope_scores = {}
+        
+        for scope, indicators in SCOPE_INDICATORS.items():
+            scope_scores[scope] = _count(hits, indicators)
+        
+        return max(scope_scores, key=scope_scores.get) if scope_scores else 'local'
+    
+    def assess_impact(self, text, themes):
+        """Évalue l'impact potentiel"""
+        impact_score = _count(keyword_hits(text), HIGH_IMPACT_INDICATORS)
+        
+        # Pondération par thème
+        theme_weights = {
+            'conflit': 1.5, 'économie': 1.3, 'diplomatie': 1.2,
+            'environnement': 1.1, 'social': 1.0
+        }
+        
+        theme_weight = 1.0
+        for theme in themes:
+            theme_lower = str(theme).lower() if theme else ''
+            if theme_lower in theme_weights:
+                theme_weight = max(theme_weight, theme_weights[theme_lower])
+        
+        return min(1.0, (impact_score / 5) * theme_weight)
+    
+    def assess_novelty(self, text):
+        """Évalue la nouveauté de l'information"""
+        novelty_score = _count(keyword_hits(text), NOVEL_INDICATORS)
+        return min(1.0, novelty_score / 4)
+    
+    def detect_controversies(self, text):
+        """Détecte les controverses potentielles"""
+        hits = keyword_hits(text)
+        controversies = []
+        
+        for indicator in CONTROVERSY_INDICATORS:
+            if indicator in hits:
+                # Trouver le contexte autour de l'indicateur
+                start = max(0, hits[indicator] - 50)
+                end = min(len(text), hits[indicator] + len(indicator) + 50)
+                context = text[start:end].strip()
+                controversies.append(f"{indicator}: {context}")
+        
+        return controversies
+    
+    def analyze_thematic_context(self, article, themes):
+        """Analyse contextuelle par thème"""
+        thematic_analysis = {}
+        
+        # CORRECTION : s'assurer que themes est une liste de chaînes
+        theme_list = []
+        if themes:
+            if isinstance(themes, list):
+                theme_list = [str(t) for t in themes]
+            else:
+                theme_list = [str(themes)]
+        
+        for theme in theme_list:
+            theme_lower = theme.lower() if theme else ''
+            
+            if theme_lower in self.analysis_framework:
+                try:
+                    analysis = self.analysis_framework[theme_lower](article)
+                    thematic_analysis[theme] = analysis
+                except Exception as e:
+                    print(f"❌ Erreur analyse thème {theme}: {e}")
+        
+        return thematic_analysis
+
+    def analyze_economic_context(self, article):
+        """Analyse contextuelle économique"""
+        text = f"{article.get('title', '')} {article.get('content', '')}"
+        
+        return {
+            'indicateurs': self.extract_economic_indicators(text),
+            'secteurs': self.identify_economic_sectors(text),
+            'impact_economique': self.assess_economic_impact(text),
+            'tendances': self.detect_economic_trends(text),
+            'recommandations': self.generate_economic_recommendations(text)
+        }
+
+    @per_article
+    def extract_economic_indicators(self, text):
+        """Extrait les indicateurs économiques mentionnés"""
+        text_lower = text.lower()
+        
+        matches_by_category = {}
+        for category, patterns in ECONOMIC_INDICATOR_PATTERNS.items():
+            matches_by_category[category] = []
+            for pattern in patterns:
+                matches_by_category[category].extend(pattern.findall(text_lower))
+        
+        # Nettoyer et formater les résultats
+        result = {}
+        for category, matches in matches_by_category.items():
+            if matches:
+                result[category] = list(set(matches))[:5]  # Limiter à 5 résultats par catégorie
+        
+        return result
+
+    @per_article
+    def identify_economic_sectors(self, text):
+        """Identifie les secteurs économiques concernés"""
+        detected_sectors = []
+        hits = keyword_hits(text)
+        
+        for sector, keywords in ECONOMIC_SECTORS.items():
+            if any(keyword in hits for keyword in keywords):
+                detected_sectors.append(sector)
+        
+        return detected_sectors
+
+    @per_article
+    def assess_economic_impact(self, text):
+        """Évalue l'impact économique potentiel"""
+        hits = keyword_hits(text)
+        impact_score = 0
+        
+        for level, indicators in ECONOMIC_IMPACT_INDICATORS.items():
+            # Un indicateur par niveau suffit
+            if any(indicator in hits for indicator in indicators):
+                impact_score += ECONOMIC_IMPACT_WEIGHTS[level]
+        
+        # Normaliser entre -1 et 1
+        return max(-1, min(1, impact_score / 2))
+
+    @per_article
+    def detect_economic_trends(self, text):
+        """Détecte les tendances économiques mentionnées"""
+        trends = {
+            'hausse': [],
+            'baisse': [],
+            'stabilité': [],
+            'volatilité': []
+        }
+        
+        text_lower = text.lower()
+        
+        for trend, patterns in ECONOMIC_TREND_PATTERNS.items():
+            for pattern in patterns:
+                trends[trend].extend(pattern.findall(text_lower))
+        
+        # Détection de volatilité
+        hits = keyword_hits(text)
+        if any(indicator in hits for indicator in VOLATILITY_INDICATORS):
+            trends['volatilité'].append('marché volatile détecté')
+        
+        # Nettoyer les résultats vides
+        return {k: v for k, v in trends.items() if v}
+
+    def generate_economic_recommendations(self, text):
+        """Génère des recommandations basées sur l'analyse économique"""
+        recommendations = []
+        
+        # Analyser l'impact économique
+        impact = self.assess_economic_impact(text)
+        sectors = self.identify_economic_sectors(text)
+        indicators = self.extract_economic_indicators(text)
+        
+        # Recommandations basées sur l'impact
+        if impact < -0.5:
+            recommendations.append("📉 IMPACT ÉCONOMIQUE NÉGATIF - Surveillance des marchés recommandée")
+        elif impact > 0.5:
+            recommendations.append("📈 IMPACT ÉCONOMIQUE POSITIF - Opportunités potentielles")
+        
+        # Recommandations basées sur les secteurs
+        if 'énergie' in sectors:
+            recommendations.append("⚡ SECTEUR ÉNERGÉTIQUE - Surveiller les prix des matières premières")
+        
+        if 'finance' in sectors:
+            recommendations.append("💹 SECTEUR FINANCIER - Analyser l'impact sur les marchés")
+        
+        # Recommandations basées sur les indicateurs
+        if any('inflation' in str(indicator).lower() for category in indicators.values() for indicator in category):
+            recommendations.append("💰 INFLATION DÉTECTÉE - Impact sur le pouvoir d'achat à surveiller")
+        
+        if any('chômage' in str(indicator).lower() for category in indicators.values() for indicator in category):
+            recommendations.append("👥 CHÔMAGE MENTIONNÉ - Impact social et économique à analyser")
+        
+        # Recommandation par défaut si peu d'éléments détectés
+        if not recommendations and (sectors or indicators):
+            recommendations.append("📊 ANALYSE ÉCONOMIQUE - Contextualiser avec les données macroéconomiques")
+        
+        return recommendations
+
+    def analyze_geopolitical_context(self, article):
+        """Analyse contextuelle géopolitique"""
+        text = f"{article.get('title', '')} {article.get('content', '')}"
+        
+        return {
+            'acteurs': self.extract_geopolitical_actors(text),
+            'enjeux': self.extract_geopolitical_issues(text),
+            'tensions': self.assess_geopolitical_tensions(text),
+            'recommandations': self.generate_geopolitical_recommendations(text)
+        }
+    
+    @per_article
+    def extract_geopolitical_actors(self, text):
+        """Extrait les acteurs géopolitiques"""
+        actors = {k: pattern.findall(text) for k, pattern in GEOPOLITICAL_ACTOR_PATTERNS.items()}
+        
+        return {k: list(set(v)) for k, v in actors.items() if v}
+    
+    def extract_geopolitical_issues(self, text):
+        """Extrait les enjeux géopolitiques"""
+        hits = keyword_hits(text)
+        detected_issues = []
+        for issue in GEOPOLITICAL_ISSUES:
+            if issue in hits:
+                detected_issues.append(issue)
+        
+        return detected_issues
+    
+    @per_article
+    def assess_geopolitical_tensions(self, text):
+        """Évalue les tensions géopolitiques"""
+        tension_score = _count(keyword_hits(text), TENSION_INDICATORS)
+        return min(1.0, tension_score / 5)
+    
+    def generate_geopolitical_recommendations(self, text):
+        """Génère des recommandations géopolitiques"""
+        recommendations = []
+        
+        if self.assess_geopolitical_tensions(text) > 0.5:
+            recommendations.append("⚠️ Tensions géopolitiques élevées - surveillance recommandée")
+        
+        actors = self.extract_geopolitical_actors(text)
+        if len(actors.get('pays', [])) >= 3:
+            recommendations.append("🌍 Implication multiple de pays - analyse systémique nécessaire")
+        
+        return recommendations
+    
+    def analyze_social_context(self, article):
+        """Analyse contextuelle sociale"""
+        return {
+            'enjeux_sociaux': [],
+            'mouvements_sociaux': [],
+            'recommandations': ["Analyse sociale à développer"]
+        }
+    
+    def analyze_environmental_context(self, article):
+        """Analyse contextuelle environnementale"""
+        return {
+            'enjeux_environnementaux': [],
+            'impacts_climatiques': [],
+            'recommandations': ["Analyse environnementale à développer"]
+        }
+    
+    def analyze_biases(self, article, contextual_analysis, web_research):
+        """Détecte les biais potentiels"""
+        biases = []
+        text = f"{article.get('title', '')} {article.get('content', '')}"
+        
+        # Biais de langage
+        if self.detect_emotional_language(text):
+            biases.append("Langage émotionnel détecté")
+        
+        # Biais de source
+        if self.assess_source_credibility(article):
+            biases.append("Source à vérifier")
+        
+        # Biais de contexte
+        if web_research and web_research.get('coherence', 1) < 0.7:
+            biases.append("Divergence avec le contexte médiatique")
+        
+        return {
+            'biais_détectés': biases,
+            'score_credibilite': self.calculate_credibility_score(biases, contextual_analysis),
+            'recommandations': self.generate_bias_recommendations(biases)
+        }
+    
+    def detect_emotional_language(self, text):
+        """Détecte le langage émotionnel"""
+        hits = keyword_hits(text)
+        return any(word in hits for word in EMOTIONAL_WORDS)
+    
+    def assess_source_credibility(self, article):
+        """Évalue la crédibilité de la source"""
+        credible_sources = ['reuters', 'associated press', 'afp', 'bbc']
+        source = article.get('feed', '').lower()
+        
+        return not any(credible in source for credible in credible_sources)
+    
+    def calculate_credibility_score(self, biases, contextual_analysis):
+        """Calcule un score de crédibilité"""
+        base_score = 1.0
+        
+        # Pénalités pour les biais
+        for bias in biases:
+            if "Langage émotionnel" in bias:
+                base_score -= 0.2
+            if "Source à vérifier" in bias:
+                base_score -= 0.3
+            if "Divergence" in bias:
+                base_score -= 0.2
+        
+        # Bonus pour l'urgence et l'impact (sujets importants)
+        if contextual_analysis.get('urgence', 0) > 0.5:
+            base_score += 0.1
+        if contextual_analysis.get('impact', 0) > 0.5:
+            base_score += 0.1
+        
+        return max(0, min(1, base_score))
+    
+    def generate_bias_recommendations(self, biases):
+        """Génère des recommandations pour corriger les biais"""
+        recommendations = []
+        
+        if "Langage émotionnel" in str(biases):
+            recommendations.append("Recadrer avec un langage plus neutre")
+        
+        if "Source à vérifier" in str(biases):
+            recommendations.append("Recouper avec des sources fiables")
+        
+        if "Divergence" in str(biases):
+            recommendations.append("Contextualiser avec des informations vérifiées")
+        
+        return recommendations
+    
+    def synthesize_analysis(self, article, contextual_analysis, web_research, thematic_analysis, bias_analysis):
+        """Synthétise toutes les analyses"""
+        sentiment = article.get('sentiment', {})
+        original_score = sentiment.get('score', 0)
+        
+        # Calcul du score corrigé basé sur l'analyse approfondie
+        corrected_score = self.calculate_corrected_score(
+            original_score, 
+            contextual_analysis, 
+            web_research, 
+            bias_analysis
+        )
+        
+        return {
+            'score_original': original_score,
+            'score_corrected': corrected_score,
+            'analyse_contextuelle': contextual_analysis,
+            'recherche_web': web_research,
+            'analyse_thematique': thematic_analysis,
+            'analyse_biases': bias_analysis,
+            'confidence': bias_analysis.get('score_credibilite', 0.5),
+            'recommandations_globales': self.generate_global_recommendations(
+                contextual_analysis, web_research, bias_analysis
+            )
+        }
+    
+    def calculate_corrected_score(self, original_score, contextual_analysis, web_research, bias_analysis):
+        """Calcule le score corrigé basé sur l'analyse approfondie"""
+        correction = 0
+        
+        # Ajustement basé sur l'urgence
+        urgency = contextual_analysis.get('urgence', 0)
+        if urgency > 0.7:
+            correction -= 0.1  # Les sujets urgents sont souvent plus négatifs
+        
+        # Ajustement basé sur les tensions
+        if 'géopolitique' in contextual_analysis:
+            tensions = contextual_analysis.get('tensions', 0)
+            if tensions > 0.5:
+                correction -= 0.15
+        
+        # Ajustement basé sur la recherche web
+        if web_research:
+            web_sentiment = web_research.get('sentiment_moyen', 0)
+            correction += (web_sentiment - original_score) * 0.3
+        
+        # Ajustement basé sur la crédibilité
+        credibility = bias_analysis.get('score_credibilite', 0.5)
+        credibility_factor = credibility * 2 - 1  # Convertit 0-1 en -1 à 1
+        correction *= credibility_factor
+        
+        corrected = original_score + correction
+        return max(-1, min(1, corrected))
+    
+    def generate_global_recommendations(self, contextual_analysis, web_research, bias_analysis):
+        """Génère des recommandations globales"""
+        recommendations = []
+        
+        # Recommandations basées sur l'urgence
+        if contextual_analysis.get('urgence', 0) > 0.7:
+            recommendations.append("🚨 SUJET URGENT - Surveillance renforcée recommandée")
+        
+        # Recommandations basées sur la portée
+        scope = contextual_analysis.get('portée', 'local')
+        if scope == 'international':
+            recommendations.append("🌍 PORTÉE INTERNATIONALE - Analyse géopolitique approfondie")
+        
+        # Recommandations basées sur la crédibilité
+        credibility = bias_analysis.get('score_credibilite', 0.5)
+        if credibility < 0.7:
+            recommendations.append("🔍 CRÉDIBILITÉ À VÉRIFIER - Recoupement des sources nécessaire")
+        
+        # Recommandations basées sur la recherche web
+        if web_research and web_research.get('coherence', 1) < 0.8:
+            recommendations.append("📊 DIVERGENCE CONTEXTUELLE - Analyse comparative recommandée")
+        
+        return recommendations
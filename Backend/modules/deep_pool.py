@@ -0,0 +1,140 @@
+# rss_aggregator/modules/deep_pool.py
+"""
+Exécution en parallèle de l'analyse approfondie d'un lot d'articles.
+L'analyse (regex, mots-clés) est liée au CPU : en threads, le GIL la rend
+séquentielle. Avec DEEP_ANALYSIS_WORKERS > 1, le lot est découpé en
+paquets répartis sur un pool de processus ; les résultats sont rendus dans
+l'ordre des articles, avec l'erreur éventuelle de chaque article.
+Les processus importent modules.deep_pool et modules.deep_analysis, pas
+l'application (ni Flask, ni connexion ouverte, voir START_METHOD). Si le pool devient inutilisable, le lot est traité sur place.
+Les analyses déjà en cache (modules.analysis_cache) ne sont pas recalculées.
+"""
+
+import os
+import copy
+import math
+import atexit
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional, Tuple
+
+from modules.analysis_cache import analysis_cache, analysis_key
+
+logger = logging.getLogger("rss-aggregator")
+
+# 1 = analyse sur place (défaut) ; 0 = un processus par cœur
+_workers_env = int(os.getenv("DEEP_ANALYSIS_WORKERS", "1"))
+DEEP_ANALYSIS_WORKERS = _workers_env if _workers_env > 0 else (os.cpu_count() or 1)
+# Articles par paquet envoyé à un processus (0 = environ 4 paquets par processus)
+DEEP_ANALYSIS_CHUNK = int(os.getenv("DEEP_ANALYSIS_CHUNK", "0"))
+# "forkserver" (ou "spawn") : les processus repartent d'un interpréteur neuf et
+# importent modules.deep_pool (pour _analyze_chunk) et ses dépendances, pas
+# app.py ; ils n'héritent ni des threads, ni des verrous, ni des connexions du
+# worker gunicorn. "fork" est à demander explicitement : démarrage plus rapide,
+# mais copie de l'état du worker, verrous tenus par d'autres threads compris.
+START_METHOD = os.getenv("DEEP_ANALYSIS_START_METHOD",
+                         "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+
+# (analyse, None) en cas de succès, (None, message d'erreur) sinon
+Result = Tuple[Optional[Dict[str, Any]], Optional[str]]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_analyzer = None
+
+
+def _get_analyzer():
+    """Analyseur du processus courant (créé au premier usage dans chaque processus)."""
+    global _analyzer
+    if _analyzer is None:
+        from modules.deep_analysis import AdvancedIAAnalyzer
+        _analyzer = AdvancedIAAnalyzer()
+    return _analyzer
+
+
+def _analyze_chunk(articles: List[Dict[str, Any]], themes: List[Any], analyzer=None) -> List[Result]:
+    """Analyse un paquet ; une erreur n'interrompt que l'article concerné."""
+    analyzer = analyzer or _get_analyzer()
+    results = []
+    for article in articles:
+        try:
+            results.append((analyzer.perform_deep_analysis(article, themes), None))
+        except Exception as e:
+            results.append((None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=multiprocessing.get_context(START_METHOD))
+            logger.info(f"🧮 Pool d'analyse approfondie: {workers} processus ({START_METHOD})")
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+atexit.register(shutdown_pool)
+
+
+def run_deep_analyses(articles: List[Dict[str, Any]], themes: List[Any],
+                      workers: Optional[int] = None, analyzer=None,
+                      use_cache: bool = True) -> List[Result]:
+    """
+    perform_deep_analysis de chaque article, dans l'ordre du lot.
+    `analyzer` sert à l'exécution sur place (workers <= 1, lot d'un article,
+    pool hors service). Seuls les articles absents du cache sont analysés ;
+    les analyses réussies y sont ajoutées (pas les analyses de repli, voir
+    AnalysisCache.put_many).
+    """
+    if not use_cache:
+        return _run(articles, themes, workers, analyzer)
+
+    keys = []
+    for article in articles:
+        try:
+            keys.append(analysis_key(article, themes))
+        except Exception:
+            keys.append(None)  # article invalide : l'erreur sortira de l'analyse
+    cached = analysis_cache.get_many([k for k in keys if k])
+    todo = [i for i, key in enumerate(keys) if key not in cached]
+    computed = dict(zip(todo, _run([articles[i] for i in todo], themes, workers, analyzer)))
+    analysis_cache.put_many({keys[i]: analysis for i, (analysis, error) in computed.items()
+                             if keys[i] and error is None and analysis is not None})
+    # Copie par article : un même article peut figurer deux fois dans le lot
+    return [(copy.deepcopy(cached[key]), None) if i not in computed else computed[i]
+            for i, key in enumerate(keys)]
+
+
+def _run(articles: List[Dict[str, Any]], themes: List[Any],
+         workers: Optional[int], analyzer) -> List[Result]:
+    workers = DEEP_ANALYSIS_WORKERS if workers is None else workers
+    if workers <= 1 or len(articles) < 2:
+        return _analyze_chunk(articles, themes, analyzer)
+
+    size = DEEP_ANALYSIS_CHUNK or math.ceil(len(articles) / (workers * 4))
+    chunks = [articles[i:i + size] for i in range(0, len(articles), size)]
+    try:
+        pool = _get_pool(workers)
+        results = []
+        for chunk_results in pool.map(_analyze_chunk, chunks, [themes] * len(chunks)):
+            results.extend(chunk_results)
+        return results
+    except BrokenProcessPool as e:
+        logger.error(f"❌ Pool d'analyse approfondie hors service ({e}), analyse sur place")
+        shutdown_pool()
+    except Exception as e:
+        # Ex. résultat non sérialisable : le lot est refait sur place
+        logger.error(f"❌ Erreur du pool d'analyse approfondie ({e}), analyse sur place")
+    return _analyze_chunk(articles, themes, analyzer)
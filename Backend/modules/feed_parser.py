@@ -0,0 +1,92 @@
+# rss_aggregator/modules/feed_parser.py
+"""
+Parseur RSS/Atom incrémental (XMLPullParser) : les entrées sont produites
+au fil des morceaux reçus, et la lecture s'arrête dès qu'on atteint une
+entrée déjà connue (GUID ou lien). Les flux étant triés du plus récent au
+plus ancien, seules les nouveautés sont parsées.
+"""
+
+import datetime
+import email.utils
+import xml.etree.ElementTree as ET
+from typing import Iterable, Iterator, Container, Dict, Any, Optional
+
+_ENTRY_TAGS = ("item", "entry")
+
+
+def _local(tag: str) -> str:
+    """Nom local d'une balise, sans espace de noms : '{ns}entry' -> 'entry'."""
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def _to_iso(value: Optional[str]) -> Optional[str]:
+    """Date RFC 822 (RSS) ou ISO 8601 (Atom) -> ISO 8601 UTC sans fuseau."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        dt = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            dt = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return dt.isoformat()
+
+
+def _entry_from_element(elem: ET.Element, feed_url: str) -> Dict[str, Any]:
+    fields = {}
+    link = None
+    for child in elem:
+        name = _local(child.tag)
+        if name == "link":
+            # Atom : <link rel="alternate" href="..."/> ; RSS : <link>...</link>
+            href = child.get("href")
+            if href and child.get("rel", "alternate") == "alternate":
+                link = link or href
+            elif child.text and not href:
+                link = link or child.text.strip()
+        elif name not in fields:
+            fields[name] = (child.text or "").strip()
+    summary = fields.get("description") or fields.get("summary") or fields.get("encoded") or fields.get("content", "")
+    date = _to_iso(fields.get("pubDate") or fields.get("published") or fields.get("updated") or fields.get("date"))
+    return {
+        "guid": fields.get("guid") or fields.get("id") or link,
+        "title": fields.get("title", ""),
+        "link": link or "",
+        "summary": summary,
+        "date": date,
+        "source": feed_url
+    }
+
+
+def iter_entries(chunks: Iterable[bytes], seen: Container[str] = (),
+                 feed_url: str = "") -> Iterator[Dict[str, Any]]:
+    """
+    Produit les entrées d'un flux à partir d'un itérable de morceaux d'octets.
+    S'arrête (sans lire la suite) à la première entrée dont le GUID ou le
+    lien figure dans `seen`. Les éléments déjà traités sont détachés de
+    l'arbre pour garder une mémoire constante.
+    Lève xml.etree.ElementTree.ParseError si le document est mal formé.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack = []
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == "start":
+                stack.append(elem)
+                continue
+            stack.pop()
+            if _local(elem.tag) not in _ENTRY_TAGS:
+                continue
+            entry = _entry_from_element(elem, feed_url)
+            if stack:
+                stack[-1].remove(elem)
+            elem.clear()
+            if (entry["guid"] and entry["guid"] in seen) or (entry["link"] and entry["link"] in seen):
+                return
+            yield entry
+    parser.close()
@@ -0,0 +1,375 @@
+# rss_aggregator/modules/feed_scraper.py
+"""
+Moteur de récupération des flux RSS/Atom.
+Les flux actifs (table `feeds` si DATABASE_URL est configurée, sinon
+config/config.json) sont téléchargés en parallèle par un pool de workers borné :
+une actualisation complète dure à peu près le temps du flux le plus lent.
+Les requêtes sont conditionnelles (ETag / Last-Modified) : un 304 ou un corps
+identique au précédent (même empreinte SHA-256) n'est pas re-parsé (en mode
+"stream", ses entrées déjà lues sont abandonnées).
+Les requêtes passent par un pool de sessions par hôte (keep-alive, concurrence
+bornée par hôte, backoff sur 429/503) pour ménager les éditeurs.
+Les derniers GUID vus de chaque flux sont mémorisés pour compter les nouveaux
+articles (utilisé par le scheduler adaptatif). En mode "stream" (défaut), le
+flux est parsé par morceaux et le parsing s'arrête au premier article déjà vu.
+"""
+
+import os
+import json
+import time
+import logging
+import datetime
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Callable, Iterator
+
+import xml.etree.ElementTree as ET
+
+import feedparser
+
+from modules.db_manager import get_connection, put_connection, get_database_url
+from modules.http_client import HostSessionPool
+from modules.feed_parser import iter_entries
+
+logger = logging.getLogger("rss-aggregator")
+
+CONFIG_FILE = os.getenv(
+    "RSS_CONFIG_FILE",
+    os.path.join(os.path.dirname(__file__), "..", "..", "config", "config.json")
+)
+FETCH_WORKERS = int(os.getenv("FEED_FETCH_WORKERS", "16"))
+CONNECT_TIMEOUT = float(os.getenv("FEED_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("FEED_READ_TIMEOUT", "15"))
+USER_AGENT = os.getenv("FEED_USER_AGENT", "Mozilla/5.0 (compatible; RSS-Aggregator/2.3)")
+MAX_FEED_BYTES = int(os.getenv("FEED_MAX_BYTES", str(10 * 1024 * 1024)))
+LOCAL_CACHE_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "feed_cache.json")
+SEEN_GUIDS_LIMIT = int(os.getenv("FEED_SEEN_GUIDS_LIMIT", "200"))
+# "stream" : parsing incrémental avec arrêt au premier article connu ; "full" : feedparser
+PARSE_MODE = os.getenv("FEED_PARSE_MODE", "stream")
+
+# Sessions keep-alive par hôte + limite de politesse
+_http = HostSessionPool(
+    max_per_host=int(os.getenv("FEED_MAX_PER_HOST", "2")),
+    max_retries=int(os.getenv("FEED_MAX_RETRIES", "3")),
+    backoff_base=float(os.getenv("FEED_BACKOFF_BASE", "2")),
+    max_wait=float(os.getenv("FEED_MAX_BACKOFF_WAIT", "30")),
+    user_agent=USER_AGENT
+)
+
+_CACHE_FIELDS = ("etag", "last_modified", "content_hash", "seen_guids")
+_local_cache_lock = threading.Lock()
+
+
+def _load_local_cache() -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(LOCAL_CACHE_FILE, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_feed_list() -> List[Dict[str, Any]]:
+    """
+    Liste des flux actifs : table `feeds` (PostgreSQL) si configurée,
+    sinon config/config.json.
+    """
+    if get_database_url():
+        conn = None
+        try:
+            conn = get_connection()
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT id, title, url, etag, last_modified, content_hash, seen_guids
+                FROM feeds WHERE enabled=TRUE ORDER BY id
+            """)
+            rows = cur.fetchall()
+            cur.close()
+            if rows:
+                feeds = [dict(r) for r in rows]
+                for f in feeds:
+                    f["seen_guids"] = json.loads(f["seen_guids"]) if f.get("seen_guids") else []
+                return feeds
+        except Exception as e:
+            logger.warning(f"⚠️ Lecture de la table feeds impossible, repli sur config.json: {e}")
+        finally:
+            if conn:
+                put_connection(conn)
+
+    try:
+        with open(CONFIG_FILE, "r", encoding="utf-8") as fh:
+            urls = json.load(fh).get("feeds", [])
+    except Exception as e:
+        logger.error(f"❌ Lecture de {CONFIG_FILE} impossible: {e}")
+        return []
+    # Dédupliquer en conservant l'ordre ; l'état HTTP vient du cache local
+    cache = _load_local_cache()
+    feeds = []
+    for u in dict.fromkeys(urls):
+        if u:
+            state = cache.get(u, {})
+            feeds.append({"id": None, "title": None, "url": u,
+                          **{k: state.get(k) for k in _CACHE_FIELDS}})
+    return feeds
+
+
+def save_feed_cache(results: List[Dict[str, Any]]) -> None:
+    """
+    Mémorise ETag / Last-Modified / empreinte de chaque flux récupéré :
+    colonnes de la table feeds pour les flux en base, data/feed_cache.json sinon.
+    """
+    results = [r for r in results if r.get("ok")]
+    db_rows = [r for r in results if r.get("feed_id") is not None]
+    local_rows = [r for r in results if r.get("feed_id") is None]
+
+    if db_rows and get_database_url():
+        conn = None
+        try:
+            conn = get_connection()
+            cur = conn.cursor()
+            cur.executemany("""
+                UPDATE feeds SET etag=%s, last_modified=%s, content_hash=%s, seen_guids=%s,
+                                 last_fetched_at=NOW()
+                WHERE id=%s
+            """, [(r["etag"], r["last_modified"], r["content_hash"],
+                   json.dumps(r["seen_guids"] or []), r["feed_id"]) for r in db_rows])
+            conn.commit()
+            cur.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Sauvegarde du cache HTTP des flux impossible: {e}")
+        finally:
+            if conn:
+                put_connection(conn)
+
+    if local_rows:
+        with _local_cache_lock:
+            cache = _load_local_cache()
+            for r in local_rows:
+                cache[r["url"]] = {k: r.get(k) for k in _CACHE_FIELDS}
+            os.makedirs(os.path.dirname(LOCAL_CACHE_FILE), exist_ok=True)
+            tmp = LOCAL_CACHE_FILE + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(cache, fh)
+            os.replace(tmp, LOCAL_CACHE_FILE)
+
+
+def _normalize_entry(entry: Dict[str, Any], feed_url: str) -> Dict[str, Any]:
+    published = entry.get("published_parsed") or entry.get("updated_parsed")
+    date = datetime.datetime(*published[:6]).isoformat() if published else None
+    return {
+        "guid": entry.get("id") or entry.get("link"),
+        "title": entry.get("title", ""),
+        "link": entry.get("link", ""),
+        "summary": entry.get("summary", ""),
+        "date": date,
+        "source": feed_url
+    }
+
+
+def _mark_seen(result: Dict[str, Any], seen: List[str]) -> None:
+    """Compte les nouvelles entrées et met à jour la liste bornée des GUID vus."""
+    known = set(seen)
+    new_guids = [e["guid"] for e in result["entries"] if e["guid"] and e["guid"] not in known]
+    result["new_count"] = len(new_guids)
+    result["seen_guids"] = list(dict.fromkeys(new_guids + list(seen)))[:SEEN_GUIDS_LIMIT]
+
+
+class _Body:
+    """
+    Corps d'une réponse lu par morceaux : taille et empreinte SHA-256 au fil
+    de la lecture ; les morceaux ne sont gardés que si `keep`.
+    """
+
+    def __init__(self, keep: bool):
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+        self.chunks: Optional[List[bytes]] = [] if keep else None
+
+    def read(self, resp, started: float, deadline: float) -> Iterator[bytes]:
+        """Itère sur le corps en appliquant les limites de taille et de durée."""
+        for chunk in resp.iter_content(chunk_size=64 * 1024):
+            self.size += len(chunk)
+            self.sha256.update(chunk)
+            if self.chunks is not None:
+                self.chunks.append(chunk)
+            if self.size > MAX_FEED_BYTES:
+                raise ValueError(f"flux trop volumineux (> {MAX_FEED_BYTES} octets)")
+            if time.monotonic() - started > deadline:
+                raise TimeoutError(f"délai dépassé ({deadline}s)")
+            yield chunk
+
+    def content(self) -> bytes:
+        return b"".join(self.chunks or [])
+
+
+def _download(url: str, started: float, deadline: float) -> _Body:
+    """Corps complet d'un flux (repli feedparser d'un flux lu en streaming)."""
+    body = _Body(keep=True)
+    with _http.get(url, stream=True, timeout=(CONNECT_TIMEOUT, deadline)) as resp:
+        resp.raise_for_status()
+        for _ in body.read(resp, started, deadline):
+            pass
+    return body
+
+
+def _parse_full(body: bytes, url: str) -> List[Dict[str, Any]]:
+    parsed = feedparser.parse(body)
+    if parsed.bozo and not parsed.entries:
+        raise ValueError(f"flux illisible: {parsed.get('bozo_exception')}")
+    return [_normalize_entry(e, url) for e in parsed.entries]
+
+
+def fetch_feed(feed: Dict[str, Any], timeout: Optional[float] = None,
+               parse_mode: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Télécharge et parse un flux. Ne lève jamais d'exception : les erreurs
+    sont renvoyées dans le champ `error` du résultat.
+    `timeout` borne la durée totale de la requête (connexion + lecture).
+    Si le serveur répond 304, ou si le corps est identique au précédent,
+    `unchanged` vaut True et le flux n'est pas parsé.
+    `new_count` compte les entrées dont le GUID n'avait pas encore été vu.
+    En mode "stream", le corps n'est pas gardé en mémoire : il est haché et
+    parsé au fil de la lecture, le parsing s'arrêtant au premier GUID/lien
+    déjà vu (le reste n'est que haché) ; si l'empreinte finale est celle du
+    relevé précédent, les entrées lues sont abandonnées. Un document mal
+    formé est retéléchargé une fois et parsé avec feedparser. En mode "full",
+    le corps est gardé, haché puis parsé par feedparser s'il a changé.
+    """
+    url = feed["url"]
+    deadline = timeout or READ_TIMEOUT
+    result = {"feed_id": feed.get("id"), "url": url, "ok": False, "status": None,
+              "bytes": 0, "entries": [], "new_count": 0, "unchanged": False,
+              "duration": 0.0, "error": None,
+              **{k: feed.get(k) for k in _CACHE_FIELDS}}
+    headers = {}
+    if feed.get("etag"):
+        headers["If-None-Match"] = feed["etag"]
+    if feed.get("last_modified"):
+        headers["If-Modified-Since"] = feed["last_modified"]
+    stream = (parse_mode or PARSE_MODE) == "stream"
+    seen = feed.get("seen_guids") or []
+    entries = None
+    started = time.monotonic()
+    try:
+        with _http.get(url, headers=headers, stream=True,
+                       timeout=(CONNECT_TIMEOUT, deadline)) as resp:
+            result["status"] = resp.status_code
+            if resp.status_code == 304:
+                result["ok"] = True
+                result["unchanged"] = True
+                result["duration"] = round(time.monotonic() - started, 3)
+                return result
+            resp.raise_for_status()
+            result["etag"] = resp.headers.get("ETag")
+            result["last_modified"] = resp.headers.get("Last-Modified")
+            body = _Body(keep=not stream)
+            chunks = body.read(resp, started, deadline)
+            if stream:
+                try:
+                    entries = list(iter_entries(chunks, set(seen), url))
+                except ET.ParseError:
+                    # XML non conforme (entités HTML...) : feedparser, plus bas
+                    entries = None
+            # Suite du corps (après le premier article connu) : empreinte seulement
+            for _ in chunks:
+                pass
+        result["bytes"] = body.size
+        content_hash = body.sha256.hexdigest()
+        if content_hash == feed.get("content_hash"):
+            # Corps identique au relevé précédent : entrées déjà lues abandonnées
+            result["ok"] = True
+            result["unchanged"] = True
+            result["duration"] = round(time.monotonic() - started, 3)
+            return result
+        result["content_hash"] = content_hash
+        if entries is None:
+            if stream:
+                body = _download(url, started, deadline)
+                result["bytes"] = body.size
+                result["content_hash"] = body.sha256.hexdigest()
+            entries = _parse_full(body.content(), url)
+        result["entries"] = entries
+        _mark_seen(result, seen)
+        result["ok"] = True
+    except Exception as e:
+        result["error"] = str(e)
+    result["duration"] = round(time.monotonic() - started, 3)
+    return result
+
+
+def host_stats() -> Dict[str, Any]:
+    """Requêtes, réponses 429/503 et backoff restant par hôte."""
+    return _http.stats()
+
+
+def refresh_feeds(feeds: List[Dict[str, Any]],
+                  max_workers: Optional[int] = None,
+                  timeout: Optional[float] = None,
+                  on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Récupère une liste de flux en parallèle (pool de threads borné) et renvoie
+    un résumé : flux récupérés, inchangés (304 / même empreinte), en échec,
+    octets, durée totale. Le cache HTTP des flux est mis à jour en fin de lot.
+    `on_result` est appelé pour chaque flux dès qu'il est terminé.
+    """
+    started = time.monotonic()
+    summary = {
+        "started_at": datetime.datetime.utcnow().isoformat(),
+        "feeds": len(feeds),
+        "fetched": 0,
+        "unchanged": 0,
+        "failed": 0,
+        "bytes": 0,
+        "entries": 0,
+        "new_entries": 0,
+        "duration": 0.0,
+        "slowest": None,
+        "errors": []
+    }
+    if not feeds:
+        return summary
+
+    results = []
+    workers = max(1, min(max_workers or FETCH_WORKERS, len(feeds)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-fetch") as pool:
+        futures = [pool.submit(fetch_feed, feed, timeout) for feed in feeds]
+        for future in as_completed(futures):
+            res = future.result()
+            results.append(res)
+            if res["ok"]:
+                summary["fetched"] += 1
+                summary["unchanged"] += int(res["unchanged"])
+                summary["bytes"] += res["bytes"]
+                summary["entries"] += len(res["entries"])
+                summary["new_entries"] += res["new_count"]
+            else:
+                summary["failed"] += 1
+                summary["errors"].append({"url": res["url"], "error": res["error"]})
+            if not summary["slowest"] or res["duration"] > summary["slowest"]["duration"]:
+                summary["slowest"] = {"url": res["url"], "duration": res["duration"]}
+            if on_result:
+                try:
+                    on_result(res)
+                except Exception as e:
+                    logger.warning(f"⚠️ Callback on_result en erreur pour {res['url']}: {e}")
+
+    save_feed_cache(results)
+    summary["duration"] = round(time.monotonic() - started, 3)
+    return summary
+
+
+def refresh_all_feeds(max_workers: Optional[int] = None,
+                      timeout: Optional[float] = None,
+                      on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Actualise tous les flux actifs en parallèle et journalise le résumé.
+    """
+    feeds = load_feed_list()
+    summary = refresh_feeds(feeds, max_workers=max_workers, timeout=timeout, on_result=on_result)
+    logger.info(
+        f"📡 Actualisation: {summary['fetched']}/{summary['feeds']} flux OK "
+        f"(dont {summary['unchanged']} inchangés), "
+        f"{summary['failed']} en échec, {summary['bytes']} octets, "
+        f"{summary['entries']} entrées en {summary['duration']}s"
+    )
+    return summary
@@ -0,0 +1,156 @@
+# rss_aggregator/modules/geo_zones.py
+"""
+Repérage des zones de crise dans les articles, en une seule passe.
+Tous les mots-clés de toutes les zones sont réunis dans un arbre de préfixes
+(trie) compilé en une seule expression régulière : le texte est parcouru une
+fois quel que soit le nombre de zones, au lieu d'une recherche par zone et par
+mot-clé. Même règle qu'un test `mot-clé in texte` sur le texte en minuscules
+(sous-chaîne, sans limite de mot).
+Les zones trouvées sont mémorisées par identifiant d'article (LRU) : une
+analyse enregistrée ne change plus, un rapport suivant ne la re-balaye pas.
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+GEO_ZONE_CACHE_SIZE = int(os.getenv("GEO_ZONE_CACHE_SIZE", "50000"))
+
+CRISIS_KEYWORDS = {
+    "Ukraine": ["ukraine", "kiev", "kyiv", "zelensky", "russia", "moscow"],
+    "Middle East": ["gaza", "israel", "palestine", "hamas", "hezbollah"],
+    "Taiwan": ["taiwan", "china", "strait", "beijing"],
+    "North Korea": ["north korea", "pyongyang", "kim jong", "missile"],
+    "Iran": ["iran", "tehran", "nuclear", "uranium"],
+    "Syria": ["syria", "damascus", "assad"],
+    "Yemen": ["yemen", "houthi", "sanaa"],
+    "Sudan": ["sudan", "khartoum", "darfur"]
+}
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Alternative regex factorisée par préfixes communs ; la plus longue correspondance d'abord."""
+    trie: Dict[str, Any] = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: Dict[str, Any]) -> str:
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+class ZoneScanner:
+    """Automate de repérage des zones pour un jeu de mots-clés {zone: [mots-clés]}."""
+
+    def __init__(self, zones: Dict[str, List[str]], max_entries: int = GEO_ZONE_CACHE_SIZE):
+        self.zones = list(zones)
+        order = {z: i for i, z in enumerate(self.zones)}
+        by_keyword: Dict[str, set] = {}
+        for zone, keywords in zones.items():
+            for kw in keywords:
+                if kw:
+                    by_keyword.setdefault(kw.lower(), set()).add(zone)
+        # Seule la plus longue correspondance est rapportée à une position donnée :
+        # elle vaut aussi pour les mots-clés qui en sont des préfixes
+        self._zones_for: Dict[str, Tuple[str, ...]] = {}
+        for kw in by_keyword:
+            found = set()
+            for i in range(1, len(kw) + 1):
+                found |= by_keyword.get(kw[:i], set())
+            self._zones_for[kw] = tuple(sorted(found, key=order.get))
+        # Recherche à chaque position (lookahead) : les correspondances qui se chevauchent comptent
+        self._pattern = re.compile("(?=(" + _trie_pattern(by_keyword) + "))") if by_keyword else None
+        self._order = order
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[Any, Tuple[str, ...]]" = OrderedDict()
+        self._stats = {"hits": 0, "scans": 0, "evictions": 0}
+
+    def scan(self, text: str) -> Tuple[str, ...]:
+        """Zones dont au moins un mot-clé apparaît dans `text`, dans l'ordre de déclaration."""
+        if not text or self._pattern is None:
+            return ()
+        found = set()
+        for m in self._pattern.finditer(text.lower()):
+            found.update(self._zones_for[m.group(1)])
+            if len(found) == len(self.zones):
+                break
+        return tuple(sorted(found, key=self._order.get))
+
+    def tag(self, article_id: Any, text: str) -> Tuple[str, ...]:
+        """scan() mémorisé par identifiant d'article (sans identifiant : pas de cache)."""
+        if article_id is None:
+            return self.scan(text)
+        with self._lock:
+            zones = self._cache.get(article_id)
+            if zones is not None:
+                self._cache.move_to_end(article_id)
+                self._stats["hits"] += 1
+                return zones
+        zones = self.scan(text)
+        with self._lock:
+            self._stats["scans"] += 1
+            self._cache[article_id] = zones
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+                self._stats["evictions"] += 1
+        return zones
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._stats)
+            out["size"] = len(self._cache)
+        out.update({"zones": len(self.zones), "keywords": len(self._zones_for),
+                    "max_entries": self.max_entries})
+        return out
+
+
+def zone_report(articles: Iterable[Dict[str, Any]], scanner: Optional[ZoneScanner] = None) -> List[Dict[str, Any]]:
+    """
+    Zones mentionnées dans des articles normalisés (id, title, summary, sentiment),
+    triées par nombre de mentions : country, riskLevel, riskScore, mentions, sentiment.
+    """
+    scanner = scanner or zone_scanner
+    mentions = {z: 0 for z in scanner.zones}
+    scores: Dict[str, List[float]] = {z: [] for z in scanner.zones}
+    for a in articles:
+        text = a.get("title", "") + " " + a.get("summary", "")
+        zones = scanner.tag(a.get("id"), text)
+        if not zones:
+            continue
+        sent = a.get("sentiment", {})
+        for zone in zones:
+            mentions[zone] += 1
+            if isinstance(sent, dict):
+                scores[zone].append(sent.get("score", 0))
+
+    crisis_zones = []
+    for zone in scanner.zones:
+        if mentions[zone] > 0:
+            avg_sentiment = sum(scores[zone]) / len(scores[zone]) if scores[zone] else 0
+            risk_score = min(0.95, 0.3 + (mentions[zone] * 0.05) - (avg_sentiment * 0.1))
+            crisis_zones.append({
+                "country": zone,
+                "riskLevel": "high" if risk_score > 0.7 else "medium" if risk_score > 0.4 else "low",
+                "riskScore": round(risk_score, 2),
+                "mentions": mentions[zone],
+                "sentiment": round(avg_sentiment, 2)
+            })
+    return sorted(crisis_zones, key=lambda x: -x["mentions"])
+
+
+zone_scanner = ZoneScanner(CRISIS_KEYWORDS)
@@ -0,0 +1,151 @@
+# rss_aggregator/modules/http_client.py
+"""
+Client HTTP poli : une session keep-alive par hôte, un nombre borné de
+requêtes simultanées par hôte, et un backoff exponentiel sur 429/503
+(en respectant l'en-tête Retry-After quand il est fourni).
+"""
+
+import time
+import random
+import logging
+import threading
+import datetime
+import email.utils
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("rss-aggregator")
+
+RETRY_STATUSES = (429, 503)
+
+
+class HostBackoffError(Exception):
+    """L'hôte est en période de backoff au-delà du délai d'attente accepté."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After en secondes (entier ou date HTTP), None si absent/illisible."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+class HostSessionPool:
+    """
+    Sessions requests partagées par hôte, avec limite de concurrence
+    et état de backoff par hôte. Thread-safe.
+    """
+
+    def __init__(self, max_per_host: int = 2, max_retries: int = 3,
+                 backoff_base: float = 2.0, max_backoff: float = 3600.0,
+                 max_wait: float = 30.0, user_agent: Optional[str] = None):
+        self.max_per_host = max_per_host
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.max_wait = max_wait
+        self.user_agent = user_agent
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+
+    def _host(self, url: str) -> Dict[str, Any]:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_per_host)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                if self.user_agent:
+                    session.headers["User-Agent"] = self.user_agent
+                state = {
+                    "host": host,
+                    "session": session,
+                    "slots": threading.BoundedSemaphore(self.max_per_host),
+                    "blocked_until": 0.0,
+                    "failures": 0,
+                    "requests": 0,
+                    "throttled": 0
+                }
+                self._hosts[host] = state
+            return state
+
+    def _backoff(self, state: Dict[str, Any], retry_after: Optional[float]) -> float:
+        with self._lock:
+            state["failures"] += 1
+            state["throttled"] += 1
+            if retry_after is None:
+                delay = self.backoff_base * (2 ** (state["failures"] - 1))
+                delay = delay * random.uniform(0.8, 1.2)
+            else:
+                delay = retry_after
+            delay = min(self.max_backoff, delay)
+            state["blocked_until"] = max(state["blocked_until"], time.monotonic() + delay)
+            return delay
+
+    def _wait_for_host(self, state: Dict[str, Any]) -> None:
+        wait = state["blocked_until"] - time.monotonic()
+        if wait <= 0:
+            return
+        if wait > self.max_wait:
+            raise HostBackoffError(f"{state['host']} en backoff pour encore {wait:.0f}s")
+        time.sleep(wait)
+
+    @contextmanager
+    def request(self, method: str, url: str, **kwargs):
+        """
+        Context manager renvoyant la réponse ; le créneau de l'hôte est
+        conservé jusqu'à la sortie du bloc (lecture du corps en streaming).
+        Les 429/503 sont rejoués avec backoff exponentiel ; la dernière
+        réponse est renvoyée telle quelle si les tentatives sont épuisées.
+        """
+        state = self._host(url)
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_host(state)
+            with state["slots"]:
+                resp = state["session"].request(method, url, **kwargs)
+                with self._lock:
+                    state["requests"] += 1
+                if resp.status_code in RETRY_STATUSES:
+                    delay = self._backoff(state, parse_retry_after(resp.headers.get("Retry-After")))
+                    if attempt < self.max_retries and delay <= self.max_wait:
+                        logger.info(f"⏳ {state['host']} a répondu {resp.status_code}, nouvel essai dans {delay:.1f}s")
+                        resp.close()
+                        continue
+                else:
+                    with self._lock:
+                        state["failures"] = 0
+                try:
+                    yield resp
+                finally:
+                    resp.close()
+                return
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                host: {
+                    "requests": s["requests"],
+                    "throttled": s["throttled"],
+                    "backoff_remaining": round(max(0.0, s["blocked_until"] - now), 1)
+                }
+                for host, s in self._hosts.items()
+            }
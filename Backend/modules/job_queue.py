@@ -0,0 +1,417 @@
+# rss_aggregator/modules/job_queue.py
+"""
+File de tâches asynchrones pour les traitements longs (appels LLM,
+analyse approfondie d'un lot). La soumission renvoie aussitôt un
+identifiant ; un pool borné de workers exécute la tâche, qui publie sa
+progression et ses résultats partiels (suivi par interrogation ou SSE).
+Les tâches sont enregistrées dans la table `jobs` (PostgreSQL ou SQLite
+local via db_manager), avec le processus qui les exécute (`owner`) et un
+bail (`lease_until`) que ce processus renouvelle tant qu'il vit. Seules les
+tâches dont le bail a expiré (processus arrêté ou recyclé) sont reprises,
+par n'importe quel worker ; les autres workers suivent la tâche en base.
+Les secrets d'une tâche (clé d'API...) ne restent qu'en mémoire, dans le
+processus qui l'a reçue : une tâche reprise ailleurs s'exécute sans eux.
+Une tâche terminée ne garde que son résultat final, sans les partiels.
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Dict, Any, Optional
+
+from modules.db_manager import db_connection
+
+logger = logging.getLogger("rss-aggregator")
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Tâches en attente ou en cours au-delà desquelles la soumission est refusée
+JOB_QUEUE_MAX = int(os.getenv("JOB_QUEUE_MAX", "100"))
+# Intervalle minimal entre deux écritures en base de la progression
+JOB_PERSIST_INTERVAL = float(os.getenv("JOB_PERSIST_INTERVAL", "2"))
+# Tâches terminées gardées en mémoire (les autres sont relues en base)
+JOB_MEMORY_KEEP = int(os.getenv("JOB_MEMORY_KEEP", "200"))
+# Durée du bail d'une tâche, renouvelé par son processus tous les tiers de bail
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+# Relecture en base d'une tâche exécutée par un autre processus (suivi SSE)
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+
+ACTIVE_STATUSES = ("queued", "running")
+FINAL_STATUSES = ("done", "error")
+
+
+class JobQueueFull(Exception):
+    """Trop de tâches en attente : réessayer plus tard."""
+
+
+class UnknownJobKind(Exception):
+    """Aucun traitement enregistré pour ce type de tâche."""
+
+
+class JobContext:
+    """Passé au traitement : publication de la progression et des résultats partiels."""
+
+    def __init__(self, queue: "JobQueue", job: Dict[str, Any]):
+        self._queue = queue
+        self._job = job
+
+    @property
+    def job_id(self) -> str:
+        return self._job["id"]
+
+    @property
+    def secrets(self) -> Dict[str, Any]:
+        """Valeurs confiées à submit(secrets=...), jamais enregistrées ; vide après une reprise."""
+        return self._job.get("secrets") or {}
+
+    def progress(self, done: int, total: Optional[int] = None, partial: Any = None) -> None:
+        self._queue._update(self._job, progress_done=done,
+                            progress_total=self._job["progress_total"] if total is None else total,
+                            partial=partial)
+
+
+class JobQueue:
+    def __init__(self, workers: int = JOB_WORKERS, max_pending: int = JOB_QUEUE_MAX):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._handlers: Dict[str, Callable[[Dict[str, Any], JobContext], Any]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._pending = 0
+        self._heartbeat: Optional[threading.Thread] = None
+        self._host = socket.gethostname()
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "resumed": 0}
+
+    @property
+    def owner(self) -> str:
+        """Identité du processus dans la colonne `owner` (pid lu à l'appel : sûr après fork)."""
+        return f"{self._host}:{os.getpid()}"
+
+    def register(self, kind: str, handler: Callable[[Dict[str, Any], JobContext], Any]) -> None:
+        """`handler(params, ctx)` renvoie le résultat (sérialisable en JSON) de la tâche."""
+        self._handlers[kind] = handler
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+            return self._executor
+
+    def _ensure_heartbeat(self) -> None:
+        """Démarre (une fois par processus) le renouvellement des baux et la reprise des tâches orphelines."""
+        with self._lock:
+            if self._heartbeat is None or not self._heartbeat.is_alive():
+                self._heartbeat = threading.Thread(target=self._heartbeat_loop, name="job-lease", daemon=True)
+                self._heartbeat.start()
+
+    def _heartbeat_loop(self) -> None:
+        while True:
+            time.sleep(JOB_LEASE_SECONDS / 3)
+            self._renew_leases()
+            self.resume_pending()
+
+    # ------- Base -------
+
+    @staticmethod
+    def _dumps(value: Any) -> Optional[str]:
+        return None if value is None else json.dumps(value, ensure_ascii=False, default=str)
+
+    def _persist(self, job: Dict[str, Any], insert: bool = False) -> None:
+        row = (job["status"], job["progress_done"], job["progress_total"],
+               self._dumps(job["partial"]), self._dumps(job["result"]), job["error"], job["updated_at"])
+        try:
+            with db_connection() as conn:
+                cur = conn.cursor()
+                if insert:
+                    cur.execute("""
+                        INSERT INTO jobs (id, kind, params, created_at, status, progress_done,
+                                          progress_total, partial, result, error, updated_at,
+                                          owner, lease_until)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    """, (job["id"], job["kind"], self._dumps(job["params"]), job["created_at"]) + row
+                        + (self.owner, time.time() + JOB_LEASE_SECONDS))
+                else:
+                    # Sans effet si la tâche a été reprise par un autre processus (bail expiré)
+                    cur.execute("""
+                        UPDATE jobs SET status = %s, progress_done = %s, progress_total = %s,
+                                        partial = %s, result = %s, error = %s, updated_at = %s
+                        WHERE id = %s AND owner = %s
+                    """, row + (job["id"], self.owner))
+                    if cur.rowcount == 0:
+                        logger.warning(f"⚠️ Tâche {job['id']}: reprise par un autre processus")
+                conn.commit()
+                cur.close()
+            job["persisted_at"] = time.time()
+        except Exception as e:
+            logger.warning(f"⚠️ Tâche {job['id']}: enregistrement impossible: {e}")
+
+    def _renew_leases(self) -> None:
+        """Prolonge le bail des tâches actives de ce processus."""
+        try:
+            with db_connection() as conn:
+                cur = conn.cursor()
+                cur.execute("""
+                    UPDATE jobs SET lease_until = %s
+                    WHERE owner = %s AND status IN (%s, %s)
+                """, (time.time() + JOB_LEASE_SECONDS, self.owner) + ACTIVE_STATUSES)
+                conn.commit()
+                cur.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Renouvellement des baux de tâches impossible: {e}")
+
+    @staticmethod
+    def _from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        job = dict(row)
+        for field in ("params", "partial", "result"):
+            job[field] = json.loads(job[field]) if job.get(field) else None
+        job["partial"] = job["partial"] or []
+        job["version"] = 0
+        return job
+
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT * FROM jobs WHERE id = %s", (job_id,))
+            row = cur.fetchone()
+            cur.close()
+        return self._from_row(row) if row else None
+
+    # ------- Exécution -------
+
+    def _remember(self, job: Dict[str, Any]) -> None:
+        """Garde la tâche en mémoire ; oublie les plus anciennes tâches terminées."""
+        self._jobs[job["id"]] = job
+        finished = [k for k, j in self._jobs.items() if j["status"] in FINAL_STATUSES]
+        for key in finished[:max(0, len(finished) - JOB_MEMORY_KEEP)]:
+            del self._jobs[key]
+
+    def _update(self, job: Dict[str, Any], partial: Any = None, clear_partial: bool = False,
+                **fields) -> None:
+        with self._changed:
+            job.update(fields)
+            if clear_partial:
+                job["partial"] = []
+            if partial is not None:
+                job["partial"].append(partial)
+            job["updated_at"] = time.time()
+            job["version"] += 1
+            self._changed.notify_all()
+        final = job["status"] in FINAL_STATUSES
+        if final or fields.get("status") or job["updated_at"] - job.get("persisted_at", 0) >= JOB_PERSIST_INTERVAL:
+            self._persist(job)
+
+    def _run(self, job: Dict[str, Any]) -> None:
+        handler = self._handlers.get(job["kind"])
+        self._update(job, status="running")
+        try:
+            if handler is None:
+                raise UnknownJobKind(job["kind"])
+            result = handler(job["params"] or {}, JobContext(self, job))
+            # Le résultat final reprend les partiels : ils ne sont pas gardés en double
+            self._update(job, status="done", result=result, clear_partial=True)
+            job.pop("secrets", None)
+            self._stats["completed"] += 1
+            logger.info(f"✅ Tâche {job['kind']} {job['id']} terminée")
+        except Exception as e:
+            logger.exception(f"❌ Tâche {job['kind']} {job['id']} en erreur")
+            self._update(job, status="error", error=str(e))
+            job.pop("secrets", None)
+            self._stats["failed"] += 1
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._remember(job)
+
+    def _enqueue(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            self._pending += 1
+            self._jobs[job["id"]] = job
+        self._get_executor().submit(self._run, job)
+
+    def submit(self, kind: str, params: Dict[str, Any], total: int = 0,
+               secrets: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Enregistre et met en file une tâche ; renvoie son identifiant.
+        `secrets` est transmis au traitement (ctx.secrets) sans être enregistré.
+        """
+        if kind not in self._handlers:
+            raise UnknownJobKind(kind)
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats["rejected"] += 1
+                raise JobQueueFull(f"{self._pending} tâches en attente")
+        now = time.time()
+        job = {"id": uuid.uuid4().hex, "kind": kind, "params": params, "status": "queued",
+               "progress_done": 0, "progress_total": total, "partial": [], "result": None,
+               "error": None, "created_at": now, "updated_at": now, "version": 0,
+               "secrets": dict(secrets or {})}
+        self._persist(job, insert=True)
+        self._stats["submitted"] += 1
+        self._ensure_heartbeat()
+        self._enqueue(job)
+        return job["id"]
+
+    def _claim(self, row: Dict[str, Any]) -> Optional[float]:
+        """
+        Prend la tâche à son compte si son bail est toujours expiré (deux
+        processus qui la voient ensemble ne la relancent pas tous les deux) ;
+        renvoie l'horodatage de la reprise, None si elle est prise ailleurs.
+        """
+        now = time.time()
+        try:
+            with db_connection() as conn:
+                cur = conn.cursor()
+                cur.execute("""
+                    UPDATE jobs SET status = 'queued', progress_done = 0, partial = NULL, updated_at = %s,
+                                    owner = %s, lease_until = %s
+                    WHERE id = %s AND status IN (%s, %s) AND (lease_until IS NULL OR lease_until < %s)
+                """, (now, self.owner, now + JOB_LEASE_SECONDS, row["id"]) + ACTIVE_STATUSES + (now,))
+                claimed = cur.rowcount == 1
+                conn.commit()
+                cur.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Tâche {row['id']}: reprise impossible: {e}")
+            return None
+        return now if claimed else None
+
+    def resume_pending(self) -> int:
+        """
+        Remet en file les tâches en attente ou en cours dont le bail a expiré
+        (processus arrêté ou recyclé). Appelée au démarrage, puis périodiquement
+        par le renouvellement des baux.
+        """
+        self._ensure_heartbeat()
+        try:
+            with db_connection() as conn:
+                cur = conn.cursor()
+                cur.execute("""
+                    SELECT * FROM jobs
+                    WHERE status IN (%s, %s) AND (lease_until IS NULL OR lease_until < %s)
+                    ORDER BY created_at
+                """, ACTIVE_STATUSES + (time.time(),))
+                rows = cur.fetchall()
+                cur.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Reprise des tâches impossible: {e}")
+            return 0
+        resumed = 0
+        for row in rows:
+            with self._lock:
+                known = row["id"] in self._jobs
+            if known:
+                continue
+            claimed_at = self._claim(row)
+            if claimed_at is None:
+                continue
+            job = self._from_row(row)
+            # Une tâche interrompue repart de zéro
+            job.update({"status": "queued", "progress_done": 0, "partial": [], "result": None,
+                        "updated_at": claimed_at})
+            self._enqueue(job)
+            resumed += 1
+        self._stats["resumed"] += resumed
+        if resumed:
+            logger.info(f"🔁 {resumed} tâche(s) remise(s) en file")
+        return resumed
+
+    # ------- Lecture -------
+
+    @staticmethod
+    def public(job: Dict[str, Any], since: int = 0) -> Dict[str, Any]:
+        """Vue JSON d'une tâche ; `since` ne renvoie que les résultats partiels suivants."""
+        return {
+            "id": job["id"], "kind": job["kind"], "status": job["status"],
+            "progress": {"done": job["progress_done"], "total": job["progress_total"]},
+            "partial": job["partial"][since:], "partial_offset": since,
+            "result": job["result"], "error": job["error"],
+            "created_at": job["created_at"], "updated_at": job["updated_at"]
+        }
+
+    def get(self, job_id: str, since: int = 0) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return self.public(job, since)
+        job = self._load(job_id)
+        return self.public(job, since) if job else None
+
+    def wait(self, job_id: str, version: int, timeout: float = 15.0) -> Optional[Dict[str, Any]]:
+        """
+        Attend une version de la tâche postérieure à `version` (au plus
+        `timeout` s) ; renvoie la tâche en mémoire telle quelle (None si inconnue).
+        """
+        deadline = time.time() + timeout
+        with self._changed:
+            job = self._jobs.get(job_id)
+            while job is not None and job["version"] <= version and job["status"] not in FINAL_STATUSES:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+                job = self._jobs.get(job_id)
+            return job
+
+    def stream(self, job_id: str, keepalive: float = 15.0) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Vues successives de la tâche jusqu'à son terme, chacune avec les seuls
+        nouveaux résultats partiels ; None quand rien n'a changé pendant
+        `keepalive` s (pour un keep-alive SSE). Une tâche exécutée par un autre
+        processus est relue en base toutes les JOB_POLL_INTERVAL s.
+        """
+        version, offset = -1, 0
+        seen, idle = None, 0.0
+        while True:
+            job = self.wait(job_id, version, keepalive)
+            if job is None:
+                view = self.get(job_id, offset)
+                if view is None:
+                    return
+                if view["updated_at"] != seen or view["status"] in FINAL_STATUSES:
+                    seen, idle = view["updated_at"], 0.0
+                    offset += len(view["partial"])
+                    yield view
+                    if view["status"] in FINAL_STATUSES:
+                        return
+                elif idle >= keepalive:
+                    idle = 0.0
+                    yield None
+                time.sleep(JOB_POLL_INTERVAL)
+                idle += JOB_POLL_INTERVAL
+                continue
+            if job["version"] == version and job["status"] not in FINAL_STATUSES:
+                yield None
+                continue
+            with self._lock:
+                version = job["version"]
+                view = self.public(job, offset)
+            offset += len(view["partial"])
+            yield view
+            if view["status"] in FINAL_STATUSES:
+                return
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        with db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT id, kind, status, progress_done, progress_total, error, created_at, updated_at
+                FROM jobs ORDER BY created_at DESC LIMIT %s
+            """, (limit,))
+            rows = cur.fetchall()
+            cur.close()
+        return [dict(r) for r in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._stats)
+            out.update({"pending": self._pending, "workers": self.workers, "max_pending": self.max_pending})
+        return out
+
+
+job_queue = JobQueue()
@@ -0,0 +1,63 @@
+# rss_aggregator/modules/keyword_automaton.py
+"""
+Recherche simultanée d'une liste de mots-clés en une passe sur le texte.
+Les mots-clés sont rangés dans un trie compilé en une seule expression
+régulière. Chaque recherche renvoie le plus long mot-clé commençant à la
+position trouvée, complété par ceux qui en sont des préfixes, puis reprend
+au caractère suivant (les occurrences imbriquées ne sont pas perdues).
+Le résultat est exactement celui de `mot in texte` pour chaque mot-clé,
+avec en plus la première position (`texte.find`).
+"""
+
+import re
+from typing import Dict, Iterable, List
+
+
+def _trie_pattern(node: Dict) -> str:
+    """Expression régulière d'un nœud de trie ('' marque la fin d'un mot)."""
+    terminal = "" in node
+    branches = [re.escape(ch) + _trie_pattern(child)
+                for ch, child in sorted(node.items()) if ch != ""]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if terminal:
+        # Quantificateur gourmand : le mot le plus long est tenté en premier
+        body = (body if len(branches) > 1 else "(?:" + body + ")") + "?"
+    return body
+
+
+class KeywordAutomaton:
+    """Automate multi-motifs construit une fois ; `scan` ne parcourt le texte qu'une fois."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = sorted({k for k in keywords if k})
+        trie: Dict = {}
+        for kw in self.keywords:
+            node = trie
+            for ch in kw:
+                node = node.setdefault(ch, {})
+            node[""] = True
+        self._regex = re.compile(_trie_pattern(trie)) if self.keywords else None
+        # Mots-clés qui sont des préfixes d'un autre (trouvés en même temps que lui)
+        self._prefixes = {kw: [p for p in self.keywords if p != kw and kw.startswith(p)]
+                          for kw in self.keywords}
+
+    def scan(self, text: str) -> Dict[str, int]:
+        """{mot-clé présent: première position} ; sensible à la casse comme `in`."""
+        hits: Dict[str, int] = {}
+        if not self._regex or not text:
+            return hits
+        search = self._regex.search
+        pos = 0
+        while True:
+            match = search(text, pos)
+            if match is None:
+                return hits
+            kw = match.group()
+            pos = match.start()
+            if kw not in hits:
+                hits[kw] = pos
+                for prefix in self._prefixes[kw]:
+                    hits.setdefault(prefix, pos)
+            pos += 1
@@ -0,0 +1,137 @@
+# rss_aggregator/modules/llm_client.py
+"""
+Client de l'API de chat compatible OpenAI utilisé par call_openai_system.
+- Cache des réponses avec durée de vie, indexé par l'empreinte SHA-256 du
+  prompt complet (modèle, message système, message, max_tokens).
+- Appels simultanés identiques fusionnés (single-flight) : un seul appel
+  amont, les autres requêtes attendent et reçoivent la même réponse.
+- Session requests partagée (connexions keep-alive en pool).
+L'URL de base (OPENAI_API_BASE) permet de viser un serveur local ou un stub.
+Les erreurs ne sont pas mises en cache.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("rss-aggregator")
+
+API_BASE = os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "3600"))
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "256"))
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "10"))
+
+
+class _Flight:
+    """Appel amont en cours, partagé par les requêtes identiques."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+
+
+class LLMClient:
+    def __init__(self, api_base: str = API_BASE, timeout: float = LLM_TIMEOUT,
+                 ttl: float = LLM_CACHE_TTL, max_entries: int = LLM_CACHE_SIZE,
+                 pool_size: int = LLM_POOL_SIZE):
+        self.api_base = api_base.rstrip("/")
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()  # clé -> (expiration, réponse)
+        self._flights: Dict[str, _Flight] = {}
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "upstream_calls": 0,
+                       "upstream_errors": 0, "evictions": 0}
+
+    @staticmethod
+    def cache_key(payload: Dict[str, Any], api_base: str) -> str:
+        raw = json.dumps([api_base, payload], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _post(self, payload: Dict[str, Any], api_key: str) -> Dict[str, Any]:
+        """Appel amont ; même forme de résultat que call_openai_system."""
+        with self._lock:
+            self._stats["upstream_calls"] += 1
+        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        try:
+            r = self.session.post(f"{self.api_base}/chat/completions", headers=headers,
+                                  json=payload, timeout=self.timeout)
+            r.raise_for_status()
+            jr = r.json()
+            choices = jr.get("choices") or []
+            if choices and isinstance(choices, list):
+                content = choices[0].get("message", {}).get("content") if choices[0].get("message") else choices[0].get("text")
+                return {"content": content, "raw": jr}
+            return {"raw": jr}
+        except Exception as e:
+            with self._lock:
+                self._stats["upstream_errors"] += 1
+            logger.warning(f"⚠️ Appel LLM en erreur: {e}")
+            return {"error": str(e)}
+
+    def chat(self, payload: Dict[str, Any], api_key: str) -> Dict[str, Any]:
+        """Réponse au payload chat/completions : cache, sinon appel amont (un seul par prompt)."""
+        key = self.cache_key(payload, self.api_base)
+        now = time.time()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] >= now:
+                self._cache.move_to_end(key)
+                self._stats["hits"] += 1
+                return dict(entry[1])
+            if entry is not None:
+                del self._cache[key]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            return dict(flight.result)
+
+        result = {"error": "appel LLM interrompu"}
+        try:
+            result = self._post(payload, api_key)
+        finally:
+            with self._lock:
+                if "error" not in result:
+                    self._cache[key] = (time.time() + self.ttl, result)
+                    while len(self._cache) > self.max_entries:
+                        self._cache.popitem(last=False)
+                        self._stats["evictions"] += 1
+                flight.result = result
+                del self._flights[key]
+            flight.done.set()
+        return dict(result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._stats)
+            out.update({"size": len(self._cache), "in_flight": len(self._flights)})
+        out.update({"ttl": self.ttl, "api_base": self.api_base})
+        return out
+
+
+llm_client = LLMClient()
@@ -1,14 +1,21 @@
 # rss_aggregator/modules/metrics.py
 """
 Calcul des métriques et évolutions (sentiment, thèmes).
-S'appuie sur load_recent_analyses() et summarize_analyses() de modules.storage_manager.
+compute_metrics lit les agrégats jour / thème de modules.rollups (O(jours)),
+à défaut les agrégats calculés en base ou sur l'archive par modules.aggregates ;
+compute_metrics_from_articles recompte une liste d'articles déjà chargée.
 """
 
 from typing import List, Dict, Any
+import logging
 import datetime
 from collections import defaultdict, Counter
 
-from modules.storage_manager import load_recent_analyses, summarize_analyses
+from modules.storage_manager import summarize_analyses
+from modules.analysis_utils import sentiment_bucket, extract_theme_names
+from modules import rollups, aggregates
+
+logger = logging.getLogger("rss-aggregator")
 
 
 def _normalize_date(dt):
@@ -39,57 +46,9 @@ def compute_metrics_from_articles(articles: List[Dict[str, Any]], days: int = 30
         if not date_key or date_key not in sentiment_buckets:
             continue
 
-        # sentiment detection (tolerant)
-        sentiment = None
-        for k in ("sentiment", "tone", "sentiment_label"):
-            if a.get(k) is not None:
-                sentiment = a.get(k)
-                break
-
-        if isinstance(sentiment, (int, float)):
-            if sentiment > 0.1:
-                bucket = "positive"
-            elif sentiment < -0.1:
-                bucket = "negative"
-            else:
-                bucket = "neutral"
-        elif isinstance(sentiment, str):
-            s = sentiment.lower()
-            if "pos" in s or "positive" in s:
-                bucket = "positive"
-            elif "neg" in s or "negative" in s:
-                bucket = "negative"
-            else:
-                bucket = "neutral"
-        else:
-            bucket = "neutral"
-
-        sentiment_buckets[date_key][bucket] += 1
-
-        # themes extraction
-        themes = None
-        for tk in ("themes", "detected_themes", "topics", "theme"):
-            if a.get(tk):
-                themes = a.get(tk)
-                break
-        if not themes and isinstance(a.get("raw"), dict) and a["raw"].get("themes"):
-            themes = a["raw"].get("themes")
-
-        theme_list = []
-        if isinstance(themes, list):
-            theme_list = themes
-        elif isinstance(themes, dict):
-            if "names" in themes and isinstance(themes["names"], list):
-                theme_list = themes["names"]
-            else:
-                theme_list = list(themes.keys())
-        elif isinstance(themes, str):
-            theme_list = [themes]
-
-        for t in theme_list:
-            if not t:
-                continue
-            tn = str(t).strip()
+        sentiment_buckets[date_key][sentiment_bucket(a)] += 1
+
+        for tn in extract_theme_names(a):
             theme_buckets[date_key][tn] += 1
             top_theme_counter[tn] += 1
 
@@ -121,15 +80,47 @@ def compute_metrics_from_articles(articles: List[Dict[str, Any]], days: int = 30
     }
 
 
+def _metrics_from_daily(periods: List[str], data: Dict[str, Any], summary: Dict[str, Any]) -> Dict[str, Any]:
+    """Séries par jour à partir d'agrégats {"daily": {jour: compteurs}, "themes": {jour: {thème: n}}}."""
+    top_theme_counter = Counter()
+
+    sentiment_evolution = []
+    theme_evolution = []
+    for d in periods:
+        s = data["daily"].get(d, {})
+        sentiment_evolution.append({"date": d, "positive": int(s.get("positive", 0)), "neutral": int(s.get("neutral", 0)), "negative": int(s.get("negative", 0))})
+        counts = data["themes"].get(d, {})
+        theme_evolution.append({"date": d, "themeCounts": dict(counts)})
+        top_theme_counter.update(counts)
+
+    top_themes = [{"name": k, "total": v} for k, v in top_theme_counter.most_common(30)]
+
+    return {
+        "summary": summary,
+        "periods": periods,
+        "sentiment_evolution": sentiment_evolution,
+        "theme_evolution": theme_evolution,
+        "top_themes": top_themes
+    }
+
+
+def compute_metrics_from_rollups(days: int = 30) -> Dict[str, Any]:
+    """Même résultat que compute_metrics_from_articles, sans limite de volume."""
+    periods = prepare_date_buckets(days)
+    data = rollups.read_rollups(periods[0], periods[-1])
+    return _metrics_from_daily(periods, data, rollups.summary_from_totals(data["totals"]))
+
+
+def compute_metrics_from_aggregates(days: int = 30) -> Dict[str, Any]:
+    """Même résultat, regroupé par jour en base (ou sur l'archive Parquet) à chaque appel."""
+    periods = prepare_date_buckets(days)
+    data = aggregates.read_daily(periods[0], periods[-1])
+    return _metrics_from_daily(periods, data, summarize_analyses() or {})
+
+
 def compute_metrics(days: int = 30) -> Dict[str, Any]:
-    articles = load_recent_analyses(days=days) or []
-    normalized = []
-    for a in articles:
-        if isinstance(a, dict):
-            normalized.append(a)
-        else:
-            try:
-                normalized.append(dict(a))
-            except Exception:
-                pass
-    return compute_metrics_from_articles(normalized, days=days)
+    try:
+        return compute_metrics_from_rollups(days=days)
+    except Exception as e:
+        logger.warning(f"⚠️ Agrégats indisponibles, recalcul depuis les analyses: {e}")
+    return compute_metrics_from_aggregates(days=days)
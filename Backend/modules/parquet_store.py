@@ -0,0 +1,238 @@
+# rss_aggregator/modules/parquet_store.py
+"""
+Archive colonnaire des analyses (fallback local sans PostgreSQL).
+Fichiers Parquet compressés en snappy, partitionnés par jour
+(data/analyses_parquet/day=YYYY-MM-DD/). Les lectures projettent les
+colonnes demandées et filtrent sur date / source / confiance au niveau
+du dataset : les partitions et row groups hors filtre ne sont pas lus,
+et le blob `raw` n'est désérialisé que s'il est demandé.
+"""
+
+import os
+import json
+import uuid
+import datetime
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from modules.analysis_utils import extract_sentiment_score, extract_theme_names, sentiment_bucket
+
+ARCHIVE_DIR = os.getenv(
+    "ANALYSES_PARQUET_DIR",
+    os.path.join(os.path.dirname(__file__), "..", "data", "analyses_parquet")
+)
+
+SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("title", pa.string()),
+    ("source", pa.string()),
+    ("date", pa.timestamp("us")),
+    ("summary", pa.string()),
+    ("confidence", pa.float64()),
+    ("corroboration_count", pa.int32()),
+    ("corroboration_strength", pa.float64()),
+    ("bayesian_posterior", pa.float64()),
+    ("sentiment_score", pa.float64()),
+    ("sentiment_bucket", pa.string()),
+    ("themes", pa.list_(pa.string())),
+    ("raw", pa.string()),
+    ("day", pa.string())
+])
+
+_PARTITIONING = ds.partitioning(pa.schema([("day", pa.string())]), flavor="hive")
+_FORMAT = ds.ParquetFileFormat()
+
+
+def _as_datetime(value: Any) -> datetime.datetime:
+    if isinstance(value, datetime.datetime):
+        dt = value
+    elif isinstance(value, datetime.date):
+        dt = datetime.datetime.combine(value, datetime.time())
+    elif isinstance(value, str) and value:
+        try:
+            dt = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            dt = datetime.datetime.utcnow()
+    else:
+        dt = datetime.datetime.utcnow()
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _to_table(batch: List[Dict[str, Any]]) -> pa.Table:
+    cols = {name: [] for name in SCHEMA.names}
+    for a in batch:
+        dt = _as_datetime(a.get("date"))
+        cols["id"].append(str(a.get("id") or uuid.uuid4().hex))
+        cols["title"].append(a.get("title"))
+        cols["source"].append(a.get("source"))
+        cols["date"].append(dt)
+        cols["summary"].append(a.get("summary"))
+        cols["confidence"].append(float(a.get("confidence", 0.0) or 0.0))
+        cols["corroboration_count"].append(int(a.get("corroboration_count", 0) or 0))
+        cols["corroboration_strength"].append(float(a.get("corroboration_strength", 0.0) or 0.0))
+        cols["bayesian_posterior"].append(float(a.get("bayesian_posterior", 0.0) or 0.0))
+        cols["sentiment_score"].append(extract_sentiment_score(a))
+        cols["sentiment_bucket"].append(sentiment_bucket(a))
+        cols["themes"].append(extract_theme_names(a))
+        cols["raw"].append(json.dumps(a, ensure_ascii=False, default=str))
+        cols["day"].append(dt.date().isoformat())
+    return pa.Table.from_pydict(cols, schema=SCHEMA)
+
+
+def write_analyses(batch: List[Dict[str, Any]]) -> None:
+    """Ajoute un lot d'analyses à l'archive (un fichier par jour touché)."""
+    if not batch:
+        return
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    ds.write_dataset(
+        _to_table(batch),
+        ARCHIVE_DIR,
+        format=_FORMAT,
+        partitioning=_PARTITIONING,
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        file_options=_FORMAT.make_write_options(compression="snappy")
+    )
+
+
+def _dataset() -> Optional[ds.Dataset]:
+    if not os.path.isdir(ARCHIVE_DIR):
+        return None
+    return ds.dataset(ARCHIVE_DIR, format=_FORMAT, partitioning=_PARTITIONING, schema=SCHEMA)
+
+
+def build_filter(start: Optional[datetime.datetime] = None,
+                 end: Optional[datetime.datetime] = None,
+                 sources: Optional[Iterable[str]] = None,
+                 min_confidence: Optional[float] = None):
+    """Expression de filtre ; les bornes de date élaguent aussi les partitions `day`."""
+    expr = None
+
+    def _and(e):
+        return e if expr is None else expr & e
+
+    if start is not None:
+        start = _as_datetime(start)
+        expr = _and((ds.field("day") >= start.date().isoformat()) & (ds.field("date") >= pa.scalar(start, pa.timestamp("us"))))
+    if end is not None:
+        end = _as_datetime(end)
+        expr = _and((ds.field("day") <= end.date().isoformat()) & (ds.field("date") < pa.scalar(end, pa.timestamp("us"))))
+    if sources:
+        expr = _and(ds.field("source").isin(list(sources)))
+    if min_confidence is not None:
+        expr = _and(ds.field("confidence") >= float(min_confidence))
+    return expr
+
+
+def scan_analyses(columns: Optional[List[str]] = None, **filters) -> pa.Table:
+    """
+    Table Arrow des analyses filtrées (voir build_filter), limitée aux
+    colonnes demandées. `.to_pandas()` pour un DataFrame.
+    """
+    dataset = _dataset()
+    columns = columns or [n for n in SCHEMA.names if n != "day"]
+    if dataset is None:
+        return pa.table({c: pa.array([], SCHEMA.field(c).type) for c in columns})
+    return dataset.to_table(columns=columns, filter=build_filter(**filters))
+
+
+def read_records(days: Optional[int] = None, limit: Optional[int] = None,
+                 columns: Optional[List[str]] = None, **filters) -> List[Dict[str, Any]]:
+    """
+    Analyses sous forme de dicts, les plus récentes d'abord.
+    `raw` (s'il est projeté) est redécodé en dict.
+    """
+    if days is not None:
+        filters.setdefault("start", datetime.datetime.utcnow() - datetime.timedelta(days=days))
+    table = scan_analyses(columns=columns, **filters)
+    if table.num_rows == 0:
+        return []
+    if "date" in table.column_names:
+        table = table.take(pc.sort_indices(table, sort_keys=[("date", "descending")]))
+    if limit:
+        table = table.slice(0, limit)
+    rows = table.to_pylist()
+    for row in rows:
+        if isinstance(row.get("raw"), str):
+            row["raw"] = json.loads(row["raw"])
+    return rows
+
+
+def _partition_days(dataset: ds.Dataset) -> List[str]:
+    """Valeurs de `day` présentes dans l'archive (une par partition), sans lire les fichiers."""
+    days = set()
+    for fragment in dataset.get_fragments():
+        day = ds.get_partition_keys(fragment.partition_expression).get("day")
+        if day:
+            days.add(day)
+    return sorted(days)
+
+
+def iter_records(start: Optional[datetime.datetime] = None, end: Optional[datetime.datetime] = None,
+                 after: Optional[tuple] = None, columns: Optional[List[str]] = None,
+                 limit: Optional[int] = None, batch_size: int = 2000) -> Iterator[Dict[str, Any]]:
+    """
+    Analyses datées, de la plus récente à la plus ancienne (ordre date, id
+    décroissant), converties en dicts par lots de `batch_size`. `after` est la
+    clé (date, id) de la dernière ligne déjà lue. `id` et `date` sont toujours lus.
+    Une partition `day` est lue et triée à la fois, de la plus récente à la
+    plus ancienne : la mémoire est bornée par le plus gros jour, pas par l'archive.
+    """
+    dataset = _dataset()
+    if dataset is None:
+        return
+    read = list(dict.fromkeys(["id", "date"] + (columns or [n for n in SCHEMA.names if n != "day"])))
+    base = build_filter(start=start, end=end)
+    last_day = None
+    if after is not None:
+        after_date = pa.scalar(_as_datetime(after[0]), pa.timestamp("us"))
+        after_id = str(after[1] or "")
+        last_day = _as_datetime(after[0]).date().isoformat()
+    first_day = _as_datetime(start).date().isoformat() if start is not None else None
+    end_day = _as_datetime(end).date().isoformat() if end is not None else None
+
+    remaining = limit or None
+    for day in reversed(_partition_days(dataset)):
+        if (last_day and day > last_day) or (end_day and day > end_day):
+            continue
+        if first_day and day < first_day:
+            break
+        expr = ds.field("day") == day
+        table = dataset.to_table(columns=read, filter=expr if base is None else base & expr)
+        table = table.filter(pc.is_valid(table["date"]))
+        # Clé de tri : identifiant absent ramené à ""
+        table = table.append_column("_id", pc.fill_null(table["id"], ""))
+        if after is not None and day == last_day:
+            table = table.filter(pc.or_(pc.less(table["date"], after_date),
+                                        pc.and_(pc.equal(table["date"], after_date), pc.less(table["_id"], after_id))))
+        if table.num_rows == 0:
+            continue
+        table = table.take(pc.sort_indices(table, sort_keys=[("date", "descending"), ("_id", "descending")]))
+        if remaining is not None:
+            table = table.slice(0, remaining)
+            remaining -= table.num_rows
+        for batch in table.select(read).to_batches(max_chunksize=batch_size):
+            for row in batch.to_pylist():
+                if isinstance(row.get("raw"), str):
+                    row["raw"] = json.loads(row["raw"])
+                yield row
+        if remaining is not None and remaining <= 0:
+            return
+
+
+def summarize() -> Dict[str, Any]:
+    """Totaux et moyennes sur toute l'archive (3 colonnes projetées)."""
+    table = scan_analyses(columns=["confidence", "bayesian_posterior", "corroboration_strength"])
+    if table.num_rows == 0:
+        return {}
+    return {
+        "total_articles": table.num_rows,
+        "avg_confidence": pc.mean(table["confidence"]).as_py(),
+        "avg_posterior": pc.mean(table["bayesian_posterior"]).as_py(),
+        "avg_corroboration": pc.mean(table["corroboration_strength"]).as_py()
+    }
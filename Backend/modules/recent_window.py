@@ -0,0 +1,197 @@
+# rss_aggregator/modules/recent_window.py
+"""
+Fenêtre glissante des articles récents, résidente en mémoire, pour la
+corroboration. Seuls les champs utiles (id, titre, résumé, source, date)
+sont gardés, dans un index inversé (modules.corroboration.CandidateIndex).
+La fenêtre est reconstruite depuis la base au démarrage, puis complétée
+avant chaque recherche par les analyses validées depuis (id > dernier id
+lu, storage_manager.AnalysisTail), y compris celles des autres workers :
+au plus une petite requête indexée par CORROBORATION_REFRESH_SECONDS, sans
+relire la fenêtre ni décoder `raw`. Sans base (archive locale, un seul
+processus), elle est alimentée directement par chaque sauvegarde.
+"""
+
+import os
+import time
+import logging
+import datetime
+import threading
+from typing import List, Dict, Any, Optional
+
+from modules.corroboration import CandidateIndex, find_corroborations
+from modules.storage_manager import (load_corroboration_window, register_save_listener, consistent_snapshot,
+                                     AnalysisTail)
+
+logger = logging.getLogger("rss-aggregator")
+
+WINDOW_DAYS = float(os.getenv("CORROBORATION_WINDOW_DAYS", "3"))
+# Intervalle minimal entre deux lectures des nouvelles analyses en base
+REFRESH_SECONDS = float(os.getenv("CORROBORATION_REFRESH_SECONDS", "1"))
+
+_FIELDS = ("id", "title", "summary", "source", "date")
+
+
+def _timestamp(value: Any) -> float:
+    """Horodatage (epoch) de la date d'un article ; maintenant si absente ou illisible."""
+    if isinstance(value, str) and value:
+        try:
+            value = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return time.time()
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value.timestamp()
+    return time.time()
+
+
+def _slim(article: Dict[str, Any]) -> Dict[str, Any]:
+    return {f: article.get(f) for f in _FIELDS}
+
+
+class RecentWindow:
+    """Articles des `days` derniers jours, indexés pour find_corroborations."""
+
+    def __init__(self, days: float = WINDOW_DAYS, refresh_seconds: float = REFRESH_SECONDS):
+        self.days = days
+        self.refresh_seconds = refresh_seconds
+        self.index = CandidateIndex(window_seconds=days * 86400)
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._loaded = False
+        self._tail = AnalysisTail(list(_FIELDS))
+        # Ids en base déjà indexés (-> horodatage) : une ligne relue n'est pas ajoutée deux fois
+        self._ids: Dict[Any, float] = {}
+        self._next_refresh = 0.0
+        # Analyses sauvegardées pendant une reconstruction, rejouées ensuite
+        self._pending: Optional[List[Dict[str, Any]]] = None
+        self._stats = {"rebuilds": 0, "rebuild_seconds": 0.0, "appended": 0, "refreshed": 0,
+                       "evicted": 0, "queries": 0}
+
+    def rebuild(self) -> int:
+        """Recharge la fenêtre depuis la base (ou l'archive locale)."""
+        started = time.perf_counter()
+        try:
+            # Les sauvegardes validées après la lecture sont rejouées, les autres y figurent déjà
+            with consistent_snapshot():
+                self._tail.start()
+                rows = load_corroboration_window(self.days)
+                with self._lock:
+                    self._pending = []
+            index = CandidateIndex(window_seconds=self.days * 86400)
+            ids = {}
+            for row in rows:
+                ts = _timestamp(row.get("date"))
+                index.add(_slim(row), ts)
+                if row.get("id") is not None:
+                    ids[row["id"]] = ts
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            for article in self._pending:
+                index.add(article, _timestamp(article.get("date")))
+            self._pending = None
+            self.index = index
+            self._ids = ids
+            self._next_refresh = 0.0
+            self._loaded = True
+            self._stats["rebuilds"] += 1
+            self._stats["rebuild_seconds"] = round(time.perf_counter() - started, 3)
+        logger.info(f"🪟 Fenêtre de corroboration chargée: {len(rows)} articles sur {self.days:g} jours")
+        return len(rows)
+
+    def ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                self.rebuild()
+            except Exception as e:
+                # Fenêtre vide plutôt qu'un échec : elle se remplira au fil des sauvegardes
+                logger.warning(f"⚠️ Fenêtre de corroboration non chargée: {e}")
+                self._loaded = True
+
+    def on_saved(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        Listener de storage_manager : avec une base, la prochaine recherche relit
+        les nouvelles analyses (avec leur id) ; sans base, elles sont ajoutées ici.
+        """
+        if self._tail.enabled:
+            self._next_refresh = 0.0
+        else:
+            self.append(batch)
+
+    def append(self, batch: List[Dict[str, Any]]) -> None:
+        """Ajoute des analyses fraîchement sauvegardées."""
+        slim = [_slim(a) for a in batch]
+        with self._lock:
+            index = self.index
+            if self._pending is not None:
+                self._pending.extend(slim)
+            self._stats["appended"] += len(slim)
+        for article in slim:
+            index.add(article, _timestamp(article.get("date")))
+
+    def refresh(self) -> int:
+        """Ajoute les analyses validées en base depuis la dernière lecture (tous workers)."""
+        now = time.time()
+        if not self._tail.enabled or now < self._next_refresh:
+            return 0
+        self._next_refresh = now + self.refresh_seconds
+        try:
+            rows = self._tail.fetch()
+        except Exception as e:
+            logger.warning(f"⚠️ Nouvelles analyses non relues pour la corroboration: {e}")
+            return 0
+        cutoff = now - self.days * 86400
+        added = 0
+        with self._lock:
+            for row in rows:
+                ts = _timestamp(row.get("date"))
+                if row["id"] in self._ids or ts < cutoff:
+                    continue
+                self._ids[row["id"]] = ts
+                self.index.add(_slim(row), ts)
+                added += 1
+            self._stats["refreshed"] += added
+        return added
+
+    def find_corroborations(self, article: Dict[str, Any], threshold: float = 0.65) -> List[Dict]:
+        self.ensure_loaded()
+        self.refresh()
+        with self._lock:
+            evicted = self.index.evict()
+            if evicted:
+                cutoff = time.time() - self.days * 86400
+                self._ids = {i: ts for i, ts in self._ids.items() if ts >= cutoff}
+            self._stats["evicted"] += evicted
+            self._stats["queries"] += 1
+            index = self.index
+        return find_corroborations(article, threshold=threshold, index=index)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._stats)
+            out["size"] = len(self.index)
+        out.update({"days": self.days, "loaded": self._loaded, "last_id": self._tail.last_id})
+        return out
+
+
+_window: Optional[RecentWindow] = None
+_window_lock = threading.Lock()
+
+
+def get_recent_window() -> RecentWindow:
+    """Fenêtre partagée du processus, abonnée aux sauvegardes d'analyses."""
+    global _window
+    if _window is None:
+        with _window_lock:
+            if _window is None:
+                window = RecentWindow()
+                register_save_listener(window.on_saved)
+                _window = window
+    return _window
@@ -0,0 +1,328 @@
+# rss_aggregator/modules/relation_graph.py
+"""
+Graphe de co-occurrence des acteurs géopolitiques (pays, organisations),
+tenu à jour au fil des sauvegardes d'analyses : avec une base, les analyses
+validées depuis la dernière lecture (tous workers, storage_manager.AnalysisTail)
+sont relues avant chaque classement ; sans base, chaque sauvegarde est
+ajoutée directement.
+Chaque paire d'acteurs cités dans un même article est une cellule d'une
+matrice creuse (clé entière : deux identifiants d'acteurs), avec le nombre
+d'articles et la somme de leurs scores de sentiment. Les contributions sont
+rangées par jour pour qu'une fenêtre glissante retire les jours échus.
+Les cellules sont classées par compte (niveaux triés) : les K premières
+relations se lisent sans parcourir la matrice ni relire les articles.
+Mêmes motifs d'acteurs que AdvancedIAAnalyzer.extract_geopolitical_actors.
+"""
+
+import os
+import time
+import bisect
+import logging
+import datetime
+import threading
+from typing import List, Dict, Any, Optional, Iterable
+
+from modules.text_patterns import GEOPOLITICAL_ACTOR_PATTERNS
+from modules.analysis_utils import extract_sentiment_score
+from modules.storage_manager import (load_relation_window, register_save_listener, consistent_snapshot,
+                                     AnalysisTail, RELATION_COLUMNS)
+
+logger = logging.getLogger("rss-aggregator")
+
+RELATION_GRAPH_DAYS = int(os.getenv("RELATION_GRAPH_DAYS", "30"))
+# Intervalle minimal entre deux lectures des nouvelles analyses en base
+RELATION_REFRESH_SECONDS = float(os.getenv("RELATION_GRAPH_REFRESH_SECONDS", "5"))
+
+# Graphies d'un même acteur
+CANONICAL_ACTORS = {
+    "france": "France", "allemagne": "Allemagne",
+    "états-unis": "États-Unis", "usa": "États-Unis",
+    "china": "Chine", "chine": "Chine", "russie": "Russie",
+    "uk": "Royaume-Uni", "royaume-uni": "Royaume-Uni",
+    "ukraine": "Ukraine", "israel": "Israël", "palestine": "Palestine",
+    "onu": "ONU", "un": "ONU", "otan": "OTAN", "nato": "OTAN",
+    "ue": "UE", "union européenne": "UE", "oms": "OMS", "who": "OMS"
+}
+# Sigles retenus seulement en capitales ("un", "who", "ue" sont aussi des mots courants)
+ACRONYMS = {"usa", "uk", "onu", "un", "otan", "nato", "ue", "oms", "who"}
+_ACTOR_KINDS = ("pays", "organisations")
+
+
+def extract_actors(text: str) -> List[str]:
+    """Pays et organisations cités dans `text`, sous leur nom canonique, sans doublon."""
+    found = []
+    for kind in _ACTOR_KINDS:
+        for match in GEOPOLITICAL_ACTOR_PATTERNS[kind].findall(text or ""):
+            key = match.lower()
+            if key in ACRONYMS and not match.isupper():
+                continue
+            name = CANONICAL_ACTORS.get(key, match)
+            if name not in found:
+                found.append(name)
+    return found
+
+
+def _day(value: Any) -> str:
+    if isinstance(value, datetime.datetime):
+        return value.date().isoformat()
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, str) and len(value) >= 10:
+        return value[:10]
+    return datetime.date.today().isoformat()
+
+
+def relation_label(score: float) -> str:
+    if score >= 0.3:
+        return "cooperative"
+    if score > -0.3:
+        return "neutral"
+    if score > -0.6:
+        return "tense"
+    return "conflict"
+
+
+class _Matrix:
+    """Matrice creuse paire -> [articles, somme des sentiments], avec ses contributions par jour."""
+
+    def __init__(self):
+        self.cells: Dict[int, List[float]] = {}
+        self.by_day: Dict[str, Dict[int, List[float]]] = {}
+        # Comptes distincts non nuls (triés) et paires de chaque compte, dans l'ordre d'arrivée
+        self.levels: List[int] = []
+        self.buckets: Dict[int, Dict[int, None]] = {}
+
+    def _move(self, key: int, old: int, new: int) -> None:
+        if old:
+            bucket = self.buckets[old]
+            del bucket[key]
+            if not bucket:
+                del self.buckets[old]
+                del self.levels[bisect.bisect_left(self.levels, old)]
+        if new:
+            if new not in self.buckets:
+                self.buckets[new] = {}
+                bisect.insort(self.levels, new)
+            self.buckets[new][key] = None
+
+    def add(self, day: str, keys: Iterable[int], score: float) -> None:
+        contributions = self.by_day.setdefault(day, {})
+        for key in keys:
+            cell = self.cells.setdefault(key, [0, 0.0])
+            self._move(key, cell[0], cell[0] + 1)
+            cell[0] += 1
+            cell[1] += score
+            c = contributions.setdefault(key, [0, 0.0])
+            c[0] += 1
+            c[1] += score
+
+    def evict(self, before: str) -> int:
+        """Retire les contributions des jours antérieurs à `before` ; nombre de jours retirés."""
+        expired = [d for d in self.by_day if d < before]
+        for day in expired:
+            for key, (count, total) in self.by_day.pop(day).items():
+                cell = self.cells[key]
+                self._move(key, cell[0], cell[0] - count)
+                cell[0] -= count
+                cell[1] -= total
+                if cell[0] <= 0:
+                    del self.cells[key]
+        return len(expired)
+
+    def top(self, k: int, min_count: int = 1) -> List[tuple]:
+        """Les `k` paires les plus fréquentes : (clé, articles, somme des sentiments)."""
+        out = []
+        for level in reversed(self.levels):
+            if level < min_count or len(out) >= k:
+                break
+            for key in self.buckets[level]:
+                out.append((key, level, self.cells[key][1]))
+                if len(out) >= k:
+                    break
+        return out
+
+
+class RelationGraph:
+    """Relations entre acteurs sur les `days` derniers jours."""
+
+    def __init__(self, days: int = RELATION_GRAPH_DAYS, refresh_seconds: float = RELATION_REFRESH_SECONDS):
+        self.days = days
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._loaded = False
+        self._matrix = _Matrix()
+        # Acteurs numérotés : les cellules ne stockent que des entiers
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._tail = AnalysisTail(RELATION_COLUMNS)
+        # Ids en base déjà comptés (-> jour) : une ligne relue n'est pas comptée deux fois
+        self._seen: Dict[Any, str] = {}
+        self._next_refresh = 0.0
+        # Analyses sauvegardées pendant une reconstruction, rejouées ensuite
+        self._pending: Optional[List[tuple]] = None
+        self._stats = {"rebuilds": 0, "rebuild_seconds": 0.0, "appended": 0, "refreshed": 0,
+                       "evicted_days": 0}
+
+    def _cutoff(self) -> str:
+        return (datetime.date.today() - datetime.timedelta(days=self.days)).isoformat()
+
+    @staticmethod
+    def _features(article: Dict[str, Any]) -> tuple:
+        """(jour, acteurs, score) d'un article ; extraction faite hors verrou."""
+        text = (article.get("title") or "") + " " + (article.get("summary") or article.get("content") or "")
+        return _day(article.get("date")), extract_actors(text), extract_sentiment_score(article) or 0.0
+
+    def _keys(self, actors: List[str]) -> List[int]:
+        ids = []
+        for name in actors:
+            if name not in self._ids:
+                self._ids[name] = len(self._names)
+                self._names.append(name)
+            ids.append(self._ids[name])
+        ids.sort()
+        return [(a << 32) | b for i, a in enumerate(ids) for b in ids[i + 1:]]
+
+    def _add(self, matrix: _Matrix, features: tuple, cutoff: str) -> None:
+        day, actors, score = features
+        if len(actors) >= 2 and day >= cutoff:
+            matrix.add(day, self._keys(actors), score)
+
+    def rebuild(self) -> int:
+        """Recalcule le graphe depuis les analyses de la fenêtre."""
+        started = time.perf_counter()
+        try:
+            # Les sauvegardes validées après la lecture sont rejouées, les autres y figurent déjà.
+            # Un jour de plus : la fenêtre est découpée par jour calendaire (voir _cutoff)
+            with consistent_snapshot():
+                self._tail.start()
+                rows = load_relation_window(self.days + 1)
+                with self._lock:
+                    self._pending = []
+            features = [self._features(row) for row in rows]
+            seen = {row["id"]: f[0] for row, f in zip(rows, features) if row.get("id") is not None}
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+        matrix = _Matrix()
+        cutoff = self._cutoff()
+        with self._lock:
+            for f in features + self._pending:
+                self._add(matrix, f, cutoff)
+            self._pending = None
+            self._matrix = matrix
+            self._seen = seen
+            self._next_refresh = 0.0
+            self._loaded = True
+            self._stats["rebuilds"] += 1
+            self._stats["rebuild_seconds"] = round(time.perf_counter() - started, 3)
+        logger.info(f"🕸️ Graphe de relations chargé: {len(features)} articles, {len(matrix.cells)} paires")
+        return len(features)
+
+    def ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                self.rebuild()
+            except Exception as e:
+                # Graphe vide plutôt qu'un échec : il se remplira au fil des sauvegardes
+                logger.warning(f"⚠️ Graphe de relations non chargé: {e}")
+                self._loaded = True
+
+    def on_saved(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        Listener de storage_manager : avec une base, le prochain classement relit
+        les nouvelles analyses (avec leur id) ; sans base, elles sont ajoutées ici.
+        """
+        if self._tail.enabled:
+            self._next_refresh = 0.0
+        else:
+            self.append(batch)
+
+    def append(self, batch: List[Dict[str, Any]]) -> None:
+        """Ajoute des analyses fraîchement sauvegardées."""
+        features = [self._features(a) for a in batch]
+        cutoff = self._cutoff()
+        with self._lock:
+            if self._pending is not None:
+                self._pending.extend(features)
+            for f in features:
+                self._add(self._matrix, f, cutoff)
+            self._stats["appended"] += len(features)
+
+    def refresh(self) -> int:
+        """Ajoute les analyses validées en base depuis la dernière lecture (tous workers)."""
+        now = time.time()
+        if not self._tail.enabled or now < self._next_refresh:
+            return 0
+        self._next_refresh = now + self.refresh_seconds
+        try:
+            rows = self._tail.fetch()
+        except Exception as e:
+            logger.warning(f"⚠️ Nouvelles analyses non relues pour le graphe de relations: {e}")
+            return 0
+        features = [(row["id"], self._features(row)) for row in rows]
+        cutoff = self._cutoff()
+        added = 0
+        with self._lock:
+            for row_id, f in features:
+                if row_id in self._seen:
+                    continue
+                self._seen[row_id] = f[0]
+                self._add(self._matrix, f, cutoff)
+                added += 1
+            self._stats["refreshed"] += added
+        return added
+
+    def top_relations(self, k: int = 10, min_count: int = 1) -> List[Dict[str, Any]]:
+        """Les `k` paires d'acteurs les plus souvent citées ensemble, avec leur sentiment moyen."""
+        self.ensure_loaded()
+        self.refresh()
+        cutoff = self._cutoff()
+        with self._lock:
+            evicted = self._matrix.evict(cutoff)
+            if evicted:
+                self._seen = {i: day for i, day in self._seen.items() if day >= cutoff}
+            self._stats["evicted_days"] += evicted
+            top = self._matrix.top(k, min_count)
+            names = self._names
+            out = []
+            for key, count, total in top:
+                score = total / count
+                out.append({
+                    "country1": names[key >> 32],
+                    "country2": names[key & 0xFFFFFFFF],
+                    "relation": relation_label(score),
+                    "score": round(score, 2),
+                    "confidence": round(count / (count + 5), 2),
+                    "mentions": count
+                })
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._stats)
+            out.update({"actors": len(self._names), "pairs": len(self._matrix.cells),
+                        "days_held": len(self._matrix.by_day)})
+        out.update({"days": self.days, "loaded": self._loaded, "last_id": self._tail.last_id})
+        return out
+
+
+_graph: Optional[RelationGraph] = None
+_graph_lock = threading.Lock()
+
+
+def get_relation_graph() -> RelationGraph:
+    """Graphe partagé du processus, abonné aux sauvegardes d'analyses."""
+    global _graph
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None:
+                graph = RelationGraph()
+                register_save_listener(graph.on_saved)
+                _graph = graph
+    return _graph
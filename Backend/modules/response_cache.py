@@ -0,0 +1,143 @@
+# rss_aggregator/modules/response_cache.py
+"""
+Cache des réponses des routes de lecture (métriques, résumés, sentiment,
+géopolitique, apprentissage).
+Une entrée est indexée par (route, paramètres, jour) et mémorise le corps
+JSON déjà sérialisé et son ETag. Elle reste valable tant que la version des
+données n'a pas changé : chaque sauvegarde d'analyses du processus (listener
+de storage_manager) incrémente cette version, et avec une base, celles des
+autres workers aussi : le plus grand id d'analyse validé est relu au plus
+une fois par RESPONSE_CACHE_VERSION_CHECK secondes (lecture d'index). Un
+rafraîchissement du tableau de bord sans nouvelle analyse ne coûte ni
+sérialisation ni lecture des données. Une analyse validée après une autre
+d'id supérieur n'est vue qu'à l'expiration de l'entrée (RESPONSE_CACHE_TTL).
+L'ETag est l'empreinte du corps : deux workers donnent le même pour la
+même réponse.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Hashable, Callable
+
+from modules.storage_manager import register_save_listener, latest_analysis_id
+
+logger = logging.getLogger("rss-aggregator")
+
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+# Intervalle minimal entre deux lectures de la version partagée (dernier id d'analyse en base)
+VERSION_CHECK_SECONDS = float(os.getenv("RESPONSE_CACHE_VERSION_CHECK", "1"))
+
+
+class CachedResponse:
+    __slots__ = ("version", "expires", "body", "etag")
+
+    def __init__(self, version: int, expires: float, body: bytes):
+        self.version = version
+        self.expires = expires
+        self.body = body
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+
+
+class ResponseCache:
+    def __init__(self, ttl: float = RESPONSE_CACHE_TTL, max_entries: int = RESPONSE_CACHE_SIZE,
+                 shared_version: Optional[Callable[[], Any]] = None,
+                 check_interval: float = VERSION_CHECK_SECONDS):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._version = 0
+        # Version commune à tous les workers (None : pas de base partagée)
+        self._shared_version = shared_version
+        self._shared = None
+        self._next_check = 0.0
+        self._stats = {"hits": 0, "misses": 0, "not_modified": 0, "invalidations": 0, "evictions": 0,
+                       "version_checks": 0}
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def _bump(self) -> None:
+        self._version += 1
+        self._entries.clear()
+        self._stats["invalidations"] += 1
+
+    def bump(self, batch: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Nouvelle version des données (listener de save_analysis_batch) : tout le cache est périmé."""
+        with self._lock:
+            self._bump()
+
+    def _sync(self) -> None:
+        """Périme le cache si la version partagée a changé (sauvegarde d'un autre worker)."""
+        if self._shared_version is None:
+            return
+        now = time.time()
+        with self._lock:
+            if now < self._next_check:
+                return
+            self._next_check = now + self.check_interval
+        try:
+            shared = self._shared_version()
+        except Exception as e:
+            logger.warning(f"⚠️ Version des données non relue, cache de réponses local: {e}")
+            return
+        with self._lock:
+            self._stats["version_checks"] += 1
+            if shared != self._shared:
+                self._shared = shared
+                self._bump()
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        self._sync()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == self._version and entry.expires >= time.time():
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry
+            if entry is not None:
+                del self._entries[key]
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: Hashable, body: bytes, version: int) -> CachedResponse:
+        """
+        Mémorise `body`, calculé à partir des données de `version` (lue avant le calcul) :
+        si une sauvegarde a eu lieu entre-temps, l'entrée n'est pas gardée.
+        """
+        entry = CachedResponse(version, time.time() + self.ttl, body)
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+        return entry
+
+    def count_not_modified(self) -> None:
+        with self._lock:
+            self._stats["not_modified"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._stats)
+            out.update({"size": len(self._entries), "version": self._version,
+                        "shared_version": self._shared})
+        out.update({"ttl": self.ttl, "max_entries": self.max_entries})
+        return out
+
+
+response_cache = ResponseCache(shared_version=latest_analysis_id)
+register_save_listener(response_cache.bump)
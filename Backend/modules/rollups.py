@@ -0,0 +1,298 @@
+# rss_aggregator/modules/rollups.py
+"""
+Agrégats matérialisés des analyses, par jour et par (jour, thème).
+save_analysis_batch les met à jour de façon incrémentale (dans la même
+transaction en SQL, dans data/rollups.json en local) : /api/metrics lit
+O(jours) lignes au lieu de recharger et re-compter les articles.
+"""
+
+import os
+import json
+import logging
+import datetime
+import threading
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Tuple, Callable
+
+from modules.analysis_utils import sentiment_bucket, extract_theme_names
+from modules.db_manager import get_database_url, db_connection
+from modules import parquet_store
+
+logger = logging.getLogger("rss-aggregator")
+
+LOCAL_PATH = os.getenv(
+    "ROLLUPS_PATH",
+    os.path.join(os.path.dirname(__file__), "..", "data", "rollups.json")
+)
+
+_SUM_FIELDS = ("total", "positive", "neutral", "negative",
+               "sum_confidence", "sum_posterior", "sum_corroboration")
+
+# Verrou consultatif PostgreSQL : exclusif pour la reconstruction, partagé pour les écritures
+BACKFILL_LOCK_KEY = 0x726F6C6C
+
+
+def _day_key(value: Any) -> Optional[str]:
+    if not value:
+        return None
+    if isinstance(value, str):
+        return value[:10]
+    try:
+        return value.date().isoformat() if isinstance(value, datetime.datetime) else value.isoformat()
+    except Exception:
+        return str(value)[:10]
+
+
+def _empty_day() -> Dict[str, float]:
+    return {f: 0 for f in _SUM_FIELDS}
+
+
+def compute_deltas(batch: List[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, float]], Dict[Tuple[str, str], int]]:
+    """
+    Incréments d'un lot d'analyses : ({jour: compteurs}, {(jour, thème): n}).
+    Les valeurs par défaut sont celles de l'écriture en base
+    (date = maintenant, confiance / postérieur / corroboration = 0).
+    """
+    daily = defaultdict(_empty_day)
+    themes = defaultdict(int)
+    for a in batch:
+        day = _day_key(a.get("date", datetime.datetime.utcnow()))
+        if not day:
+            continue
+        d = daily[day]
+        d["total"] += 1
+        d[sentiment_bucket(a)] += 1
+        d["sum_confidence"] += float(a.get("confidence", 0.0) or 0.0)
+        d["sum_posterior"] += float(a.get("bayesian_posterior", 0.0) or 0.0)
+        d["sum_corroboration"] += float(a.get("corroboration_strength", 0.0) or 0.0)
+        for name in extract_theme_names(a):
+            themes[(day, name)] += 1
+    return dict(daily), dict(themes)
+
+
+# ------- PostgreSQL -------
+
+def apply_sql(cur, batch: List[Dict[str, Any]]) -> None:
+    """Upsert des incréments du lot ; à appeler dans la transaction d'écriture."""
+    daily, themes = compute_deltas(batch)
+    # Attend une reconstruction en cours (backfill_sql) ; libéré au commit
+    cur.execute("SELECT pg_advisory_xact_lock_shared(%s)", (BACKFILL_LOCK_KEY,))
+    # Ordre stable des clés : deux écritures concurrentes verrouillent les lignes dans le même ordre
+    for day in sorted(daily):
+        d = daily[day]
+        cur.execute("""
+            INSERT INTO analysis_daily_rollups
+                (day, total, positive, neutral, negative, sum_confidence, sum_posterior, sum_corroboration)
+            VALUES (%s,%s,%s,%s,%s,%s,%s,%s)
+            ON CONFLICT (day) DO UPDATE SET
+                total = analysis_daily_rollups.total + EXCLUDED.total,
+                positive = analysis_daily_rollups.positive + EXCLUDED.positive,
+                neutral = analysis_daily_rollups.neutral + EXCLUDED.neutral,
+                negative = analysis_daily_rollups.negative + EXCLUDED.negative,
+                sum_confidence = analysis_daily_rollups.sum_confidence + EXCLUDED.sum_confidence,
+                sum_posterior = analysis_daily_rollups.sum_posterior + EXCLUDED.sum_posterior,
+                sum_corroboration = analysis_daily_rollups.sum_corroboration + EXCLUDED.sum_corroboration
+        """, (day, *(d[f] for f in _SUM_FIELDS)))
+    for (day, theme) in sorted(themes):
+        cur.execute("""
+            INSERT INTO analysis_theme_rollups (day, theme, total)
+            VALUES (%s,%s,%s)
+            ON CONFLICT (day, theme) DO UPDATE SET
+                total = analysis_theme_rollups.total + EXCLUDED.total
+        """, (day, theme, themes[(day, theme)]))
+
+
+def backfill_sql(conn, page_size: int = 5000) -> int:
+    """
+    Reconstruit les agrégats depuis la table analyses s'ils sont vides
+    (première mise en service). Renvoie le nombre d'analyses comptées.
+    Vérification et reconstruction se font dans une transaction tenant le
+    verrou exclusif : un seul worker reconstruit, les autres trouvent ensuite
+    les agrégats remplis, et aucune sauvegarde n'est validée entre les deux.
+    Les analyses sont lues par un curseur serveur, `page_size` lignes à la fois.
+    """
+    writer = conn.cursor()
+    writer.execute("SELECT pg_advisory_xact_lock(%s)", (BACKFILL_LOCK_KEY,))
+    writer.execute("SELECT 1 AS present FROM analysis_daily_rollups LIMIT 1")
+    if writer.fetchone():
+        conn.commit()
+        writer.close()
+        return 0
+    reader = conn.cursor(name="backfill_rollups", withhold=False)
+    reader.itersize = page_size
+    reader.execute("SELECT date, confidence, bayesian_posterior, corroboration_strength, raw FROM analyses")
+    count = 0
+    batch = []
+    for r in reader:
+        a = dict(r["raw"]) if isinstance(r.get("raw"), dict) else {}
+        a.update(date=r["date"], confidence=r["confidence"],
+                 bayesian_posterior=r["bayesian_posterior"],
+                 corroboration_strength=r["corroboration_strength"])
+        batch.append(a)
+        if len(batch) >= page_size:
+            apply_sql(writer, batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        apply_sql(writer, batch)
+        count += len(batch)
+    reader.close()
+    conn.commit()
+    writer.close()
+    if count:
+        logger.info(f"📊 Agrégats reconstruits depuis {count} analyses")
+    return count
+
+
+def _read_sql(conn, start: str, end: str) -> Dict[str, Any]:
+    cur = conn.cursor()
+    cur.execute(f"""
+        SELECT day, {", ".join(_SUM_FIELDS)}
+        FROM analysis_daily_rollups
+        WHERE day BETWEEN %s AND %s
+    """, (start, end))
+    daily = {_day_key(r["day"]): {f: r[f] for f in _SUM_FIELDS} for r in cur.fetchall()}
+    cur.execute("""
+        SELECT day, theme, total
+        FROM analysis_theme_rollups
+        WHERE day BETWEEN %s AND %s
+    """, (start, end))
+    themes = defaultdict(dict)
+    for r in cur.fetchall():
+        themes[_day_key(r["day"])][r["theme"]] = r["total"]
+    totals = _totals_sql(cur)
+    cur.close()
+    return {"daily": daily, "themes": dict(themes), "totals": totals}
+
+
+def _totals_sql(cur) -> Dict[str, float]:
+    cur.execute(f"SELECT {', '.join(f'COALESCE(SUM({f}), 0)::float AS {f}' for f in _SUM_FIELDS)} FROM analysis_daily_rollups")
+    return dict(cur.fetchone())
+
+
+# ------- Fallback local (dev) -------
+
+class LocalRollups:
+    """
+    Compteurs en mémoire persistés dans un fichier JSON après chaque lot.
+    Si le fichier est absent, ils sont reconstruits depuis l'archive Parquet.
+    """
+
+    def __init__(self, path: str = LOCAL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._daily: Optional[Dict[str, Dict[str, float]]] = None
+        self._themes: Dict[str, Dict[str, int]] = {}
+
+    def _load(self) -> None:
+        if self._daily is not None:
+            return
+        self._daily = {}
+        self._themes = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._daily = data.get("daily", {})
+                self._themes = data.get("themes", {})
+                return
+            except Exception as e:
+                logger.warning(f"⚠️ Agrégats locaux illisibles ({e}), reconstruction")
+        records = parquet_store.read_records(columns=["date", "raw"])
+        batch = []
+        for r in records:
+            a = dict(r["raw"]) if isinstance(r.get("raw"), dict) else {}
+            a["date"] = r["date"]
+            batch.append(a)
+        self._merge(*compute_deltas(batch))
+        if records:
+            self._persist()
+
+    def _merge(self, daily, themes) -> None:
+        for day, d in daily.items():
+            current = self._daily.setdefault(day, _empty_day())
+            for f in _SUM_FIELDS:
+                current[f] += d[f]
+        for (day, theme), n in themes.items():
+            counts = self._themes.setdefault(day, {})
+            counts[theme] = counts.get(theme, 0) + n
+
+    def _persist(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"daily": self._daily, "themes": self._themes}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def apply(self, batch: List[Dict[str, Any]], write: Optional[Callable] = None) -> None:
+        """
+        Ajoute un lot aux compteurs. `write(batch)` (écriture de l'archive)
+        est appelé sous le verrou, après le chargement : une reconstruction
+        depuis l'archive ne compte pas le lot deux fois.
+        """
+        with self._lock:
+            self._load()
+            if write:
+                write(batch)
+            self._merge(*compute_deltas(batch))
+            self._persist()
+
+    def read(self, start: str, end: str) -> Dict[str, Any]:
+        with self._lock:
+            self._load()
+            daily = {d: dict(v) for d, v in self._daily.items() if start <= d <= end}
+            themes = {d: dict(v) for d, v in self._themes.items() if start <= d <= end}
+            totals = self._totals()
+        return {"daily": daily, "themes": themes, "totals": totals}
+
+    def _totals(self) -> Dict[str, float]:
+        totals = _empty_day()
+        for v in self._daily.values():
+            for f in _SUM_FIELDS:
+                totals[f] += v[f]
+        return totals
+
+    def totals(self) -> Dict[str, float]:
+        with self._lock:
+            self._load()
+            return self._totals()
+
+
+_local = LocalRollups()
+
+
+def apply_local(batch: List[Dict[str, Any]], write: Optional[Callable] = None) -> None:
+    _local.apply(batch, write)
+
+
+def read_rollups(start: str, end: str) -> Dict[str, Any]:
+    """
+    Agrégats des jours [start, end] (ISO, inclus) :
+    {"daily": {jour: compteurs}, "themes": {jour: {thème: n}}, "totals": compteurs globaux}.
+    """
+    if get_database_url():
+        with db_connection() as conn:
+            return _read_sql(conn, start, end)
+    return _local.read(start, end)
+
+
+def read_totals() -> Dict[str, float]:
+    """Compteurs cumulés sur toutes les analyses."""
+    if get_database_url():
+        with db_connection() as conn:
+            cur = conn.cursor()
+            totals = _totals_sql(cur)
+            cur.close()
+            return totals
+    return _local.totals()
+
+
+def summary_from_totals(totals: Dict[str, float]) -> Dict[str, Any]:
+    """Forme de summarize_analyses() : total et moyennes (None si aucune analyse)."""
+    n = int(totals.get("total") or 0)
+    return {
+        "total_articles": n,
+        "avg_confidence": totals["sum_confidence"] / n if n else None,
+        "avg_posterior": totals["sum_posterior"] / n if n else None,
+        "avg_corroboration": totals["sum_corroboration"] / n if n else None
+    }
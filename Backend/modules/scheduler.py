@@ -1,36 +1,294 @@
 # modules/scheduler.py
-import schedule
+"""
+Scheduler adaptatif des flux : chaque flux a sa propre échéance, conservée
+dans une file de priorité (tas). L'intervalle de chaque flux est appris à
+partir du rythme d'apparition de nouveaux articles : une dépêche active est
+relevée toutes les quelques minutes, un blog inactif une fois par jour.
+Les échéances sont décalées aléatoirement (jitter) pour éviter les pics.
+Sous gunicorn, chaque worker démarre le scheduler mais un seul le fait
+tourner : celui qui tient le verrou fichier FEED_SCHEDULER_LOCK (repris par
+un autre worker si le premier est recyclé). Ce worker publie le planning
+dans FEED_SCHEDULE_PATH, où les autres le lisent pour l'API.
+"""
+import os
+import json
 import time
+import heapq
+import random
 import logging
+import tempfile
+import itertools
+import threading
 from threading import Thread
-from modules.feed_scraper import refresh_all_feeds
+from typing import List, Dict, Any, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows (dev) : un seul processus, pas de verrou
+    fcntl = None
+
+from modules.feed_scraper import refresh_feeds, load_feed_list
 
 logger = logging.getLogger("rss-aggregator")
 
-def scheduled_refresh():
-    """Tâche planifiée d'actualisation"""
+MIN_INTERVAL = int(os.getenv("FEED_MIN_INTERVAL", "300"))          # 5 min
+MAX_INTERVAL = int(os.getenv("FEED_MAX_INTERVAL", "86400"))        # 24 h
+DEFAULT_INTERVAL = int(os.getenv("FEED_DEFAULT_INTERVAL", "3600"))  # 1 h
+JITTER_RATIO = float(os.getenv("FEED_POLL_JITTER", "0.1"))
+FEED_LIST_RELOAD = int(os.getenv("FEED_LIST_RELOAD", "600"))
+# Nombre de nouveaux articles visé entre deux relevés
+TARGET_NEW_ITEMS = 1.0
+# Lissage exponentiel du rythme de publication
+RATE_ALPHA = 0.3
+# Verrou désignant le worker qui relève les flux, et délai entre deux tentatives des autres
+SCHEDULER_LOCK_PATH = os.getenv("FEED_SCHEDULER_LOCK",
+                                os.path.join(tempfile.gettempdir(), "rss-feed-scheduler.lock"))
+SCHEDULER_LOCK_RETRY = float(os.getenv("FEED_SCHEDULER_LOCK_RETRY", "60"))
+# Planning publié par le worker qui relève les flux, lu par tous les workers
+SCHEDULE_PATH = os.getenv("FEED_SCHEDULE_PATH",
+                          os.path.join(tempfile.gettempdir(), "rss-feed-schedule.json"))
+
+
+class AdaptiveFeedScheduler:
+    """
+    File de priorité (next_poll, seq, url) avec un état par flux.
+    Les entrées obsolètes du tas (flux replanifié ou retiré) sont ignorées
+    au dépilement.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._heap = []
+        self._seq = itertools.count()
+        self._states: Dict[str, Dict[str, Any]] = {}
+
+    def _push(self, state: Dict[str, Any]) -> None:
+        state["seq"] = next(self._seq)
+        heapq.heappush(self._heap, (state["next_poll"], state["seq"], state["url"]))
+
+    @staticmethod
+    def _jitter(interval: float) -> float:
+        return interval * random.uniform(1 - JITTER_RATIO, 1 + JITTER_RATIO)
+
+    def sync_feeds(self, feeds: List[Dict[str, Any]], now: Optional[float] = None) -> None:
+        """Ajoute les nouveaux flux (démarrage étalé) et retire les flux désactivés."""
+        now = time.time() if now is None else now
+        with self._lock:
+            urls = set()
+            for feed in feeds:
+                url = feed["url"]
+                urls.add(url)
+                if url in self._states:
+                    self._states[url]["feed"].update(feed)
+                    continue
+                state = {
+                    "url": url,
+                    "feed": dict(feed),
+                    "interval": DEFAULT_INTERVAL,
+                    "rate": None,  # nouveaux articles / seconde (EWMA)
+                    "last_poll": None,
+                    "next_poll": now + random.uniform(0, min(DEFAULT_INTERVAL, MIN_INTERVAL * 2)),
+                    "polls": 0,
+                    "failures": 0,
+                    "last_new": 0
+                }
+                self._states[url] = state
+                self._push(state)
+            for url in list(self._states):
+                if url not in urls:
+                    del self._states[url]
+
+    def pop_due(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Dépile les flux arrivés à échéance."""
+        now = time.time() if now is None else now
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, seq, url = heapq.heappop(self._heap)
+                state = self._states.get(url)
+                if state and state["seq"] == seq:
+                    # Hors du tas jusqu'à record() ou requeue_unrecorded()
+                    state["in_flight"] = True
+                    due.append(dict(state["feed"]))
+        return due
+
+    def next_due_in(self, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        with self._lock:
+            return max(0.0, self._heap[0][0] - now) if self._heap else float(MIN_INTERVAL)
+
+    def record(self, result: Dict[str, Any], now: Optional[float] = None) -> None:
+        """Met à jour le rythme appris d'un flux après un relevé et le replanifie."""
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self._states.get(result["url"])
+            if not state:
+                return
+            state["in_flight"] = False
+            state["polls"] += 1
+            if not result.get("ok"):
+                state["failures"] += 1
+                state["interval"] = min(MAX_INTERVAL, state["interval"] * 2)
+            else:
+                state["failures"] = 0
+                for k in ("etag", "last_modified", "content_hash", "seen_guids"):
+                    state["feed"][k] = result.get(k)
+                new_items = result.get("new_count", 0)
+                state["last_new"] = new_items
+                if state["last_poll"] is not None:
+                    elapsed = max(1.0, now - state["last_poll"])
+                    observed = new_items / elapsed
+                    state["rate"] = observed if state["rate"] is None else \
+                        RATE_ALPHA * observed + (1 - RATE_ALPHA) * state["rate"]
+                    if state["rate"] > 0:
+                        state["interval"] = TARGET_NEW_ITEMS / state["rate"]
+                    else:
+                        state["interval"] = state["interval"] * 1.5
+                state["interval"] = max(MIN_INTERVAL, min(MAX_INTERVAL, state["interval"]))
+                state["last_poll"] = now
+            state["next_poll"] = now + self._jitter(state["interval"])
+            self._push(state)
+
+    def requeue_unrecorded(self, feeds: List[Dict[str, Any]], now: Optional[float] = None) -> int:
+        """
+        Replanifie, comme un échec, les flux dépilés dont aucun résultat n'a été
+        enregistré (relevé interrompu par une exception) ; renvoie leur nombre.
+        """
+        now = time.time() if now is None else now
+        requeued = 0
+        with self._lock:
+            for feed in feeds:
+                state = self._states.get(feed["url"])
+                if not state or not state.get("in_flight"):
+                    continue
+                state["in_flight"] = False
+                state["failures"] += 1
+                state["interval"] = min(MAX_INTERVAL, state["interval"] * 2)
+                state["next_poll"] = now + self._jitter(state["interval"])
+                self._push(state)
+                requeued += 1
+        return requeued
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Planning courant : échéance et intervalle appris de chaque flux."""
+        with self._lock:
+            feeds = sorted(self._states.values(), key=lambda s: s["next_poll"])
+            rows = [{
+                "url": s["url"],
+                "feed_id": s["feed"].get("id"),
+                "interval_seconds": round(s["interval"]),
+                "next_poll": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(s["next_poll"])),
+                "last_poll": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(s["last_poll"])) if s["last_poll"] else None,
+                "new_items_per_hour": round(s["rate"] * 3600, 3) if s["rate"] is not None else None,
+                "last_new_items": s["last_new"],
+                "polls": s["polls"],
+                "failures": s["failures"]
+            } for s in feeds]
+        return {
+            "feeds": len(rows),
+            "polls_per_day": round(sum(86400 / r["interval_seconds"] for r in rows), 1),
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "schedule": rows
+        }
+
+    def publish(self, path: str = SCHEDULE_PATH) -> None:
+        """Écrit le planning courant (remplacement atomique) pour les autres workers."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def run_forever(self, stop_event: Optional[threading.Event] = None) -> None:
+        stop_event = stop_event or threading.Event()
+        last_reload = 0.0
+        while not stop_event.is_set():
+            try:
+                if time.time() - last_reload >= FEED_LIST_RELOAD:
+                    self.sync_feeds(load_feed_list())
+                    last_reload = time.time()
+                due = self.pop_due()
+                if due:
+                    try:
+                        summary = refresh_feeds(due, on_result=self.record)
+                        logger.info(f"📡 {summary['fetched']}/{len(due)} flux relevés, "
+                                    f"{summary['new_entries']} nouveaux articles en {summary['duration']}s")
+                    finally:
+                        # Un flux dépilé reste toujours planifié
+                        self.requeue_unrecorded(due)
+                self.publish()
+            except Exception as e:
+                logger.error(f"❌ Erreur dans le scheduler adaptatif: {e}")
+            stop_event.wait(min(self.next_due_in(), 60))
+
+
+_scheduler = AdaptiveFeedScheduler()
+_thread: Optional[Thread] = None
+_thread_lock = threading.Lock()
+# Levé tant que ce processus détient le verrou et relève les flux
+_leader = threading.Event()
+
+
+def get_schedule() -> Dict[str, Any]:
+    """
+    Planning des relevés (exposé par l'API) : celui du scheduler local dans le
+    worker qui relève les flux, sinon le dernier publié dans SCHEDULE_PATH.
+    """
+    if _leader.is_set():
+        return _scheduler.snapshot()
     try:
-        logger.info("⏰ Déclenchement de l'actualisation planifiée")
-        refresh_all_feeds()
-        logger.info("✅ Actualisation planifiée terminée")
-    except Exception as e:
-        logger.error(f"❌ Erreur lors de l'actualisation planifiée: {e}")
-
-def start_scheduler():
-    """Démarre le scheduler dans un thread séparé"""
-    def run_scheduler():
-        # Planifier l'actualisation toutes les heures
-        schedule.every(1).hour.do(scheduled_refresh)
-        
-        # Première exécution immédiate
-        schedule.every(1).minute.do(scheduled_refresh)
-        
-        logger.info("🕒 Scheduler démarré - Actualisation toutes les heures")
-        
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Vérifier toutes les minutes
-    
-    thread = Thread(target=run_scheduler)
-    thread.daemon = True
-    thread.start()
\ No newline at end of file
+        with open(SCHEDULE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        # Scheduler pas encore élu ou premier cycle en cours
+        return {"feeds": 0, "polls_per_day": 0, "updated_at": None, "schedule": []}
+
+
+def _acquire_scheduler_lock() -> Optional[int]:
+    """Verrou fichier exclusif, non bloquant ; descripteur à garder ouvert, None s'il est tenu ailleurs."""
+    fd = os.open(SCHEDULER_LOCK_PATH, os.O_RDWR | os.O_CREAT, 0o644)
+    if fcntl is None:
+        return fd
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _run_when_elected(stop_event: threading.Event) -> None:
+    """Attend le verrou du scheduler (libéré à l'arrêt du worker qui le tient), puis relève les flux."""
+    while not stop_event.is_set():
+        try:
+            fd = _acquire_scheduler_lock()
+        except OSError as e:
+            logger.error(f"❌ Verrou du scheduler inaccessible ({SCHEDULER_LOCK_PATH}): {e}")
+            return
+        if fd is not None:
+            logger.info(f"🕒 Scheduler adaptatif actif dans ce worker (pid {os.getpid()})")
+            _leader.set()
+            try:
+                _scheduler.run_forever(stop_event)
+            finally:
+                _leader.clear()
+                os.close(fd)
+            return
+        stop_event.wait(SCHEDULER_LOCK_RETRY)
+
+
+def start_scheduler(stop_event: Optional[threading.Event] = None) -> Thread:
+    """
+    Démarre le scheduler adaptatif dans un thread séparé (une fois par
+    processus) ; entre plusieurs workers, seul le détenteur du verrou relève.
+    """
+    global _thread
+    with _thread_lock:
+        if _thread is not None and _thread.is_alive():
+            return _thread
+        _thread = Thread(target=_run_when_elected, args=(stop_event or threading.Event(),),
+                         name="feed-scheduler")
+        _thread.daemon = True
+        _thread.start()
+    logger.info("🕒 Scheduler adaptatif démarré - intervalle par flux "
+                f"entre {MIN_INTERVAL}s et {MAX_INTERVAL}s")
+    return _thread
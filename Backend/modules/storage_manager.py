@@ -1,65 +1,232 @@
 # rss_aggregator/modules/storage_manager.py
+import io
 import os
+import time
 import json
+import logging
 import datetime
-from typing import List, Dict, Any
-from modules.db_manager import init_db, get_connection, put_connection, get_database_url
+import threading
+import contextlib
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator
+from modules.db_manager import init_db, get_connection, put_connection, get_database_url, db_connection
+from modules import parquet_store, rollups
+
+logger = logging.getLogger("rss-aggregator")
 
 # Initialisation DB (si présente)
 init_db()
 _DB_URL = get_database_url()
 _USE_SQL = bool(_DB_URL)
 
-def save_analysis_batch(batch: List[Dict[str, Any]]) -> None:
+
+
+def _backfill_rollups() -> None:
+    """Remplit les agrégats depuis les analyses existantes (première mise en service)."""
+    try:
+        with db_connection() as conn:
+            rollups.backfill_sql(conn)
+    except Exception as e:
+        logger.warning(f"⚠️ Reconstruction des agrégats impossible: {e}")
+
+
+# Ancien fallback local : un fichier JSON par lot sauvegardé
+LEGACY_JSON_DIR = os.getenv(
+    "ANALYSES_JSON_DIR",
+    os.path.join(os.path.dirname(__file__), "..", "data", "analyses")
+)
+
+
+def _import_json_archives() -> int:
+    """
+    Verse une fois dans l'archive Parquet (et ses agrégats) les lots JSON de
+    l'ancien fallback local (data/analyses/*.json). Chaque fichier importé est
+    renommé en .json.imported (gardé comme sauvegarde) ; un fichier est
+    réservé par renommage avant lecture, deux processus ne l'importent pas
+    deux fois. Une analyse sans date prend l'heure de sauvegarde du lot
+    (nom du fichier batch_AAAA-MM-JJ_HHMMSS.json, sinon sa date de
+    modification). Renvoie le nombre d'analyses importées.
+    """
+    if not os.path.isdir(LEGACY_JSON_DIR):
+        return 0
+    imported = 0
+    for name in sorted(os.listdir(LEGACY_JSON_DIR)):
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(LEGACY_JSON_DIR, name)
+        claimed = path + ".importing"
+        try:
+            os.rename(path, claimed)
+        except OSError:
+            continue
+        try:
+            with open(claimed, "r", encoding="utf-8") as fh:
+                batch = json.load(fh)
+            try:
+                saved_at = datetime.datetime.strptime(name[len("batch_"):-len(".json")], "%Y-%m-%d_%H%M%S")
+            except ValueError:
+                saved_at = datetime.datetime.utcfromtimestamp(os.path.getmtime(claimed))
+            batch = [{**a, "date": a.get("date") or saved_at} for a in (batch if isinstance(batch, list) else [batch])
+                     if isinstance(a, dict)]
+            rollups.apply_local(batch, write=parquet_store.write_analyses)
+        except Exception as e:
+            logger.warning(f"⚠️ Import de l'archive JSON {name} impossible: {e}")
+            os.rename(claimed, path)
+            continue
+        os.rename(claimed, path + ".imported")
+        imported += len(batch)
+    if imported:
+        logger.info(f"📦 {imported} analyses importées depuis les archives JSON ({LEGACY_JSON_DIR})")
+    return imported
+
+
+if _USE_SQL:
+    _backfill_rollups()
+else:
+    _import_json_archives()
+
+# Écriture groupée : "copy" (COPY ... FROM STDIN), "values" (execute_values) ou "loop" (ligne à ligne)
+WRITE_MODE = os.getenv("ANALYSIS_WRITE_MODE", "copy")
+BATCH_SIZE = int(os.getenv("ANALYSIS_BATCH_SIZE", "1000"))
+
+# Fonctions appelées avec chaque lot sauvegardé (fenêtre de corroboration, agrégats en mémoire...)
+_save_listeners: List[Callable[[List[Dict[str, Any]]], None]] = []
+# Validation d'un lot et notification des listeners, indivisibles (voir consistent_snapshot)
+_commit_lock = threading.RLock()
+
+ANALYSIS_COLUMNS = ("title", "source", "date", "summary", "confidence",
+                    "corroboration_count", "corroboration_strength", "bayesian_posterior", "raw")
+# Colonnes projetables par iter_analyses
+READ_COLUMNS = ("id",) + ANALYSIS_COLUMNS + ("created_at",)
+# Lignes rapatriées par aller-retour du curseur serveur
+ITER_SIZE = int(os.getenv("ANALYSIS_ITER_SIZE", "2000"))
+
+
+def _analysis_row(analysis: Dict[str, Any]) -> Tuple:
+    return (
+        analysis.get("title"),
+        analysis.get("source"),
+        analysis.get("date", datetime.datetime.utcnow()),
+        analysis.get("summary"),
+        float(analysis.get("confidence", 0.0)),
+        int(analysis.get("corroboration_count", 0)),
+        float(analysis.get("corroboration_strength", 0.0)),
+        float(analysis.get("bayesian_posterior", 0.0)),
+        json.dumps(analysis, ensure_ascii=False, default=str)
+    )
+
+
+def write_rows_loop(cur, rows: List[Tuple]) -> None:
+    """Un INSERT par ligne (une aller-retour par analyse)."""
+    for row in rows:
+        cur.execute(f"""
+            INSERT INTO analyses ({", ".join(ANALYSIS_COLUMNS)})
+            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
+        """, row)
+
+
+def write_rows_values(cur, rows: List[Tuple], page_size: int = BATCH_SIZE) -> None:
+    """INSERT multi-lignes via execute_values (un aller-retour par page)."""
+    # psycopg2 n'est requis qu'avec PostgreSQL
+    from psycopg2.extras import execute_values
+    execute_values(cur, f"INSERT INTO analyses ({', '.join(ANALYSIS_COLUMNS)}) VALUES %s",
+                   rows, page_size=page_size)
+
+
+def _copy_value(value: Any) -> str:
+    """Encode une valeur pour COPY au format texte (\\N = NULL)."""
+    if value is None:
+        return "\\N"
+    if hasattr(value, "isoformat"):
+        value = value.isoformat()
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+def write_rows_copy(cur, rows: List[Tuple]) -> None:
+    """COPY ... FROM STDIN (un seul flux pour tout le lot)."""
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join(_copy_value(v) for v in row))
+        buf.write("\n")
+    buf.seek(0)
+    cur.copy_expert(f"COPY analyses ({', '.join(ANALYSIS_COLUMNS)}) FROM STDIN", buf)
+
+
+_WRITERS = {"copy": write_rows_copy, "values": write_rows_values, "loop": write_rows_loop}
+
+
+def register_save_listener(listener: Callable[[List[Dict[str, Any]]], None]) -> None:
+    """Appelle `listener(batch)` après chaque sauvegarde réussie d'un lot."""
+    if listener not in _save_listeners:
+        _save_listeners.append(listener)
+
+
+def _notify_saved(batch: List[Dict[str, Any]]) -> None:
+    for listener in list(_save_listeners):
+        try:
+            listener(batch)
+        except Exception as e:
+            logger.warning(f"⚠️ Listener de sauvegarde {getattr(listener, '__name__', listener)}: {e}")
+
+
+@contextlib.contextmanager
+def consistent_snapshot():
+    """
+    Bloque les sauvegardes de ce processus le temps d'une lecture : une analyse
+    est soit visible de la lecture, soit notifiée aux listeners après elle,
+    jamais les deux (reconstruction d'une vue en mémoire).
+    """
+    with _commit_lock:
+        yield
+
+
+def save_analysis_batch(batch: List[Dict[str, Any]], *, batch_size: Optional[int] = None) -> None:
     """
     Sauvegarde une liste d'analyses dans la base PostgreSQL si configurée,
-    sinon écrit dans data/analyses/*.json.gz en fallback local (dev).
+    sinon dans l'archive Parquet locale (data/analyses_parquet, dev).
+    En SQL, les lignes sont écrites par paquets de `batch_size`
+    (ANALYSIS_BATCH_SIZE), dans une seule transaction pour tout le lot ; les
+    agrégats jour / thème (modules.rollups) sont mis à jour dans la même
+    transaction. Les listeners ne sont appelés qu'une fois le lot validé :
+    un échec n'écrit rien et ne notifie rien.
     """
     if not batch:
         return
 
     if _USE_SQL:
+        size = max(1, batch_size or BATCH_SIZE)
+        writer = _WRITERS.get(WRITE_MODE, write_rows_copy)
         conn = None
         try:
             conn = get_connection()
             cur = conn.cursor()
-            for analysis in batch:
-                cur.execute("""
-                    INSERT INTO analyses
-                    (title, source, date, summary, confidence,
-                     corroboration_count, corroboration_strength, bayesian_posterior, raw)
-                    VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                """, (
-                    analysis.get("title"),
-                    analysis.get("source"),
-                    analysis.get("date", datetime.datetime.utcnow()),
-                    analysis.get("summary"),
-                    float(analysis.get("confidence", 0.0)),
-                    int(analysis.get("corroboration_count", 0)),
-                    float(analysis.get("corroboration_strength", 0.0)),
-                    float(analysis.get("bayesian_posterior", 0.0)),
-                    json.dumps(analysis, ensure_ascii=False)
-                ))
-            conn.commit()
+            for start in range(0, len(batch), size):
+                chunk = batch[start:start + size]
+                writer(cur, [_analysis_row(a) for a in chunk])
+                rollups.apply_sql(cur, chunk)
+            with _commit_lock:
+                conn.commit()
+                _notify_saved(batch)
             cur.close()
+        except Exception:
+            if conn:
+                conn.rollback()
+            raise
         finally:
             if conn:
                 put_connection(conn)
-        return
+    else:
+        # Fallback local (dev only) : archive Parquet partitionnée par jour + agrégats JSON
+        with _commit_lock:
+            rollups.apply_local(batch, write=parquet_store.write_analyses)
+            _notify_saved(batch)
 
-    # Fallback local (dev only)
-    data_dir = os.path.join(os.path.dirname(__file__), "..", "data", "analyses")
-    os.makedirs(data_dir, exist_ok=True)
-    date = datetime.datetime.utcnow().strftime("%Y-%m-%d_%H%M%S")
-    path = os.path.join(data_dir, f"batch_{date}.json")
-    with open(path, "w", encoding="utf-8") as fh:
-        json.dump(batch, fh, ensure_ascii=False, indent=2)
 
-
-def load_recent_analyses(days: int = 7) -> List[Dict[str, Any]]:
+def load_recent_analyses(days: int = 7, limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
     """
     Charge les analyses depuis PostgreSQL (si configurée) ou fallback local.
-    Retourne une liste de dict (avec champs normalisés).
+    Retourne une liste de dict (avec champs normalisés), au plus `limit`
+    (None : sans limite ; pour de gros volumes, voir iter_analyses).
     """
     if _USE_SQL:
         conn = None
@@ -72,8 +239,8 @@ def load_recent_analyses(days: int = 7) -> List[Dict[str, Any]]:
                 FROM analyses
                 WHERE date > NOW() - INTERVAL '%s days'
                 ORDER BY date DESC
-                LIMIT 1000
-            """, (days,))
+                LIMIT %s
+            """, (days, limit))
             rows = cur.fetchall()
             cur.close()
             # rows are RealDictRow via RealDictCursor
@@ -82,27 +249,244 @@ def load_recent_analyses(days: int = 7) -> List[Dict[str, Any]]:
             if conn:
                 put_connection(conn)
 
-    # Fallback: read last few local files (dev only)
-    data_dir = os.path.join(os.path.dirname(__file__), "..", "data", "analyses")
-    results = []
-    if not os.path.isdir(data_dir):
-        return results
-    files = sorted([os.path.join(data_dir, f) for f in os.listdir(data_dir)], reverse=True)
-    for fpath in files[:10]:
+    # Fallback: archive Parquet locale, partitions des `days` derniers jours (dev only)
+    return parquet_store.read_records(days=days, limit=limit)
+
+
+def analysis_cursor(row: Dict[str, Any]) -> str:
+    """Jeton de pagination d'une ligne lue par iter_analyses : "date ISO|id"."""
+    date = row["date"]
+    return f"{date.isoformat() if hasattr(date, 'isoformat') else date}|{row['id']}"
+
+
+def parse_analysis_cursor(token: str) -> Tuple[datetime.datetime, Any]:
+    """
+    Clé (date, id) d'un jeton analysis_cursor ; ValueError s'il est illisible
+    (en SQL, l'id doit être entier).
+    """
+    date, sep, ident = token.rpartition("|")
+    if not sep or not ident:
+        raise ValueError(f"curseur invalide: {token!r}")
+    try:
+        return datetime.datetime.fromisoformat(date), (int(ident) if _USE_SQL else ident)
+    except ValueError:
+        raise ValueError(f"curseur invalide: {token!r}") from None
+
+
+def iter_analyses(start: Optional[datetime.datetime] = None, end: Optional[datetime.datetime] = None,
+                  after: Optional[Tuple[Any, Any]] = None, columns: Optional[List[str]] = None,
+                  limit: Optional[int] = None, itersize: int = ITER_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Analyses datées de [start, end[, de la plus récente à la plus ancienne,
+    une par une et en mémoire constante : curseur serveur (nommé) lu par
+    paquets de `itersize` lignes.
+    Pagination par clé sur (date, id) : `after` est la clé de la dernière ligne
+    de la page précédente (parse_analysis_cursor). `columns` restreint les
+    colonnes lues (READ_COLUMNS) ; `id` et `date` sont toujours lus.
+    Les paramètres sont vérifiés à l'appel (ValueError), avant la première
+    ligne ; la connexion reste empruntée jusqu'à la fin (ou l'abandon) de
+    l'itération.
+    """
+    unknown = [c for c in (columns or []) if c not in READ_COLUMNS]
+    if unknown:
+        raise ValueError(f"colonnes inconnues: {', '.join(unknown)}")
+    cols = list(dict.fromkeys(["id", "date"] + list(columns or READ_COLUMNS)))
+
+    if not _USE_SQL:
+        # Archive Parquet locale (dev only) ; pas de created_at
+        return parquet_store.iter_records(start=start, end=end, after=after, limit=limit, batch_size=itersize,
+                                          columns=[c for c in cols if c != "created_at"])
+
+    where, params = ["date IS NOT NULL"], []
+    if start is not None:
+        where.append("date >= %s")
+        params.append(start)
+    if end is not None:
+        where.append("date < %s")
+        params.append(end)
+    if after is not None:
         try:
-            with open(fpath, "r", encoding="utf-8") as fh:
-                batch = json.load(fh)
-                for item in batch:
-                    results.append(item)
+            after_id = int(after[1])
+        except (TypeError, ValueError):
+            raise ValueError(f"identifiant de curseur invalide: {after[1]!r}") from None
+        where.append("(date, id) < (%s, %s)")
+        params.extend([after[0], after_id])
+    sql = f"SELECT {', '.join(cols)} FROM analyses WHERE {' AND '.join(where)} ORDER BY date DESC, id DESC"
+    if limit:
+        sql += " LIMIT %s"
+        params.append(int(limit))
+    return _iter_sql(sql, params, itersize)
+
+
+def _iter_sql(sql: str, params: List[Any], itersize: int) -> Iterator[Dict[str, Any]]:
+    conn = get_connection()
+    try:
+        cur = conn.cursor(name="iter_analyses")
+        cur.itersize = itersize
+        cur.execute(sql, params)
+        for row in cur:
+            yield dict(row)
+        cur.close()
+    finally:
+        # Fin de la transaction qui porte le curseur serveur
+        try:
+            conn.rollback()
         except Exception:
-            continue
-    return results
+            pass
+        put_connection(conn)
+
+
+def load_corroboration_window(days: float = 3) -> List[Dict[str, Any]]:
+    """
+    Articles des `days` derniers jours réduits aux champs de corroboration
+    (id, title, summary, source, date), sans limite ni décodage de `raw`.
+    """
+    if _USE_SQL:
+        conn = None
+        try:
+            conn = get_connection()
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT id, title, summary, source, date
+                FROM analyses
+                WHERE date > NOW() - %s * INTERVAL '1 day'
+                ORDER BY date
+            """, (days,))
+            rows = cur.fetchall()
+            cur.close()
+            return [dict(r) for r in rows]
+        finally:
+            if conn:
+                put_connection(conn)
+
+    return parquet_store.read_records(days=days, columns=["id", "title", "summary", "source", "date"])
+
+
+# Champs du graphe de relations, lus sans décoder `raw` en entier
+RELATION_COLUMNS = ["id", "title", "summary", "date",
+                    "raw->'sentiment' AS sentiment", "raw->'score_corrected' AS score_corrected"]
+
+
+def load_relation_window(days: float = 30) -> List[Dict[str, Any]]:
+    """
+    Articles des `days` derniers jours réduits aux champs du graphe de relations
+    (id, title, summary, date, sentiment, score_corrected), sans limite.
+    """
+    if _USE_SQL:
+        conn = None
+        try:
+            conn = get_connection()
+            cur = conn.cursor()
+            cur.execute(f"""
+                SELECT {", ".join(RELATION_COLUMNS)}
+                FROM analyses
+                WHERE date > NOW() - %s * INTERVAL '1 day'
+            """, (days,))
+            rows = cur.fetchall()
+            cur.close()
+            return [dict(r) for r in rows]
+        finally:
+            if conn:
+                put_connection(conn)
+
+    rows = parquet_store.read_records(days=days, columns=["title", "summary", "date", "sentiment_score"])
+    for row in rows:
+        row["sentiment"] = row.pop("sentiment_score")
+    return rows
+
+
+def latest_analysis_id() -> Optional[int]:
+    """Plus grand id d'analyse validé en base (lecture de l'index) ; None sans base."""
+    if not _USE_SQL:
+        return None
+    with db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT COALESCE(MAX(id), 0) AS last_id FROM analyses")
+        last_id = cur.fetchone()["last_id"]
+        conn.commit()
+        cur.close()
+    return last_id
+
+
+# Un id attribué mais pas encore visible (transaction en cours) est relu pendant ce délai
+TAIL_GAP_SECONDS = float(os.getenv("ANALYSIS_TAIL_GAP_SECONDS", "60"))
+# Ids examinés sous le dernier id validé au démarrage du suivi
+TAIL_GAP_SPAN = int(os.getenv("ANALYSIS_TAIL_GAP_SPAN", "5000"))
+
+
+class AnalysisTail:
+    """
+    Suivi des analyses validées en base depuis la dernière lecture, quel que
+    soit le processus qui les a sauvegardées (PostgreSQL ; sans base, un seul
+    processus et aucune lecture). Les ids SERIAL sont attribués avant la
+    validation : un id inférieur au dernier lu peut apparaître plus tard. Les
+    ids sautés sont donc relus à chaque appel pendant TAIL_GAP_SECONDS, puis
+    abandonnés (transaction annulée).
+    """
+
+    def __init__(self, columns: List[str]):
+        self.columns = list(dict.fromkeys(["id"] + list(columns)))
+        self.enabled = _USE_SQL
+        self.last_id = 0
+        self._gaps: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Repart du dernier id validé ; à appeler avant de charger l'instantané à compléter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            with db_connection() as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT COALESCE(MAX(id), 0) AS last_id FROM analyses")
+                last_id = cur.fetchone()["last_id"]
+                cur.execute("SELECT id FROM analyses WHERE id > %s", (last_id - TAIL_GAP_SPAN,))
+                present = {r["id"] for r in cur.fetchall()}
+                conn.commit()
+                cur.close()
+            now = time.time()
+            self.last_id = last_id
+            self._gaps = {i: now for i in range(max(1, last_id - TAIL_GAP_SPAN + 1), last_id + 1)
+                          if i not in present}
+
+    def fetch(self) -> List[Dict[str, Any]]:
+        """Analyses validées depuis l'appel précédent (ou start()), par id croissant."""
+        if not self.enabled:
+            return []
+        with self._lock:
+            now = time.time()
+            self._gaps = {i: t for i, t in self._gaps.items() if now - t < TAIL_GAP_SECONDS}
+            with db_connection() as conn:
+                cur = conn.cursor()
+                cur.execute(f"""
+                    SELECT {", ".join(self.columns)} FROM analyses
+                    WHERE id > %s OR id = ANY(%s)
+                    ORDER BY id
+                """, (self.last_id, list(self._gaps)))
+                rows = [dict(r) for r in cur.fetchall()]
+                conn.commit()
+                cur.close()
+            ids = {r["id"] for r in rows}
+            for i in ids:
+                self._gaps.pop(i, None)
+            newest = max(ids, default=self.last_id)
+            for i in range(self.last_id + 1, newest):
+                if i not in ids:
+                    self._gaps[i] = now
+            self.last_id = max(self.last_id, newest)
+        return rows
 
 
 def summarize_analyses() -> Dict[str, Any]:
     """
-    Résumé global (SQL si possible).
+    Résumé global, lu dans les agrégats cumulés (modules.rollups) ;
+    recalcul complet sur la table / l'archive si ceux-ci sont indisponibles.
     """
+    try:
+        return rollups.summary_from_totals(rollups.read_totals())
+    except Exception as e:
+        logger.warning(f"⚠️ Agrégats indisponibles, résumé recalculé: {e}")
+
     if _USE_SQL:
         conn = None
         try:
@@ -122,17 +506,5 @@ def summarize_analyses() -> Dict[str, Any]:
         finally:
             if conn:
                 put_connection(conn)
-    # Fallback compute from local files (dev)
-    articles = load_recent_analyses(days=30)
-    if not articles:
-        return {}
-    confidences = [a.get("confidence", 0) for a in articles if a.get("confidence") is not None]
-    post = [a.get("bayesian_posterior", 0) for a in articles if a.get("bayesian_posterior") is not None]
-    cor = [a.get("corroboration_strength", 0) for a in articles if a.get("corroboration_strength") is not None]
-    import statistics
-    return {
-        "total_articles": len(articles),
-        "avg_confidence": statistics.mean(confidences) if confidences else None,
-        "avg_posterior": statistics.mean(post) if post else None,
-        "avg_corroboration": statistics.mean(cor) if cor else None
-    }
\ No newline at end of file
+    # Fallback : moyennes sur les colonnes projetées de l'archive Parquet (dev)
+    return parquet_store.summarize()
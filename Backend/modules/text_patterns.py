@@ -0,0 +1,92 @@
+# rss_aggregator/modules/text_patterns.py
+"""
+Registre des expressions régulières de l'analyse de texte, compilées une
+seule fois au chargement du module (entités géopolitiques, indicateurs et
+tendances économiques, faits clés). Les extracteurs de modules.deep_analysis
+et l'index de corroboration partagent ces motifs.
+"""
+
+import re
+
+# ------- Entités nommées -------
+
+COUNTRIES = r'\b(France|Allemagne|États-Unis|USA|China|Chine|Russie|UK|Royaume-Uni|Ukraine|Israel|Palestine)\b'
+ORGANIZATIONS = r'\b(ONU|OTAN|UE|Union Européenne|UN|NATO|OMS|WHO)\b'
+LEADERS = r'\b(Poutine|Zelensky|Macron|Biden|Xi|Merkel|Scholz)\b'
+
+ENTITY_PATTERNS = {
+    'pays': re.compile(COUNTRIES, re.IGNORECASE),
+    'organisations': re.compile(ORGANIZATIONS, re.IGNORECASE),
+    'personnes': re.compile(LEADERS, re.IGNORECASE)
+}
+
+# Mêmes motifs, libellés comme dans l'analyse géopolitique
+GEOPOLITICAL_ACTOR_PATTERNS = {
+    'pays': ENTITY_PATTERNS['pays'],
+    'organisations': ENTITY_PATTERNS['organisations'],
+    'dirigeants': ENTITY_PATTERNS['personnes']
+}
+
+# Toutes les entités en un seul motif (une passe)
+ANY_ENTITY = re.compile(
+    r'\b(' + '|'.join(p[3:-3] for p in (COUNTRIES, ORGANIZATIONS, LEADERS)) + r')\b',
+    re.IGNORECASE
+)
+
+# ------- Faits clés (recherche web) -------
+
+KEY_FACT_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'accord sur\s+([^.,]+)',
+    r'sanctions?\s+contre\s+([^.,]+)',
+    r'crise\s+(?:au|en)\s+([^.,]+)',
+    r'négociations?\s+(?:à|en)\s+([^.,]+)'
+)]
+
+# ------- Indicateurs économiques (appliqués au texte en minuscules) -------
+
+ECONOMIC_INDICATOR_PATTERNS = {
+    'macroéconomiques': [re.compile(p, re.IGNORECASE) for p in (
+        r'PIB\s*(?:de|du|\s)([^.,;]+)',
+        r'croissance\s+économique\s+de\s+([\d,]+)%',
+        r'inflation\s+de\s+([\d,]+)%',
+        r'chômage\s+de\s+([\d,]+)%',
+        r'dette\s+publique\s+de\s+([\d,]+)',
+        r'déficit\s+budgétaire\s+de\s+([\d,]+)'
+    )],
+    'financiers': [re.compile(p, re.IGNORECASE) for p in (
+        r'marchés?\s+boursiers?\s+([^.,;]+)',
+        r'indice\s+([A-Z]+)\s+([\d,]+)',
+        r'euro\s+([\d,]+)\s+dollars?',
+        r'dollar\s+([\d,]+)\s+euros?',
+        r'taux\s+directeur\s+([^.,;]+)',
+        r'banque\s+centrale\s+([^.,;]+)'
+    )],
+    'commerciaux': [re.compile(p, re.IGNORECASE) for p in (
+        r'commerce\s+extérieur\s+([^.,;]+)',
+        r'exportations?\s+de\s+([\d,]+)',
+        r'importations?\s+de\s+([\d,]+)',
+        r'balance\s+commerciale\s+([^.,;]+)',
+        r'sanctions?\s+économiques\s+([^.,;]+)',
+        r'embargo\s+([^.,;]+)'
+    )]
+}
+
+ECONOMIC_TREND_PATTERNS = {
+    'hausse': [re.compile(p, re.IGNORECASE) for p in (
+        r'hausse\s+de\s+([\d,]+)%',
+        r'augmentation\s+de\s+([\d,]+)%',
+        r'croissance\s+de\s+([\d,]+)%',
+        r'progresser?\s+de\s+([\d,]+)%'
+    )],
+    'baisse': [re.compile(p, re.IGNORECASE) for p in (
+        r'baisse\s+de\s+([\d,]+)%',
+        r'chute\s+de\s+([\d,]+)%',
+        r'déclin\s+de\s+([\d,]+)%',
+        r'ralentissement\s+de\s+([\d,]+)%'
+    )],
+    'stabilité': [re.compile(p, re.IGNORECASE) for p in (
+        r'stable\s+à\s+([\d,]+)',
+        r'maintien\s+à\s+([\d,]+)',
+        r'stabilité\s+autour\s+de\s+([\d,]+)'
+    )]
+}
@@ -1747,6 +1747,42 @@ app.post('/api/analyze', async (req, res) => {
     const data = await callFlask('/api/analyze', 'POST', req.body);
     res.json(data);
     console.error('❌ Erreur /api/analyze:', error);
+// Analyse d'un lot d'articles (Flask IA) : réponse NDJSON relayée au fil de l'eau
+app.post('/api/analyze/batch', async (req, res) => {
+  try {
+    const response = await axios({
+      method: 'POST',
+      url: `${FLASK_API_URL}/api/analyze/batch`,
+      data: req.body,
+      responseType: 'stream',
+      timeout: 300000,
+      headers: { 'Content-Type': 'application/json' }
+    });
+    res.setHeader('Content-Type', 'application/x-ndjson');
+    response.data.pipe(res);
+  } catch (error) {
+    console.error('❌ Erreur /api/analyze/batch:', error.message);
+    res.status(500).json({ success: false, error: 'Batch analysis unavailable' });
+  }
+});
+// Lecture paginée des analyses (Flask IA) : NDJSON relayé au fil de l'eau
+app.get('/api/analyses', async (req, res) => {
+  try {
+    const response = await axios({
+      method: 'GET',
+      url: `${FLASK_API_URL}/api/analyses`,
+      params: req.query,
+      responseType: 'stream',
+      timeout: 0
+    });
+    res.setHeader('Content-Type', 'application/x-ndjson');
+    response.data.pipe(res);
+  } catch (error) {
+    console.error('❌ Erreur /api/analyses:', error.message);
+    const status = error.response ? error.response.status : 500;
+    res.status(status).json({ success: false, error: 'Analyses export unavailable' });
+  }
+});
 // ============ ROUTES UTILITAIRES ============
 app.get('/health', async (req, res) => {
     const dbTest = await pool.query('SELECT 1');
@@ -1766,7 +1802,7 @@ app.get('/health', async (req, res) => {
     architecture: 'Node.js (frontend/RSS) + Flask (IA analysis)',
     endpoints: {
       local: ['/api/articles', '/api/feeds', '/api/themes', '/api/refresh'],
-      flask_proxy: ['/api/metrics', '/api/sentiment/stats', '/api/analyze', '/api/geopolitical/*', '/api/learning-stats']
+      flask_proxy: ['/api/metrics', '/api/sentiment/stats', '/api/analyze', '/api/analyze/batch', '/api/geopolitical/*', '/api/learning-stats']
 // ============ DÉMARRAGE ============
 async function startServer() {
     await initializeDatabase();
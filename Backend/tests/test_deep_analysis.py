@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Équivalence de modules.deep_analysis avec l'analyseur d'origine
+(tests/fixtures/legacy_deep_analysis.py) sur des articles aléatoires tirés
+du vocabulaire des deux analyseurs : mêmes scores, mêmes extractions, même
+analyse complète (à l'ordre près des listes construites depuis un set).
+
+Usage: python -m pytest tests/test_deep_analysis.py
+"""
+
+import os
+import sys
+import json
+import random
+import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "fixtures"))
+from modules import deep_analysis  # noqa: E402
+import legacy_deep_analysis as legacy  # noqa: E402
+
+SEED = 0
+ARTICLES = 3000
+
+TEXT_METHODS = ("assess_urgency", "assess_scope", "assess_novelty", "detect_controversies",
+                "identify_economic_sectors", "assess_economic_impact", "assess_geopolitical_tensions",
+                "detect_emotional_language", "extract_geopolitical_issues", "detect_economic_trends")
+
+THEMES = [["géopolitique", "économique"], [{"name": "social"}, "environnement"], ["conflit"], [], "économique"]
+
+EXTRA_WORDS = ("le la de un une et France ONU Macron PIB inflation de 3,5% chômage de 7% hausse de 2% "
+               "marché boursier en chute embargo total . , ; Crise CRISE Économique").split()
+
+
+def _vocabulary():
+    """Mots-clés déclarés par modules.deep_analysis (listes et dict de listes), plus du texte courant."""
+    words = set()
+    for name in dir(deep_analysis):
+        value = getattr(deep_analysis, name)
+        if isinstance(value, dict):
+            value = [w for v in value.values() if isinstance(v, list) for w in v]
+        if isinstance(value, list):
+            words.update(w for w in value if isinstance(w, str))
+    return sorted(words) + EXTRA_WORDS
+
+
+def _articles():
+    rnd = random.Random(SEED)
+    vocab = _vocabulary()
+
+    def text(n):
+        return " ".join(rnd.choice(vocab) for _ in range(n))
+
+    for _ in range(ARTICLES):
+        article = {"title": text(rnd.randint(0, 12)), "content": text(rnd.randint(0, 200)),
+                   "feed": rnd.choice(["Reuters", "blog", ""]),
+                   "sentiment": {"score": rnd.uniform(-1, 1)}}
+        yield article, rnd.choice(THEMES)
+
+
+def _canonical(value):
+    """Listes triées récursivement : l'ordre d'itération d'un set n'est pas garanti."""
+    if isinstance(value, dict):
+        return {k: _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [_canonical(v) for v in value]
+        return sorted(items, key=lambda v: json.dumps(v, sort_keys=True, default=str))
+    return value
+
+
+@pytest.fixture(autouse=True)
+def frozen_now(monkeypatch):
+    """Même horloge pour les deux analyseurs (nouveauté, dates de recherche web)."""
+    fixed = datetime.datetime(2024, 1, 1)
+
+    class FrozenDateTime(datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return fixed
+
+    clock = type("datetime_module", (), {"datetime": FrozenDateTime})
+    monkeypatch.setattr(legacy, "datetime", clock)
+    monkeypatch.setattr(deep_analysis, "datetime", clock)
+
+
+def test_perform_deep_analysis_matches_legacy():
+    for article, themes in _articles():
+        expected = legacy.AdvancedIAAnalyzer().perform_deep_analysis(article, themes)
+        got = deep_analysis.AdvancedIAAnalyzer().perform_deep_analysis(article, themes)
+        assert got["score_corrected"] == expected["score_corrected"], (article, themes)
+        assert got["confidence"] == expected["confidence"], (article, themes)
+        assert got["analyse_contextuelle"] == expected["analyse_contextuelle"], (article, themes)
+        assert _canonical(got) == _canonical(expected), (article, themes)
+
+
+def test_extractions_match_legacy():
+    old, new = legacy.AdvancedIAAnalyzer(), deep_analysis.AdvancedIAAnalyzer()
+    for article, themes in _articles():
+        text = article["title"] + " " + article["content"]
+        for method in TEXT_METHODS:
+            assert getattr(new, method)(text) == getattr(old, method)(text), (method, text)
+        theme_list = themes if isinstance(themes, list) else [themes]
+        assert new.assess_impact(text, theme_list) == old.assess_impact(text, theme_list), text
+        assert new.web_research.analyze_sentiment(text) == old.web_research.analyze_sentiment(text), text
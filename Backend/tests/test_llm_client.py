@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Cache et fusion des appels de modules.llm_client, sur une session HTTP
+factice (aucun appel réseau) : appels simultanés identiques fusionnés,
+expiration des réponses, erreurs transmises sans être mises en cache.
+
+Usage: python -m pytest tests/test_llm_client.py
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from modules import llm_client  # noqa: E402
+
+PAYLOAD = {"model": "test", "messages": [{"role": "user", "content": "Bonjour"}], "max_tokens": 10}
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self._content = content
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"choices": [{"message": {"content": self._content}}]}
+
+
+class FakeSession:
+    """Réponses successives "réponse 1", "réponse 2"... ; `release` retient les appels."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        self._lock = threading.Lock()
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        self.started.set()
+        self.release.wait(5)
+        if self.fail:
+            raise requests.ConnectionError("amont indisponible")
+        return FakeResponse(f"réponse {n}")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Horloge de llm_client avancée à la main."""
+    now = [1000.0]
+    monkeypatch.setattr(llm_client.time, "time", lambda: now[0])
+    return now
+
+
+def _client(session, ttl=60):
+    client = llm_client.LLMClient(api_base="http://llm.test", ttl=ttl)
+    client.session = session
+    return client
+
+
+def _concurrent(client, n):
+    """Lance `n` appels identiques pendant que l'appel amont est retenu."""
+    client.session.release.clear()
+    results = [None] * n
+
+    def call(i):
+        results[i] = client.chat(PAYLOAD, "clé")
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(n)]
+    threads[0].start()
+    assert client.session.started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    # Les suiveurs attendent le vol en cours avant que l'amont ne réponde
+    waited = threading.Event()
+    for _ in range(500):
+        if client.stats()["coalesced"] >= n - 1:
+            break
+        waited.wait(0.01)
+    client.session.release.set()
+    for t in threads:
+        t.join(5)
+    return results
+
+
+def test_concurrent_identical_prompts_share_one_call():
+    client = _client(FakeSession())
+    results = _concurrent(client, 8)
+    assert client.session.calls == 1
+    assert all(r == {"content": "réponse 1", "raw": results[0]["raw"]} for r in results)
+    # Chaque appelant reçoit sa propre copie
+    assert len({id(r) for r in results}) == 8
+    stats = client.stats()
+    assert (stats["misses"], stats["coalesced"], stats["upstream_calls"]) == (1, 7, 1)
+    assert stats["in_flight"] == 0
+
+
+def test_cached_response_expires_after_ttl(clock):
+    client = _client(FakeSession(), ttl=60)
+    assert client.chat(PAYLOAD, "clé")["content"] == "réponse 1"
+    clock[0] += 59
+    assert client.chat(PAYLOAD, "clé")["content"] == "réponse 1"
+    clock[0] += 2
+    assert client.chat(PAYLOAD, "clé")["content"] == "réponse 2"
+    assert client.session.calls == 2
+    assert client.stats()["hits"] == 1
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    client = _client(FakeSession(fail=True))
+    results = _concurrent(client, 4)
+    assert client.session.calls == 1
+    assert all("amont indisponible" in r["error"] for r in results)
+    assert client.stats()["upstream_errors"] == 1
+    # Erreur non mise en cache : l'appel suivant retente l'amont
+    client.session.fail = False
+    assert client.chat(PAYLOAD, "clé")["content"] == "réponse 2"
+    assert client.session.calls == 2
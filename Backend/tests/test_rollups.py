@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Classement des sentiments dans les agrégats (modules.rollups).
+Les analyses sauvegardées portent un sentiment sous forme de dict
+({"score", "sentiment"}) : il est classé d'après son score, puis son
+libellé. L'ancien calcul de /api/metrics le comptait toujours comme neutre.
+
+Usage: python -m pytest tests/test_rollups.py
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from modules.analysis_utils import sentiment_bucket  # noqa: E402
+from modules.rollups import compute_deltas  # noqa: E402
+
+
+@pytest.mark.parametrize("sentiment, bucket", [
+    ({"score": 0.6, "sentiment": "positive"}, "positive"),
+    ({"score": -0.4}, "negative"),
+    ({"score": 0.05, "sentiment": "negative"}, "neutral"),
+    ({"sentiment": "negative"}, "negative"),
+    ({}, "neutral"),
+    (0.3, "positive"),
+    ("Négatif", "neutral"),
+    ("negative", "negative"),
+    (None, "neutral"),
+])
+def test_sentiment_bucket(sentiment, bucket):
+    assert sentiment_bucket({"sentiment": sentiment}) == bucket
+
+
+def test_compute_deltas_counts_dict_sentiments():
+    batch = [
+        {"date": "2024-01-01T08:00:00", "sentiment": {"score": 0.5}, "confidence": 0.8, "themes": ["économie"]},
+        {"date": "2024-01-01T09:00:00", "sentiment": {"score": -0.5}, "confidence": 0.4},
+        {"date": "2024-01-02", "sentiment": {"sentiment": "neutral"}},
+    ]
+    daily, themes = compute_deltas(batch)
+    assert daily["2024-01-01"]["positive"] == 1
+    assert daily["2024-01-01"]["negative"] == 1
+    assert daily["2024-01-01"]["neutral"] == 0
+    assert daily["2024-01-01"]["sum_confidence"] == pytest.approx(1.2)
+    assert daily["2024-01-02"]["neutral"] == 1
+    assert themes == {("2024-01-01", "économie"): 1}